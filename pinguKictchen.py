@@ -25,47 +25,93 @@
 ╚══════════════════════════════════════════╝
 """
 
-import pygame, sys, random, math, struct, time
+import pygame, sys, os, io, random, math, struct, time, argparse, itertools
+import multiprocessing, signal, gc, threading, collections, queue, heapq, statistics, weakref
 
 # ── SAFE INIT ─────────────────────────────────────────────────
-pygame.init()
-try:
-    pygame.mixer.pre_init(44100, -16, 1, 1024)
-    pygame.mixer.init()
-    AUDIO_OK = True
-except Exception:
-    AUDIO_OK = False
-
-
+# Importing this module is free of side effects: no window, no audio, no
+# asset synthesis.  init() opens the window and starts audio; fonts, sounds,
+# icons and the background are registries filled the first time each entry
+# is used.
 SW, SH = 1280, 780
-screen = pygame.display.set_mode((SW, SH), pygame.RESIZABLE)
-pygame.display.set_caption("Pingu’s Cozy Kitchen 🐧👨‍🍳✨")
-clock = pygame.time.Clock()
-FPS   = 60
+FPS    = 60
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+screen   = None          # display surface — set by init()
+clock    = None
+AUDIO_OK = False
+
+def init(headless=False, audio=True, music=True):
+    """Open the 1280×780 window (an off-screen dummy one when headless) and
+    start audio.  Safe to call more than once; returns the display surface."""
+    global screen, clock, AUDIO_OK
+    if screen is not None: return screen
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        audio = music = False
+    pygame.init()
+    if audio:
+        try:
+            pygame.mixer.pre_init(44100, -16, 1, 1024)
+            pygame.mixer.init()
+            AUDIO_OK = True
+        except Exception:
+            AUDIO_OK = False
+    screen = pygame.display.set_mode((SW, SH), pygame.RESIZABLE)
+    pygame.display.set_caption("Pingu’s Cozy Kitchen 🐧👨‍🍳✨")
+    clock = pygame.time.Clock()
+    FONTS.report()
+    if AUDIO_OK and music: _start_music()
+    return screen
 
 # ── MUSIC: try real file first, fall back to procedural BGM ───
 MUSIC_FILE = "Penguins Parade on the Frozen Shore.mp3"   # drop your MP3/OGG here
-_music_loaded = False
-if AUDIO_OK:
-    import os
-    for _ext in ("Penguins Parade on the Frozen Shore.mp3","penguin_parade.mp3","penguin_parade.wav"):
-        if os.path.exists(_ext):
+
+def _start_music():
+    global AUDIO_OK
+    for name in (MUSIC_FILE,"penguin_parade.mp3","penguin_parade.wav"):
+        for path in (name, os.path.join(BASE_DIR, name)):
+            if not os.path.exists(path): continue
             try:
-                pygame.mixer.music.load(_ext)
+                pygame.mixer.music.load(path)
                 pygame.mixer.music.set_volume(0.22)
                 pygame.mixer.music.play(loops=-1)
-                _music_loaded = True
-                print(f"🎵 Loaded real music: {_ext}")
-                break
+                print(f"🎵 Loaded real music: {name}")
+                return
             except Exception as e:
-                print(f"⚠ Could not load {_ext}: {e}")
+                print(f"⚠ Could not load {name}: {e}")
+    try:
+        print("🎵 Building BGM (procedural fallback)...")
+        bgm = pygame.mixer.Sound(buffer=_bgm_buf())
+        bgm.set_volume(0.18)
+        bgm.play(loops=-1)
+        print("🎵 Procedural BGM playing!")
+    except Exception as e:
+        print(f"⚠ Audio skipped: {e}")
+        AUDIO_OK = False
 
 # ── HELPERS ───────────────────────────────────────────────────
 def v(n): return int(n)          # identity — we design at 1280×780 directly
 def lerp(a, b, t): return a + (b - a) * t
 def clamp(x, lo, hi): return max(lo, min(hi, x))
 def lc(a, b, t):                 # lerp_color
-    return tuple(max(0, min(255, int(a[i] + (b[i] - a[i]) * t))) for i in range(3))
+    r = int(a[0] + (b[0] - a[0]) * t); g = int(a[1] + (b[1] - a[1]) * t)
+    bl = int(a[2] + (b[2] - a[2]) * t)
+    return (0 if r < 0 else 255 if r > 255 else r, 0 if g < 0 else 255 if g > 255 else g,
+            0 if bl < 0 else 255 if bl > 255 else bl)
+
+# Gameplay draws from the global `random`; purely visual effects (snow,
+# stars, particles, confetti, blinks) draw from FX, so how much decoration
+# is on screen never changes which orders arrive.
+FX = random.Random()
+
+def seed_rng(seed, legacy=False):
+    """Seed both streams.  legacy=True reproduces version-1 recordings, where
+    effects shared the gameplay stream."""
+    global FX
+    random.seed(seed)
+    FX = random if legacy else random.Random(seed ^ 0x5EED)
 
 # ── PALETTE ───────────────────────────────────────────────────
 BG0   = (8,  14, 40)
@@ -85,24 +131,359 @@ GREEN = ( 48,215,105)
 RED   = (255, 55, 55)
 
 # ── FONT LOADER ───────────────────────────────────────────────
-def load_font(size, bold=True):
-    for name in ("comicsansms", "trebuchetms", "verdana", "arial"):
+FONT_FAMILIES = ("comicsansms", "trebuchetms", "verdana", "arial")
+FONT_DIRS = ("/usr/share/fonts", "/usr/local/share/fonts", "~/.fonts",
+             "~/.local/share/fonts", "/Library/Fonts", "/System/Library/Fonts",
+             "~/Library/Fonts", os.path.join(os.environ.get("WINDIR", "C:/Windows"), "Fonts"))
+
+class FontManager:
+    """Resolves FONT_FAMILIES to a font file once and shares it across sizes.
+
+    SysFont/match_font make pygame scan every installed font (fc-list on
+    Linux), so the winning path is stored in cache_dir()/fonts.json, keyed by
+    a fingerprint of the font directories' mtimes — installing or removing a
+    font invalidates it.  Each file is read into memory once and every size
+    is opened from those bytes.
+    """
+    CACHE_FORMAT = 1
+
+    def __init__(self, families=FONT_FAMILIES):
+        self.families = tuple(families)
+        self.files = None        # bold flag → [path or None, synthetic bold?]
+        self.data = {}           # path → file bytes
+        self.fonts = {}          # (size, bold) → Font
+        self.resolve_ms = 0.0
+        self.cached = False
+
+    @staticmethod
+    def fingerprint():
+        h = hashlib.sha1()
+        for root in FONT_DIRS:
+            for d, subdirs, _ in os.walk(os.path.expanduser(root)):
+                subdirs.sort()
+                try: h.update(f"{d}:{os.stat(d).st_mtime_ns};".encode())
+                except OSError: pass
+        return h.hexdigest()
+
+    def _scan(self):
+        files = {}
+        for bold in (True, False):
+            files[bold] = [None, bold]
+            for name in self.families:
+                try: path = pygame.font.match_font(name, bold=bold)
+                except Exception: path = None
+                if path:
+                    plain = pygame.font.match_font(name) if bold else path
+                    files[bold] = [path, bold and path == plain]
+                    break
+        return files
+
+    def resolve(self):
+        """Find the font files, from the on-disk cache when still valid."""
+        if self.files is not None: return self.files
+        t0 = time.perf_counter()
+        fp = self.fingerprint()
+        cache = os.path.join(cache_dir(), "fonts.json")
         try:
-            f = pygame.font.SysFont(name, size, bold=bold)
-            if f: return f
-        except Exception:
-            pass
-    return pygame.font.SysFont(None, size, bold=bold)
-
-F_TITLE = load_font(42)
-F_LG    = load_font(30)
-F_MD    = load_font(21)
-F_SM    = load_font(17)
-F_XS    = load_font(13)
+            with open(cache) as f: c = json.load(f)
+            if (c["format"], c["fingerprint"], c["families"]) != (
+                    self.CACHE_FORMAT, fp, list(self.families)):
+                raise ValueError("stale")
+            files = {True: c["bold"], False: c["regular"]}
+            if not all(p is None or os.path.exists(p) for p, _ in files.values()):
+                raise ValueError("missing file")
+            self.cached = True
+        except (OSError, ValueError, KeyError, TypeError):
+            files = self._scan()
+            try:
+                tmp = cache + f".{os.getpid()}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump({"format": self.CACHE_FORMAT, "fingerprint": fp,
+                               "families": list(self.families),
+                               "bold": files[True], "regular": files[False]}, f)
+                os.replace(tmp, cache)
+            except OSError:
+                pass
+        self.files = files
+        self.resolve_ms = (time.perf_counter() - t0)*1000
+        return files
+
+    def report(self):
+        self.resolve()
+        path = self.files[True][0]
+        print(f"🔤 Font: {os.path.basename(path) if path else 'pygame default'} "
+              f"({'cached' if self.cached else 'scanned'} in {self.resolve_ms:.1f} ms)")
+
+    def font(self, size, bold=True):
+        key = (size, bold)
+        f = self.fonts.get(key)
+        if f is not None: return f
+        if not pygame.font.get_init(): pygame.font.init()
+        path, synth_bold = self.resolve()[bold]
+        f = None
+        if path:
+            try:
+                if path not in self.data:
+                    with open(path, "rb") as fh: self.data[path] = fh.read()
+                f = pygame.font.Font(io.BytesIO(self.data[path]), size)
+            except (OSError, pygame.error):
+                f = None
+        if f is None:
+            f = pygame.font.Font(None, size); synth_bold = bold
+        if synth_bold: f.set_bold(True)
+        self.fonts[key] = f
+        return f
+
+FONTS = FontManager()
+
+def load_font(size, bold=True):
+    return FONTS.font(size, bold)
+
+class LazyFont:
+    """Stands in for a pygame Font; the real one is loaded on first use."""
+    __slots__ = ("_size", "_bold", "_font")
+    def __init__(self, size, bold=True):
+        self._size = size; self._bold = bold; self._font = None
+    def __getattr__(self, name):
+        f = self._font
+        if f is None:
+            f = self._font = load_font(self._size, self._bold)
+        return getattr(f, name)
+
+F_TITLE = LazyFont(42)
+F_LG    = LazyFont(30)
+F_MD    = LazyFont(21)
+F_SM    = LazyFont(17)
+F_XS    = LazyFont(13)
 # End-screen fonts
-F_HERO  = load_font(68)   # giant headline
-F_BIG   = load_font(46)
-F_MED2  = load_font(28)
+F_HERO  = LazyFont(68)   # giant headline
+F_BIG   = LazyFont(46)
+F_MED2  = LazyFont(28)
+
+# ── QUALITY TIERS (adaptive, see QualityGovernor) ─────────────
+# snow/stars — how many are drawn; aurora_every — frames between aurora
+# redraws (0 = off); aurora_step — px between wave points; glow — halos in
+# draw_glass/glow_dot; emit — particle budget multiplier; end_fx — full
+# end-screen decoration (floaties, glow ring, thick outlines); crowd — most
+# customer penguins in the queue.
+QUALITY_TIERS = (
+    dict(name="high",    snow=28, stars=60, aurora_every=6,  aurora_step=18, glow=True,  emit=1.0,  end_fx=True,  crowd=160),
+    dict(name="medium",  snow=18, stars=40, aurora_every=10, aurora_step=30, glow=True,  emit=0.6,  end_fx=True,  crowd=100),
+    dict(name="low",     snow=10, stars=24, aurora_every=20, aurora_step=48, glow=False, emit=0.35, end_fx=False, crowd=50),
+    dict(name="minimal", snow=0,  stars=12, aurora_every=0,  aurora_step=48, glow=False, emit=0.15, end_fx=False, crowd=20),
+)
+TIER_NAMES = [q["name"] for q in QUALITY_TIERS]
+QUALITY = QUALITY_TIERS[0]
+
+def set_quality(tier):
+    global QUALITY
+    QUALITY = QUALITY_TIERS[tier]
+
+class QualityGovernor:
+    """Watches per-frame work time (update + draw + flip, not the tick sleep)
+    over a rolling window and moves one tier at a time.
+
+    Steps down as soon as a full window runs hot (mean over 85% of the
+    budget, or p90 over 130%); steps up only after `up_after` seconds in a
+    row of real headroom (mean under 50%, p90 under 80%).  Every change
+    refills the window and holds for `cooldown` seconds, so one spike or a
+    tier that sits near the line cannot make it oscillate.
+    """
+    def __init__(self, pinned=None, fps=FPS, window=45, cooldown=1.5, up_after=3.0):
+        self.pinned = pinned
+        self.budget = 1000.0/fps
+        self.times = [0.0]*window; self.n = 0
+        self.cooldown = cooldown; self.up_frames = int(up_after*fps)
+        self.good = 0; self.hold = 0.0; self.t = 0.0
+        self.tier = pinned if pinned is not None else 0
+        self.changes = 0
+        set_quality(self.tier)
+
+    def frame(self, work_ms, dt):
+        self.t += dt
+        if self.pinned is not None: return
+        W = len(self.times)
+        self.times[self.n % W] = work_ms; self.n += 1
+        if self.n < W or self.t < self.hold: return
+        avg = sum(self.times)/W
+        p90 = sorted(self.times)[int(W*0.9)]
+        if avg > 0.85*self.budget or p90 > 1.3*self.budget:
+            if self.tier < len(QUALITY_TIERS)-1: self._move(+1, avg)
+            self.good = 0
+        elif avg < 0.5*self.budget and p90 < 0.8*self.budget:
+            self.good += 1
+            if self.good >= self.up_frames and self.tier > 0: self._move(-1, avg)
+        else:
+            self.good = 0
+
+    def _move(self, d, avg):
+        self.tier += d; self.changes += 1
+        set_quality(self.tier); FLIGHT.mark(f"quality {TIER_NAMES[self.tier]}")
+        self.n = 0; self.good = 0; self.hold = self.t + self.cooldown
+        print(f"⚙ Quality → {TIER_NAMES[self.tier]} (frames averaged {avg:.1f} ms, "
+              f"budget {self.budget:.1f} ms)")
+
+# ── BLOOM (one glow buffer, blurred and added per region) ─────
+class Bloom:
+    """Screen-space glow.  rect()/dot() queue emissive shapes; flush() groups
+    them into regions (overlapping halos merge), draws each region's shapes
+    additively, pre-scaled by strength, into an opaque buffer at 1/SCALE
+    resolution, blurs it by smoothscaling down another BLUR× and back up to
+    full size, and adds the result onto the target.  Blurred regions are
+    cached by their exact shape list, so static glows (panels, HUD) cost one
+    additive blit per frame.  Nothing is queued while glow is off for the
+    current quality tier.
+    """
+    SCALE = 4
+    BLUR  = 4
+    PAD   = 6            # buffer px of halo spill around each shape
+    CACHE = 48
+
+    def __init__(self):
+        self.buf = None; self.shapes = []; self.cache = {}
+        self.hits = self.misses = 0
+
+    def rect(self, color, x, y, w, h, strength=0.16):
+        if not QUALITY["glow"]: return
+        S = self.SCALE
+        r = pygame.Rect(x//S, y//S, max(1, w//S), max(1, h//S))
+        self.shapes.append((r.inflate(self.PAD*2, self.PAD*2), 0, tuple(r),
+                            tuple(int(c*strength) for c in color[:3])))
+
+    def dot(self, color, cx, cy, r, strength=0.3):
+        if not QUALITY["glow"]: return
+        S = self.SCALE; rr = max(1, r//S)
+        c = (cx//S, cy//S, rr)
+        self.shapes.append((pygame.Rect(c[0]-rr-self.PAD, c[1]-rr-self.PAD,
+                                        (rr+self.PAD)*2, (rr+self.PAD)*2), 1, c,
+                            tuple(int(k*strength) for k in color[:3])))
+
+    def _regions(self):
+        """[(bounds, [shape…])] with every overlapping pair of halos merged."""
+        groups = [(sh[0].copy(), [sh]) for sh in self.shapes]
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(groups)):
+                for j in range(i+1, len(groups)):
+                    if groups[i][0].colliderect(groups[j][0]):
+                        r, shs = groups.pop(j)
+                        groups[i][0].union_ip(r); groups[i][1].extend(shs)
+                        merged = True; break
+                if merged: break
+        return groups
+
+    def _render(self, r, shapes):
+        if self.buf is None: self.buf = pygame.Surface((SW//self.SCALE, SH//self.SCALE))
+        buf = self.buf; S, B = self.SCALE, self.BLUR
+        for _, kind, g, col in shapes:
+            if kind == 0: buf.fill(col, g, special_flags=pygame.BLEND_RGB_ADD)
+            else: pygame.draw.circle(buf, col, g[:2], g[2])
+        small = pygame.transform.smoothscale(buf.subsurface(r), (max(1, r.w//B), max(1, r.h//B)))
+        buf.fill((0, 0, 0), r)
+        return pygame.transform.smoothscale(small, (r.w*S, r.h*S))
+
+    def flush(self, surf):
+        if not self.shapes: return
+        bounds = pygame.Rect(0, 0, SW//self.SCALE, SH//self.SCALE)
+        for r, shapes in self._regions():
+            r = r.clip(bounds)
+            if r.w < 2 or r.h < 2: continue
+            key = (tuple(r), tuple(sh[1:] for sh in shapes))
+            img = self.cache.get(key)
+            if img is None:
+                self.misses += 1
+                img = self._render(r, shapes)
+                if len(self.cache) >= self.CACHE: del self.cache[next(iter(self.cache))]
+                self.cache[key] = img
+            else:
+                self.hits += 1
+            surf.blit(img, (r.x*self.SCALE, r.y*self.SCALE), special_flags=pygame.BLEND_RGB_ADD)
+        self.shapes.clear()
+
+BLOOM = Bloom()
+
+# ── DRAW LISTS + RENDER THREAD ───────────────────────────────
+class DrawList:
+    """One frame's drawing, recorded instead of rasterized.
+
+    Stands in for the display surface while Game.draw() runs (record_frame):
+    blit() / blits() / set_clip() and any gfx shape aimed at it append (fn, args, kw)
+    entries, and freeze() hands the render thread an immutable tuple.  The
+    surfaces it references must not be repainted in place while a list is in
+    flight, so caches that change (Widget faces, Aurora) swap surfaces."""
+    __slots__ = ("ops", "size", "_clip")
+    def __init__(self, size=(SW, SH)):
+        self.ops = []; self.size = size; self._clip = pygame.Rect((0, 0), size)
+    def blit(self, src, dest, area=None, special_flags=0):
+        if isinstance(dest, pygame.Rect): dest = dest.topleft
+        self.ops.append((pygame.Surface.blit, (src, dest, area and pygame.Rect(area), special_flags), {}))
+    def blits(self, seq, doreturn=True):
+        self.ops.append((pygame.Surface.blits, (tuple(seq), False), {}))
+    def set_clip(self, rect=None):
+        full = pygame.Rect((0, 0), self.size)
+        self._clip = full if rect is None else full.clip(rect)
+        self.ops.append((pygame.Surface.set_clip, (None if rect is None else pygame.Rect(rect),), {}))
+    def get_clip(self): return self._clip.copy()
+    def get_size(self): return self.size
+    def freeze(self): return tuple(self.ops)
+    @staticmethod
+    def run(surface, ops):
+        for fn, args, kw in ops: fn(surface, *args, **kw)
+
+def _recorded(fn):
+    def shape(surf, *args, **kw):
+        if surf.__class__ is DrawList: surf.ops.append((fn, args, kw)); return None
+        return fn(surf, *args, **kw)
+    shape.__name__ = fn.__name__
+    return shape
+
+class gfx:
+    """pygame.draw for anything that may be the screen: calls aimed at a
+    DrawList are recorded, real surfaces are drawn on as usual."""
+    rect, circle, ellipse, arc, line, lines, polygon = (
+        staticmethod(_recorded(getattr(pygame.draw, n)))
+        for n in ("rect", "circle", "ellipse", "arc", "line", "lines", "polygon"))
+
+def record_frame(draw):
+    """Run draw() with `screen` swapped for a DrawList; return its ops."""
+    global screen
+    real = screen; screen = DrawList(real.get_size())
+    try:
+        draw(); return screen.freeze()
+    finally:
+        screen = real
+
+class RenderThread:
+    """Executes frozen DrawLists into the display surface and flips it on a
+    worker thread, one frame behind the simulation.  pygame 2.6 holds the
+    GIL through blits and scales, so this overlaps little and is slower on
+    a single core (see --bench-render).  At most one frame is in flight:
+    submit() waits for the previous one.  `after(t)` runs on this thread
+    once the frame is on screen, with the perf_counter time."""
+    def __init__(self, surface, flip=True):
+        self.surface = surface; self.flip = flip; self.error = None
+        self._q = queue.SimpleQueue(); self._idle = threading.Event(); self._idle.set()
+        self._thread = threading.Thread(target=self._run, name="render", daemon=True)
+        self._thread.start()
+    def submit(self, ops, after=None):
+        self.wait(); self._idle.clear(); self._q.put((ops, after))
+    def wait(self):
+        self._idle.wait()
+        if self.error: err, self.error = self.error, None; raise err
+    def close(self):
+        self._idle.wait(); self._q.put(None); self._thread.join()
+    def _run(self):
+        while (job := self._q.get()) is not None:
+            ops, after = job
+            try:
+                DrawList.run(self.surface, ops)
+                if self.flip: pygame.display.flip()
+                if after: after(time.perf_counter())
+            except Exception as e:
+                self.error = e
+            finally:
+                self._idle.set()
 
 # ── DRAWING PRIMITIVES (NO per-frame surface alloc for simple shapes) ──────
 def draw_glass(surf, x, y, w, h, r=14, alpha=170, border=None, glow=None):
@@ -113,14 +494,11 @@ def draw_glass(surf, x, y, w, h, r=14, alpha=170, border=None, glow=None):
     if border:
         pygame.draw.rect(s, (*border, 200), (0, 0, w, h), 2, border_radius=r)
     surf.blit(s, (x, y))
-    if glow:
-        gs = pygame.Surface((w + 20, h + 20), pygame.SRCALPHA)
-        pygame.draw.rect(gs, (*glow, 35), (0, 0, w+20, h+20), border_radius=r+10)
-        surf.blit(gs, (x-10, y-10))
+    if glow: BLOOM.rect(glow, x, y, w, h)
 
 def draw_ring(surf, cx, cy, r, ratio, full_c, empty_c=(25,38,80)):
     """Circular timer ring — fast arc via polygon segments."""
-    pygame.draw.circle(surf, empty_c, (cx, cy), r, 5)
+    gfx.circle(surf, empty_c, (cx, cy), r, 5)
     if ratio <= 0:
         return
     segs = max(1, int(48 * ratio))
@@ -129,7 +507,7 @@ def draw_ring(surf, cx, cy, r, ratio, full_c, empty_c=(25,38,80)):
         a = math.pi/2 - 2*math.pi * (i/48)
         pts.append((cx + math.cos(a)*r, cy - math.sin(a)*r))
     if len(pts) >= 2:
-        pygame.draw.lines(surf, full_c, False, pts, 5)
+        gfx.lines(surf, full_c, False, pts, 5)
 
 def draw_btn(surf, x, y, w, h, color, text, font, active=True, hover=False):
     alpha = 200 if active else 90
@@ -141,12 +519,9 @@ def draw_btn(surf, x, y, w, h, color, text, font, active=True, hover=False):
     surf.blit(t, t.get_rect(center=(x+w//2, y+h//2)))
 
 def glow_dot(surf, color, cx, cy, r):
-    """Small glowing circle — minimal surface."""
-    g = r + 8
-    s = pygame.Surface((g*2, g*2), pygame.SRCALPHA)
-    pygame.draw.circle(s, (*color, 45), (g, g), g)
-    pygame.draw.circle(s, color, (g, g), r)
-    surf.blit(s, (cx-g, cy-g))
+    """Small glowing circle — the halo comes from BLOOM."""
+    gfx.circle(surf, color, (cx, cy), r)
+    BLOOM.dot(color, cx, cy, r + 4)
 
 # ── SOUND (tiny, fast, procedural) ───────────────────────────
 def _sine_buf(freq, dur, vol=0.32):
@@ -209,89 +584,400 @@ def _bgm_buf():
             add(st+i, int(s*32767))
     return bytes(buf)
 
-SFX = {}
-if AUDIO_OK:
-    try:
-        print("🎵 Generating sounds...")
-        SFX["pop"]   = pygame.mixer.Sound(buffer=_sine_buf(700, 0.08, 0.28))
-        SFX["ok"]    = pygame.mixer.Sound(buffer=_chord_buf([523,659,784], 0.30, 0.32))
-        SFX["wrong"] = pygame.mixer.Sound(buffer=_sine_buf(180, 0.20, 0.25))
-        SFX["combo"] = pygame.mixer.Sound(buffer=_chord_buf([523,659,784,1047], 0.38, 0.34))
-        SFX["expire"]= pygame.mixer.Sound(buffer=_sine_buf(280, 0.18, 0.20))
-        SFX["lvl"]   = pygame.mixer.Sound(buffer=_chord_buf([392,494,587,784], 0.50, 0.35))
-        SFX["click"] = pygame.mixer.Sound(buffer=_sine_buf(1050, 0.05, 0.15))
-        print("🎵 Building BGM (procedural fallback)...")
-        if not _music_loaded:
-            bgm = pygame.mixer.Sound(buffer=_bgm_buf())
-            bgm.set_volume(0.18)
-            bgm.play(loops=-1)
-            print("🎵 Procedural BGM playing!")
-        else:
-            print("🎵 Using real music file — skipping procedural BGM")
-    except Exception as e:
-        print(f"⚠ Audio skipped: {e}")
-        AUDIO_OK = False
+# name → (synth function, args); each Sound is synthesized on first play
+SFX_SPECS = {
+    "pop":    (_sine_buf,  (700, 0.08, 0.28)),
+    "ok":     (_chord_buf, ([523,659,784], 0.30, 0.32)),
+    "wrong":  (_sine_buf,  (180, 0.20, 0.25)),
+    "combo":  (_chord_buf, ([523,659,784,1047], 0.38, 0.34)),
+    "expire": (_sine_buf,  (280, 0.18, 0.20)),
+    "lvl":    (_chord_buf, ([392,494,587,784], 0.50, 0.35)),
+    "click":  (_sine_buf,  (1050, 0.05, 0.15)),
+}
+
+class SoundBank(dict):
+    """SFX registry — synthesizes a sound the first time it is looked up."""
+    def __missing__(self, name):
+        fn, args = SFX_SPECS[name]
+        snd = self[name] = pygame.mixer.Sound(buffer=fn(*args))
+        return snd
+
+SFX = SoundBank()
 
 def sfx(name):
-    if AUDIO_OK and name in SFX:
+    if AUDIO_OK and name in SFX_SPECS:
         try: SFX[name].play()
         except: pass
 
-# ── DATA ──────────────────────────────────────────────────────
-INGREDIENTS = [
-    {"name":"Salmon",    "color":(255,110, 70), "short":"salmon",  "unlock":1},
-    {"name":"Rice",      "color":(200,218,255), "short":"rice",    "unlock":1},
-    {"name":"Avocado",   "color":( 65,185, 75), "short":"avocado", "unlock":1},
-    {"name":"Ice",       "color":(115,200,255), "short":"ice",     "unlock":1},
-    {"name":"Mango",     "color":(255,185, 35), "short":"mango",   "unlock":2},
-    {"name":"Cream",     "color":(255,240,210), "short":"cream",   "unlock":2},
-    {"name":"Boba",      "color":(120, 72, 32), "short":"boba",    "unlock":2},
-    {"name":"Chocolate", "color":( 90, 52, 22), "short":"choco",   "unlock":3},
-    {"name":"Shrimp",    "color":(235,115, 65), "short":"shrimp",  "unlock":3},
-    {"name":"Seaweed",   "color":( 45,175, 75), "short":"seaweed", "unlock":3},
-    {"name":"Cheese",    "color":(255,205, 45), "short":"cheese",  "unlock":4},
-    {"name":"Squid",     "color":(185, 95,215), "short":"squid",   "unlock":4},
-    {"name":"Strawberry","color":(255, 65, 95), "short":"strawb",  "unlock":5},
-    {"name":"Krill",     "color":(215, 65, 85), "short":"krill",   "unlock":5},
-]
-IMAP = {i["short"]: i for i in INGREDIENTS}
-
-# All recipes validated — ingredients unlock ≤ recipe unlock
-RECIPES = [
-    {"name":"Poke Bowl",   "unlock":1,"stars":1,"time":18,"ing":["salmon","rice","avocado"]},
-    {"name":"Salmon Chill","unlock":1,"stars":1,"time":15,"ing":["salmon","rice","ice"]},
-    {"name":"Avo Chill",   "unlock":1,"stars":1,"time":14,"ing":["avocado","ice","rice"]},
-    {"name":"Mango Shake", "unlock":2,"stars":1,"time":16,"ing":["mango","cream","ice"]},
-    {"name":"Bubble Tea",  "unlock":2,"stars":1,"time":15,"ing":["boba","cream","ice"]},
-    {"name":"Mango Cream", "unlock":2,"stars":2,"time":18,"ing":["mango","cream","boba"]},
-    {"name":"Avo Bowl",    "unlock":2,"stars":2,"time":19,"ing":["avocado","rice","mango"]},
-    {"name":"Sushi Bowl",  "unlock":3,"stars":2,"time":20,"ing":["salmon","rice","seaweed"]},
-    {"name":"Choco Dream", "unlock":3,"stars":2,"time":18,"ing":["choco","cream","boba"]},
-    {"name":"Ramen Bowl",  "unlock":3,"stars":2,"time":22,"ing":["shrimp","seaweed","rice"]},
-    {"name":"Protein Bowl","unlock":3,"stars":3,"time":25,"ing":["salmon","avocado","shrimp","rice"]},
-    {"name":"Ice Cream",   "unlock":4,"stars":2,"time":16,"ing":["cream","choco","ice"]},
-    {"name":"Cheese Ramen","unlock":4,"stars":3,"time":24,"ing":["cheese","shrimp","seaweed","rice"]},
-    {"name":"Squid Ink",   "unlock":4,"stars":2,"time":20,"ing":["squid","seaweed","rice"]},
-    {"name":"Milkshake",   "unlock":5,"stars":2,"time":16,"ing":["cream","strawb","ice"]},
-    {"name":"Mocktail",    "unlock":5,"stars":3,"time":22,"ing":["mango","strawb","cream","ice"]},
-    {"name":"Polar Plate", "unlock":5,"stars":3,"time":26,"ing":["salmon","krill","squid","seaweed"]},
-]
-
-# Sanity-check recipes at startup
-for _r in RECIPES:
-    for _i in _r["ing"]:
-        _ing_unlock = IMAP[_i]["unlock"]
-        assert _ing_unlock <= _r["unlock"], \
-            f"Recipe '{_r['name']}' needs '{_i}' (unlock {_ing_unlock}) but recipe unlocks at {_r['unlock']}"
+def mute_audio():
+    """Silence everything — headless replays, bots and sweep workers."""
+    global AUDIO_OK
+    AUDIO_OK = False
+    if pygame.mixer.get_init():
+        pygame.mixer.stop(); pygame.mixer.music.stop()
+
+# ── RECIPE INDEX (integer ids, per-level tables, prefix trie) ──────────────
+class RecipeIndex:
+    """Compiled lookup tables over INGREDIENTS / RECIPES.
+
+    ing_id[short] → int and shorts[id] → short; keys[rid] is a recipe's
+    ingredient-id tuple and by_key[key] → rid.  unlocked_at(level) and
+    avail_at(level) return tables precomputed per level.  Recipes form a
+    prefix trie: node 0 is the empty bowl, child[node][ing_id] → node and
+    path[rid] lists the nodes a recipe passes through, root first.
+    """
+    def __init__(self, ingredients, recipes):
+        self.shorts  = [i["short"] for i in ingredients]
+        self.ing_id  = {sh: n for n, sh in enumerate(self.shorts)}
+        self.recipes = list(recipes)
+        self.keys    = [tuple(self.ing_id[i] for i in r["ing"]) for r in self.recipes]
+        self.by_key  = {}
+        for rid, key in enumerate(self.keys): self.by_key.setdefault(key, rid)
+        top = max([1] + [i["unlock"] for i in ingredients] + [r["unlock"] for r in self.recipes])
+        self._unlocked = [frozenset()] + [
+            frozenset(i["short"] for i in ingredients if i["unlock"] <= lv)
+            for lv in range(1, top+1)]
+        self._avail = [()] + [
+            tuple(rid for rid, r in enumerate(self.recipes)
+                  if r["unlock"] <= lv and all(i in self._unlocked[lv] for i in r["ing"]))
+            for lv in range(1, top+1)]
+        self.child = [{}]; self.parent = [-1]; self.depth = [0]
+        self.path  = []
+        for key in self.keys:
+            node, nodes = 0, [0]
+            for iid in key:
+                nxt = self.child[node].get(iid)
+                if nxt is None:
+                    nxt = len(self.child); self.child[node][iid] = nxt
+                    self.child.append({}); self.parent.append(node)
+                    self.depth.append(self.depth[node]+1)
+                node = nxt; nodes.append(node)
+            self.path.append(tuple(nodes))
+
+    def unlocked_at(self, level):
+        return self._unlocked[max(0, min(level, len(self._unlocked)-1))]
+
+    def avail_at(self, level):
+        return self._avail[max(0, min(level, len(self._avail)-1))]
+
+    def step(self, node, short):
+        """Trie node after adding `short` to a bowl at `node` (-1 = no recipe)."""
+        if node < 0: return -1
+        return self.child[node].get(self.ing_id.get(short, -1), -1)
+
+class BowlMatcher:
+    """Incremental bowl ↔ order matching for one Game.
+
+    Every live order is filed under each trie node on its recipe's path, so
+    the orders the bowl can still become are simply those filed under the
+    bowl's current node, and exact matches are those that end there.  Adding
+    or removing a bowl ingredient is a single trie step.
+    """
+    def __init__(self, index):
+        self.index = index
+        self.through = {}          # node → orders whose recipe passes through it
+        self.ends    = {}          # node → orders whose recipe ends at it
+        self.nodes   = [0]         # bowl's node after each ingredient
+
+    @property
+    def node(self): return self.nodes[-1]
+
+    def add_order(self, o):
+        path = self.index.path[o.rid]
+        for n in path: self.through.setdefault(n, []).append(o)
+        self.ends.setdefault(path[-1], []).append(o)
+
+    def remove_order(self, o):
+        path = self.index.path[o.rid]
+        for n in path:
+            lst = self.through.get(n)
+            if lst and o in lst: lst.remove(o)
+        lst = self.ends.get(path[-1])
+        if lst and o in lst: lst.remove(o)
+
+    def clear_orders(self):
+        self.through.clear(); self.ends.clear()
+
+    def push(self, short): self.nodes.append(self.index.step(self.node, short))
+    def pop(self):
+        if len(self.nodes) > 1: self.nodes.pop()
+    def clear_bowl(self): del self.nodes[1:]
+
+    def candidates(self):
+        """Live orders the current bowl is still a prefix of (oldest first)."""
+        return [o for o in self.through.get(self.node, ()) if not o.done and not o.failed]
+
+    def match(self):
+        """Oldest live order the bowl matches exactly, or None."""
+        for o in self.ends.get(self.node, ()):
+            if not o.done and not o.failed: return o
+        return None
+
+def bench_recipe_index(sizes=(10, 100, 1000, 10000), n_ing=300, reps=20000, seed=7):
+    """Time index build, per-level spawn pick and incremental bowl matching on
+    synthetic content packs, next to the old linear scans."""
+    rng = random.Random(seed)
+    ings = [{"name": f"I{k}", "short": f"i{k}", "color": (128,128,128),
+             "unlock": 1 + k*5//n_ing} for k in range(n_ing)]
+    print(f"{'recipes':>8} {'build ms':>9} {'spawn µs':>9} {'scan µs':>9} {'match µs':>9} {'list µs':>9}")
+    for n in sizes:
+        recs = []
+        for k in range(n):
+            lv = rng.randint(1, 5)
+            pool = [i["short"] for i in ings if i["unlock"] <= lv]
+            recs.append({"name": f"R{k}", "unlock": lv, "stars": 1, "time": 20,
+                         "ing": rng.sample(pool, rng.randint(3, 6))})
+        t0 = time.perf_counter(); idx = RecipeIndex(ings, recs)
+        build = (time.perf_counter()-t0)*1e3
+        t0 = time.perf_counter()
+        for _ in range(reps): rng.choice(idx.avail_at(3))
+        spawn = (time.perf_counter()-t0)/reps*1e6
+        scan_reps = max(1, reps*10//n)
+        t0 = time.perf_counter()
+        for _ in range(scan_reps):
+            ul = {i["short"] for i in ings if i["unlock"] <= 3}
+            rng.choice([r for r in recs if r["unlock"] <= 3 and all(i in ul for i in r["ing"])])
+        scan = (time.perf_counter()-t0)/scan_reps*1e6
+        # 4 live orders; serve the oldest by adding its ingredients one by one
+        class _O: __slots__ = ("rid", "recipe", "done", "failed")
+        orders = []
+        for rid in rng.sample(range(n), min(4, n)):
+            o = _O(); o.rid = rid; o.recipe = recs[rid]; o.done = o.failed = False
+            orders.append(o)
+        m = BowlMatcher(idx)
+        for o in orders: m.add_order(o)
+        want = orders[0].recipe["ing"]
+        t0 = time.perf_counter()
+        for _ in range(reps // len(want)):
+            m.clear_bowl()
+            for sh in want: m.push(sh); m.candidates()
+            assert m.match() is orders[0]
+        match = (time.perf_counter()-t0)/(reps // len(want) * len(want))*1e6
+        t0 = time.perf_counter()
+        for _ in range(reps // len(want)):
+            bowl = []
+            for sh in want:
+                bowl.append(sh)
+                [o for o in orders if o.recipe["ing"][:len(bowl)] == bowl]
+        lst = (time.perf_counter()-t0)/(reps // len(want) * len(want))*1e6
+        print(f"{n:>8} {build:>9.1f} {spawn:>9.2f} {scan:>9.1f} {match:>9.2f} {lst:>9.2f}")
+
+# ── CONTENT PACKS ─────────────────────────────────────────────
+# Ingredients (with icons as drawing primitives), recipes and levels come
+# from a pack file — JSON, or TOML where tomllib exists (Python 3.11+).
+# A pack is validated against PACK_SCHEMA once, then compiled to a marshal
+# cache keyed by the source's mtime and size; later startups load that in
+# milliseconds and only re-validate when the file changes.
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+import json, marshal, hashlib, zlib
+
+BASE_PACK   = os.path.join(BASE_DIR, "packs", "base.json")
+PACK_FORMAT = 1          # bump when PACK_SCHEMA or the compiled layout changes
+MAX_BOWL    = 6
+
+class PackError(ValueError):
+    """A content pack could not be read or failed validation."""
+
+# Icon primitive: [op, colour, *args] with coordinates relative to the icon
+# centre.  Colour is "base" / "dark" / "light" (derived from the ingredient
+# colour) or [r, g, b].  Arguments prefixed "?" are optional.
+ICON_OPS = {
+    "poly":    ("points", "?width"),
+    "lines":   ("points", "width"),
+    "line":    ("point", "point", "width"),
+    "ellipse": ("rect", "?width"),
+    "rect":    ("rect", "?width", "?radius"),
+    "circle":  ("point", "size", "?width"),
+    "disc":    ("point", "size", "?alpha"),   # alpha-blended filled circle
+}
+PACK_SCHEMA = {
+    "name": str, "?version": int,
+    "ingredients": [{"name": str, "short": str, "color": "rgb",
+                     "unlock": int, "?icon": ["icon"]}],
+    "recipes":     [{"name": str, "unlock": int, "stars": int,
+                     "time": "number", "ing": [str]}],
+    "levels":      [{"duration": "number", "target": int, "title": str}],
+}
+
+def _is_int(v): return isinstance(v, int) and not isinstance(v, bool)
+
+def _check_arg(v, kind):
+    if kind == "point":  return isinstance(v, list) and len(v) == 2 and all(map(_is_int, v))
+    if kind == "points": return isinstance(v, list) and len(v) >= 2 and all(_check_arg(p, "point") for p in v)
+    if kind == "rect":   return isinstance(v, list) and len(v) == 4 and all(map(_is_int, v))
+    return _is_int(v) and v >= 0
+
+def _check_icon_prim(v, where, errs):
+    if not isinstance(v, list) or len(v) < 2 or v[0] not in ICON_OPS:
+        errs.append(f"{where}: expected [op, colour, ...] with op in {', '.join(ICON_OPS)}"); return
+    op, clr, args = v[0], v[1], v[2:]
+    if not (clr in ("base", "dark", "light") or _check(clr, "rgb", where, [])):
+        errs.append(f"{where}: bad colour {clr!r}")
+    kinds = ICON_OPS[op]
+    need = sum(not k.startswith("?") for k in kinds)
+    if not need <= len(args) <= len(kinds):
+        errs.append(f"{where}: '{op}' takes {need}–{len(kinds)} arguments, got {len(args)}"); return
+    for n, (a, k) in enumerate(zip(args, kinds)):
+        if not _check_arg(a, k.lstrip("?")):
+            errs.append(f"{where}: argument {n+1} of '{op}' should be a {k.lstrip('?')}")
+
+def _check(v, spec, where, errs):
+    """Structural validation against PACK_SCHEMA; appends to errs, returns ok."""
+    n0 = len(errs)
+    if isinstance(spec, dict):
+        if not isinstance(v, dict):
+            errs.append(f"{where}: expected a table"); return False
+        for key, sub in spec.items():
+            k = key.lstrip("?")
+            if k in v: _check(v[k], sub, f"{where}.{k}", errs)
+            elif not key.startswith("?"): errs.append(f"{where}: missing '{k}'")
+        errs.extend(f"{where}: unknown key '{k}'" for k in v
+                    if k not in spec and "?"+k not in spec)
+    elif isinstance(spec, list):
+        if not isinstance(v, list) or not v:
+            errs.append(f"{where}: expected a non-empty list"); return False
+        for n, item in enumerate(v): _check(item, spec[0], f"{where}[{n}]", errs)
+    elif spec == "rgb":
+        if not (isinstance(v, list) and len(v) == 3 and all(_is_int(c) and 0 <= c <= 255 for c in v)):
+            errs.append(f"{where}: expected [r, g, b] with 0–255 components")
+    elif spec == "number":
+        if not ((_is_int(v) or isinstance(v, float)) and v > 0):
+            errs.append(f"{where}: expected a positive number")
+    elif spec == "icon":
+        _check_icon_prim(v, where, errs)
+    elif spec is int:
+        if not _is_int(v): errs.append(f"{where}: expected an integer")
+    elif not (isinstance(v, str) and v):
+        errs.append(f"{where}: expected a non-empty string")
+    return len(errs) == n0
+
+def validate_pack(raw, src="pack"):
+    """Schema plus cross-reference checks; raises PackError listing every problem."""
+    errs = []
+    if _check(raw, PACK_SCHEMA, src, errs):
+        levels = len(raw["levels"]); imap = {}
+        for n, i in enumerate(raw["ingredients"]):
+            if i["short"] in imap: errs.append(f"{src}.ingredients[{n}]: duplicate short '{i['short']}'")
+            imap[i["short"]] = i
+            if not 1 <= i["unlock"] <= levels:
+                errs.append(f"{src}.ingredients[{n}]: unlock {i['unlock']} outside levels 1–{levels}")
+        names = set()
+        for n, r in enumerate(raw["recipes"]):
+            where = f"{src}.recipes[{n}] '{r['name']}'"
+            if r["name"] in names: errs.append(f"{where}: duplicate recipe name")
+            names.add(r["name"])
+            if not 1 <= r["unlock"] <= levels:
+                errs.append(f"{where}: unlock {r['unlock']} outside levels 1–{levels}")
+            if r["stars"] < 1: errs.append(f"{where}: stars must be ≥ 1")
+            if len(r["ing"]) > MAX_BOWL: errs.append(f"{where}: more than {MAX_BOWL} ingredients")
+            for sh in r["ing"]:
+                if sh not in imap:
+                    errs.append(f"{where}: unknown ingredient '{sh}'")
+                elif imap[sh]["unlock"] > r["unlock"]:
+                    errs.append(f"{where}: needs '{sh}' (unlock {imap[sh]['unlock']}) "
+                                f"but recipe unlocks at {r['unlock']}")
+        for n, lv in enumerate(raw["levels"]):
+            if lv["target"] < 1: errs.append(f"{src}.levels[{n}]: target must be ≥ 1")
+    if errs:
+        raise PackError(f"{len(errs)} problem(s) in {src}:\n  " + "\n  ".join(errs))
+
+def compile_pack(raw, src="pack"):
+    """Validate and flatten a parsed pack into the marshal-friendly runtime form."""
+    validate_pack(raw, src)
+    return {
+        "name": raw["name"], "version": raw.get("version", 1),
+        "ingredients": [{"name": i["name"], "short": i["short"], "color": tuple(i["color"]),
+                         "unlock": i["unlock"], "icon": i.get("icon", [])}
+                        for i in raw["ingredients"]],
+        "recipes": [{"name": r["name"], "unlock": r["unlock"], "stars": r["stars"],
+                     "time": r["time"], "ing": list(r["ing"])} for r in raw["recipes"]],
+        "levels": [(lv["duration"], lv["target"], lv["title"]) for lv in raw["levels"]],
+    }
+
+def cache_dir():
+    """Per-user cache directory ($PINGU_CACHE_DIR overrides)."""
+    d = os.environ.get("PINGU_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pingu-kitchen")
+    os.makedirs(d, exist_ok=True)
+    return d
+
+def _read_pack_source(path):
+    try:
+        if path.endswith(".toml"):
+            if tomllib is None: raise PackError(f"{path}: TOML packs need Python 3.11+ (tomllib)")
+            with open(path, "rb") as f: return tomllib.load(f)
+        with open(path, encoding="utf-8") as f: return json.load(f)
+    except (OSError, ValueError) as e:
+        if isinstance(e, PackError): raise
+        raise PackError(f"{path}: {e}") from e
+
+def load_pack(path=BASE_PACK):
+    """Load a content pack, from the compiled cache when it is still current."""
+    path = os.path.abspath(path)
+    try: st = os.stat(path)
+    except OSError as e: raise PackError(f"{path}: {e}") from e
+    stamp = [PACK_FORMAT, st.st_mtime_ns, st.st_size]
+    cache = None
+    try:
+        cache = os.path.join(cache_dir(), "pack-" + hashlib.sha1(path.encode()).hexdigest()[:16] + ".bin")
+        with open(cache, "rb") as f: cached_stamp, pack = marshal.loads(f.read())
+        if cached_stamp == stamp: return pack
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
+    pack = compile_pack(_read_pack_source(path), os.path.basename(path))
+    if cache:
+        try:
+            tmp = cache + f".{os.getpid()}.tmp"
+            with open(tmp, "wb") as f: f.write(marshal.dumps([stamp, pack]))
+            os.replace(tmp, cache)
+        except OSError:
+            pass                      # read-only cache dir — just recompile next time
+    return pack
+
+def install_pack(pack, icons=None, faces=None):
+    """Make `pack` the live content: rebinds INGREDIENTS, RECIPES, IMAP, INDEX
+    and LEVEL_CONFIG, plus Game.LEVEL_CONFIG once defined.  The icon and card
+    face caches are cleared, or — for a hot reload — only the `icons`
+    (shorts) and `faces` (recipe names) given."""
+    global PACK, INGREDIENTS, RECIPES, IMAP, INDEX, LEVEL_CONFIG
+    PACK = pack
+    INGREDIENTS = pack["ingredients"]; RECIPES = pack["recipes"]
+    IMAP = {i["short"]: i for i in INGREDIENTS}
+    INDEX = RecipeIndex(INGREDIENTS, RECIPES)
+    LEVEL_CONFIG = list(pack["levels"])
+    g = globals()
+    if "Game" in g: Game.LEVEL_CONFIG = LEVEL_CONFIG
+    if "ICONS" in g:
+        for cache in (ICONS, ICONS_SM):
+            if icons is None: cache.clear()
+            else:
+                for sh in icons: cache.pop(sh, None)
+    if "OrderCard" in g:
+        if faces is None: OrderCard.FACES.clear()
+        else:
+            for name in faces: OrderCard.FACES.pop(name, None)
+
+# Empty until content() or install_pack(): loading reads and may write the
+# pack cache, which a bare import must not do.
+PACK = None; INGREDIENTS = []; RECIPES = []; IMAP = {}; INDEX = None; LEVEL_CONFIG = []
+
+def content():
+    """The live pack, installing packs/base.json on first use."""
+    if PACK is None: install_pack(load_pack(BASE_PACK))
+    return PACK
 
 # ── INGREDIENT ICONS (procedural, drawn once into cached surfaces) ─────────
 def _make_icon(short, size):
     s  = pygame.Surface((size, size), pygame.SRCALPHA)
     c  = size // 2
     r  = size // 2 - 2
-    col = IMAP.get(short, {"color":(150,150,150)})["color"]
-    dk  = lc(col, (10,10,30), 0.40)
-    lt  = lc(col, (255,255,255), 0.55)
+    ing = IMAP.get(short, {"color":(150,150,150)})
+    col = ing["color"]
+    shade = {"base": col, "dark": lc(col, (10,10,30), 0.40),
+             "light": lc(col, (255,255,255), 0.55)}
 
     def circ(x, y, rad, clr, a=255):
         if rad < 1: return
@@ -299,157 +985,298 @@ def _make_icon(short, size):
         pygame.draw.circle(ts, (*clr, a), (rad, rad), rad)
         s.blit(ts, (x-rad, y-rad))
 
-    if short == "salmon":
-        pts = [(c-12,c),(c-3,c-8),(c+10,c-3),(c+14,c),(c+10,c+3),(c-3,c+8)]
-        pygame.draw.polygon(s, col, pts)
-        pygame.draw.polygon(s, dk, [(c+10,c-3),(c+18,c-8),(c+18,c+8),(c+10,c+3)])
-        pygame.draw.line(s, lt, (c-3,c-5),(c+7,c-1), 2)
-        pygame.draw.circle(s, (30,20,20), (c-6,c-1), 2)
-    elif short == "rice":
-        pygame.draw.ellipse(s, dk, (c-12,c-2,24,15))
-        pygame.draw.ellipse(s, (228,235,255), (c-11,c-3,22,13))
-        for ox,oy in [(-4,-2),(0,-4),(4,-2),(-2,2),(2,2)]:
-            circ(c+ox,c+oy,3,(248,252,255))
-    elif short == "avocado":
-        pygame.draw.ellipse(s, dk, (c-9,c-13,18,26))
-        pygame.draw.ellipse(s, col, (c-8,c-12,16,24))
-        pygame.draw.ellipse(s, lt,  (c-5,c-10,10,16))
-        pygame.draw.ellipse(s, (100,62,30),(c-4,c-3,8,11))
-    elif short == "ice":
-        pts = [(c,c-13),(c+11,c-6),(c+11,c+6),(c,c+13),(c-11,c+6),(c-11,c-6)]
-        pygame.draw.polygon(s, col, pts)
-        pygame.draw.polygon(s, lt, pts, 2)
-        pygame.draw.line(s, WHITE, (c-3,c-6),(c+3,c), 1)
-        circ(c-4,c-4,2,WHITE,70)
-    elif short == "mango":
-        pygame.draw.ellipse(s, dk, (c-9,c-13,18,28))
-        pygame.draw.ellipse(s, col, (c-8,c-12,16,26))
-        pygame.draw.ellipse(s, (255,222,80),(c-4,c-9,8,18))
-        pygame.draw.line(s, (90,140,55),(c,c-12),(c,c-17),2)
-    elif short == "cream":
-        circ(c,c+6,10,(255,248,235))
-        for i in range(3):
-            a2 = math.radians(-90+i*120)
-            circ(c+int(math.cos(a2)*6),c+6+int(math.sin(a2)*6),6,(255,244,225))
-        circ(c,c,6,WHITE)
-        circ(c,c-9,4,(215,40,55))
-        pygame.draw.line(s,(75,145,45),(c,c-9),(c+4,c-14),1)
-    elif short == "boba":
-        pygame.draw.rect(s, dk,  (c-9,c-8,18,20), border_radius=3)
-        pygame.draw.rect(s, col, (c-8,c-7,16,18), border_radius=3)
-        for ox,oy in [(-3,1),(1,4),(5,1),(-1,7),(4,7)]:
-            circ(c-2+ox,c+oy,2,(55,32,12))
-        pygame.draw.line(s,(195,95,45),(c+4,c-12),(c+6,c+3),2)
-    elif short == "choco":
-        for row in range(2):
-            for col2 in range(2):
-                rx2,ry2 = c-10+col2*10, c-8+row*10
-                pygame.draw.rect(s, dk,  (rx2,ry2,9,9), border_radius=2)
-                pygame.draw.rect(s, col, (rx2+1,ry2+1,7,7), border_radius=2)
-        pygame.draw.line(s, dk,(c,c-8),(c,c+2),2)
-        pygame.draw.line(s, dk,(c-10,c),(c+10,c),2)
-    elif short == "shrimp":
-        pts2 = []
-        for i in range(10):
-            a2 = math.radians(i*16-20)
-            rad = 9-i*0.2
-            pts2.append((c+int(math.cos(a2)*rad)-2, c+int(math.sin(a2)*rad+i*1.2)-6))
-        if len(pts2)>1: pygame.draw.lines(s,col,False,pts2,4)
-        if len(pts2)>1: pygame.draw.lines(s,lt, False,pts2[:5],2)
-        if pts2: circ(pts2[0][0],pts2[0][1],3,dk)
-    elif short == "seaweed":
-        for st2 in range(3):
-            sx2=c-7+st2*7; pts3=[]
-            for j in range(7):
-                w2=math.sin(j*0.9+st2)*4
-                pts3.append((sx2+int(w2),c+10-j*4))
-            if len(pts3)>1:
-                pygame.draw.lines(s,dk, False,pts3,4)
-                pygame.draw.lines(s,col,False,pts3,2)
-    elif short == "cheese":
-        pts4=[(c-12,c+8),(c+12,c+8),(c+6,c-10),(c-6,c-10)]
-        pygame.draw.polygon(s,col,pts4)
-        pygame.draw.polygon(s,dk, pts4,2)
-        for hx2,hy2 in [(c-2,c+2),(c+5,c-3),(c-6,c-2)]:
-            circ(hx2,hy2,2,dk)
-    elif short == "squid":
-        pygame.draw.ellipse(s,col,(c-7,c-12,14,16))
-        pygame.draw.ellipse(s,lt, (c-4,c-10, 8, 9))
-        pygame.draw.circle(s,(25,15,50),(c-3,c-7),2)
-        pygame.draw.circle(s,(25,15,50),(c+3,c-7),2)
-        for i2 in range(4):
-            tx2=c-6+i2*4
-            for j2 in range(3):
-                py2=c+5+j2*4
-                circ(tx2,int(py2),2,dk)
-    elif short == "strawb":
-        pygame.draw.ellipse(s,col,(c-8,c-8,16,17))
-        pygame.draw.ellipse(s,dk, (c-8,c-8,16,17),2)
-        for sx2,sy2 in [(-3,-3),(2,-1),(-1,2),(3,0),(0,4)]:
-            circ(c+sx2,c+sy2,1,(255,238,238))
-        pygame.draw.polygon(s,(70,170,40),[(c,c-8),(c-3,c-13),(c,c-10),(c+3,c-13)])
-    elif short == "krill":
-        for i3 in range(5):
-            a3=math.radians(i3*20-40)
-            circ(c+int(math.cos(a3)*8),c+int(math.sin(a3)*8),3,col)
-        circ(c,c,3,dk)
-    else:
-        circ(c,c,r,col)
+    def at(p): return (c+p[0], c+p[1])
+
+    for op, clr, *a in ing.get("icon") or [("disc", "base", (0, 0), r)]:
+        clr = shade[clr] if isinstance(clr, str) else tuple(clr)
+        if   op == "poly":    pygame.draw.polygon(s, clr, [at(p) for p in a[0]], *a[1:])
+        elif op == "lines":   pygame.draw.lines(s, clr, False, [at(p) for p in a[0]], a[1])
+        elif op == "line":    pygame.draw.line(s, clr, at(a[0]), at(a[1]), a[2])
+        elif op == "ellipse": pygame.draw.ellipse(s, clr, (c+a[0][0], c+a[0][1], a[0][2], a[0][3]), *a[1:])
+        elif op == "rect":
+            pygame.draw.rect(s, clr, (c+a[0][0], c+a[0][1], a[0][2], a[0][3]),
+                             a[1] if len(a) > 1 else 0, border_radius=a[2] if len(a) > 2 else 0)
+        elif op == "circle":  pygame.draw.circle(s, clr, at(a[0]), a[1], *a[2:])
+        elif op == "disc":    circ(c+a[0][0], c+a[0][1], a[1], clr, *a[2:])
     # Sheen
     sh = pygame.Surface((size,size),pygame.SRCALPHA)
     pygame.draw.circle(sh,(255,255,255,22),(c-r//3,c-r//3),r//2)
     s.blit(sh,(0,0))
     return s
 
-print("🎨 Rendering icons...")
-ICONS    = {i["short"]: _make_icon(i["short"], 44) for i in INGREDIENTS}
-ICONS_SM = {i["short"]: _make_icon(i["short"], 26) for i in INGREDIENTS}
+class IconCache(dict):
+    """short → icon Surface at one size, rendered on first lookup."""
+    def __init__(self, size):
+        super().__init__(); self.size = size
+    def __missing__(self, short):
+        if short not in IMAP: raise KeyError(short)
+        icon = self[short] = _make_icon(short, self.size)
+        return icon
+    def get(self, short, default=None):
+        try: return self[short]
+        except KeyError: return default
+
+ICONS    = IconCache(44)
+ICONS_SM = IconCache(26)
+
+# ── COLOUR RAMPS + GRADIENTS ──────────────────────────────────
+# A Ramp samples lc() once into a lookup table, so per-frame colour fades
+# (timer rings, card borders, pulses) cost a list index.  Gradient surfaces
+# are one byte string → 1-px strip → scale, cached by their parameters, so
+# a gradient panel drawn every frame is a single blit.
+class Ramp:
+    """Colour ramp through evenly spaced `stops`, sampled at n+1 steps;
+    ramp(t) is within one level per channel of lc()."""
+    __slots__ = ("lut", "n")
+    def __init__(self, *stops, n=255):
+        k = len(stops) - 1; self.n = n
+        def at(t):
+            i = min(int(t*k), k-1)
+            return lc(stops[i], stops[i+1], t*k - i)
+        self.lut = [at(i/n) for i in range(n+1)]
+    def __call__(self, t):
+        if t <= 0: return self.lut[0]
+        if t >= 1: return self.lut[-1]
+        return self.lut[int(t*self.n + 0.5)]
+
+_RAMPS = {}
+def ramp(*stops):
+    """The shared Ramp through `stops`, built on first use."""
+    r = _RAMPS.get(stops)
+    if r is None: r = _RAMPS[stops] = Ramp(*stops)
+    return r
+
+def strip_surf(colors, w, h, horizontal=False):
+    """w×h surface whose rows (columns if horizontal) are `colors`, one RGB
+    or RGBA tuple each: filled as one byte string, then scaled."""
+    n = len(colors); alpha = len(colors[0]) == 4; size = (n, 1) if horizontal else (1, n)
+    src = pygame.image.frombytes(bytes(itertools.chain.from_iterable(colors)),
+                                 size, "RGBA" if alpha else "RGB")
+    # copy into the usual pixel format (adding onto zeros copies alpha exactly)
+    strip = pygame.Surface(size, pygame.SRCALPHA if alpha else 0)
+    strip.blit(src, (0, 0), special_flags=pygame.BLEND_RGBA_ADD if alpha else 0)
+    return pygame.transform.scale(strip, (w, h))
+
+_VEILS = {}
+def veil(rgb, alpha):
+    """Full-screen rgb+alpha overlay, rebuilt only when alpha changes (a
+    surface once handed out is never redrawn: a DrawList may hold it)."""
+    v = _VEILS.get(rgb)
+    if v is None or v[0] != alpha:
+        s = pygame.Surface((SW, SH), pygame.SRCALPHA); s.fill((*rgb, alpha))
+        v = _VEILS[rgb] = (alpha, s)
+    return v[1]
+
+GRADIENT_CACHE = 32
+_GRADIENTS = {}
+def gradient_surf(w, h, top_c, bot_c, radius=0, alpha=None, horizontal=False):
+    """w×h gradient top_c → bot_c (left → right if horizontal), opaque or
+    with a constant `alpha`, masked to rounded corners when radius > 0.
+    Cached and shared: blit it, don't draw on it."""
+    key = (w, h, top_c, bot_c, radius, alpha, horizontal)
+    s = _GRADIENTS.get(key)
+    if s is None:
+        n = w if horizontal else h
+        cols = [lc(top_c, bot_c, i/n) for i in range(n)]
+        if alpha is not None: cols = [(*c, alpha) for c in cols]
+        s = strip_surf(cols, w, h, horizontal)
+        if radius:
+            mask = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.rect(mask, (255, 255, 255, 255), (0, 0, w, h), border_radius=radius)
+            s.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+        if len(_GRADIENTS) >= GRADIENT_CACHE: del _GRADIENTS[next(iter(_GRADIENTS))]
+        _GRADIENTS[key] = s
+    return s
 
-# ── BACKGROUND (built once) ────────────────────────────────────
+# ── BACKGROUND (built once, on first draw) ─────────────────────
 def _build_bg():
-    surf = pygame.Surface((SW, SH))
-    for y in range(SH):
-        t = y/SH
-        c = lc(BG0, BG1, t)
-        pygame.draw.line(surf, c, (0, y), (SW, y))
-    return surf
-print("🖼 Building background...")
-BG_SURF = _build_bg()
+    return gradient_surf(SW, SH, BG0, BG1)
+
+_bg_surf = None
+def bg_surf():
+    """The baked background gradient, built on first use."""
+    global _bg_surf
+    if _bg_surf is None: _bg_surf = _build_bg()
+    return _bg_surf
+
+# ── SCHEDULER ─────────────────────────────────────────────────
+class Timer:
+    """Handle returned by Scheduler; cancel() is O(1) (the heap entry is
+    skipped when it comes due)."""
+    __slots__ = ("when", "every", "fn", "args", "live")
+    def __init__(self, when, every, fn, args):
+        self.when = when; self.every = every; self.fn = fn; self.args = args
+        self.live = True
+    def cancel(self): self.live = False
+
+class Scheduler:
+    """One clock plus a heap of one-shot and repeating timers.
+
+    advance(dt) fires everything that fell due, in time order, with `t` set
+    to each timer's own due time while its callback runs.  A repeating timer
+    is re-armed from its due time, not from the frame it was noticed in, so
+    it fires exactly once per period whatever dt does, and a callback that
+    schedules a follow-up gets it at the exact offset.  Per-frame cost is
+    one heap peek plus the timers that actually fire.
+
+    exact=False makes callbacks see the end of the frame instead, which is
+    how the old per-frame countdowns behaved — replay() uses it for
+    recordings made before version 4."""
+    __slots__ = ("t", "_heap", "_seq")
+    exact = True
+    def __init__(self):
+        self.t = 0.0; self._heap = []; self._seq = itertools.count()
+
+    def at(self, when, fn, *args, every=0.0):
+        tm = Timer(when, every, fn, args)
+        heapq.heappush(self._heap, (when, next(self._seq), tm))
+        return tm
+    def after(self, delay, fn, *args):
+        return self.at(self.t + delay, fn, *args)
+    def every(self, period, fn, *args, first=None):
+        """Call fn every `period` seconds, first after `first` (default: one period)."""
+        return self.at(self.t + (period if first is None else first), fn, *args, every=period)
+
+    def advance(self, dt):
+        end = self.t + dt; heap = self._heap
+        while heap and heap[0][0] <= end:
+            when, _, tm = heapq.heappop(heap)
+            if not tm.live: continue
+            self.t = when if self.exact else end
+            if tm.every:
+                tm.when = when + tm.every
+                heapq.heappush(heap, (tm.when, next(self._seq), tm))
+            else: tm.live = False
+            tm.fn(*tm.args)
+        self.t = end
+
+    def clear(self):
+        """Drop every timer and restart the clock at 0."""
+        for _, _, tm in self._heap: tm.live = False
+        self._heap.clear(); self.t = 0.0
+
+    @property
+    def pending(self): return len(self._heap)
+
+# ── BACKGROUND JOBS (resumable steps in the frame's leftover time) ──
+class Jobs:
+    """Cooperative work queue for deferrable work (cache warmups, aurora
+    refreshes).  A job is a generator and each `yield` ends one resumable
+    step.  run(budget_ms) steps jobs first-in first-out until the budget is
+    spent — always at least one step, so a slow machine still makes
+    progress.  finish() / drain() run work to completion when a result is
+    needed now; replays and goldens drain every frame so their pictures do
+    not depend on machine speed.  Submitting under a key that is already
+    queued is a no-op: the queued job will do.
+
+    Jobs only touch caches, never game state or an RNG, so when they run
+    cannot change a replay."""
+    def __init__(self):
+        self._q = collections.deque(); self._keys = {}
+        self.frames = self.steps = self.deferred_frames = self.deferred = 0
+        self.ms = self.max_step = 0.0; self.max_depth = 0
+        self.last = (0, 0, 0.0, 0)      # last run(): depth, steps, ms, deferred
+
+    def __len__(self): return len(self._q)
+
+    def submit(self, gen, key=None):
+        if key is not None and key in self._keys:
+            gen.close(); return False
+        job = [key, gen]; self._q.append(job)
+        if key is not None: self._keys[key] = job
+        return True
+
+    def _step(self, job):
+        """One step of job; True once it is finished (and dequeued)."""
+        try:
+            next(job[1]); return False
+        except StopIteration: pass
+        except BaseException: self._drop(job); raise
+        self._drop(job); return True
+
+    def _drop(self, job):
+        try: self._q.remove(job)
+        except ValueError: pass
+        if job[0] is not None: self._keys.pop(job[0], None)
+
+    def run(self, budget_ms):
+        q = self._q; depth = len(q)
+        if not depth: self.last = (0, 0, 0.0, 0); return
+        t0 = time.perf_counter(); end = t0 + budget_ms/1000.0; n = 0; now = t0
+        while q:
+            self._step(q[0]); n += 1
+            t = time.perf_counter(); self.max_step = max(self.max_step, (t-now)*1000); now = t
+            if now >= end: break
+        spent = (now-t0)*1000
+        self.frames += 1; self.steps += n; self.ms += spent
+        self.max_depth = max(self.max_depth, depth)
+        if q: self.deferred_frames += 1; self.deferred += len(q)
+        self.last = (depth, n, spent, len(q))
+
+    def finish(self, key, make=None):
+        """Run job `key` to completion now (starting make() if none is queued)."""
+        job = self._keys.get(key)
+        if job is None:
+            if make is None: return
+            job = [key, make()]
+        while not self._step(job): pass
+
+    def drain(self):
+        while self._q: self._step(self._q[0])
+
+    def clear(self):
+        for _, gen in self._q: gen.close()
+        self._q.clear(); self._keys.clear()
+
+    def report(self):
+        if not self.frames: return
+        print(f"🧵 Jobs: {self.steps} steps on {self.frames} frames, {self.ms:.1f} ms "
+              f"(longest step {self.max_step:.2f} ms), queue depth peaked at {self.max_depth}")
+        if self.deferred_frames:
+            print(f"   deferred to a later frame on {self.deferred_frames} frames "
+                  f"({self.deferred/self.deferred_frames:.1f} jobs waiting each time)")
+
+JOBS = Jobs()
 
 # ── PENGUIN (drawn procedurally, NO per-draw surface alloc) ───
 class Penguin:
+    # belly shading: (colour, width, height, y offset) per layer
+    BELLY=[(lc((242,250,255),(198,218,245),i/7), int(lerp(28,18,i/7)), int(lerp(64,42,i/7)), int(i/7*12))
+           for i in range(8)]
     def __init__(self, x, y):
         self.x=x; self.y=y
-        self.bob_t=0; self.blink_t=3; self.blinking=False
+        self.bob_t=0; self.blinking=False
         self.wing_t=0; self.idle_t=0; self.dance_t=0
-        self.happy=False; self.happy_t=0
-        self.sad=False;   self.sad_t=0
+        self.happy=False; self.sad=False
         self.bounce=0;    self.bounce_v=0
         self.outfit=0    # hat band colour index
+        self.timers=Scheduler(); self._happy_tm=self._sad_tm=None
+        self._next_blink(3)
+
+    def _next_blink(self, wait):
+        self.timers.after(wait, self._blink, True)
+        self.timers.after(wait+0.12, self._blink, False)
+    def _blink(self, on):
+        self.blinking=on
+        if not on: self._next_blink(FX.uniform(2, 5))
+    def _set(self, mood, on): setattr(self, mood, on)
 
     def react_happy(self):
-        self.happy=True; self.happy_t=1.6; self.bounce_v=-9
+        self.happy=True; self.bounce_v=-9
+        if self._happy_tm: self._happy_tm.cancel()
+        self._happy_tm=self.timers.after(1.6, self._set, "happy", False)
 
     def react_sad(self):
-        self.sad=True; self.sad_t=1.4
+        self.sad=True
+        if self._sad_tm: self._sad_tm.cancel()
+        self._sad_tm=self.timers.after(1.4, self._set, "sad", False)
 
     def update(self, dt):
         self.bob_t  += dt*1.8
         self.wing_t += dt*3.2
         self.idle_t += dt*0.9
         self.dance_t += dt
-        self.blink_t -= dt
-        if self.blink_t <= 0:
-            self.blinking = True
-        if self.blinking and self.blink_t < -0.12:
-            self.blinking = False
-            self.blink_t = random.uniform(2, 5)
-        if self.happy:
-            self.happy_t -= dt
-            if self.happy_t <= 0: self.happy = False
-        if self.sad:
-            self.sad_t -= dt
-            if self.sad_t <= 0: self.sad = False
+        self.timers.advance(dt)
         self.bounce_v += (-self.bounce*580 - self.bounce_v*18)*dt
         self.bounce   += self.bounce_v*dt
 
@@ -467,27 +1294,24 @@ class Penguin:
         surf.blit(sh,(x-45,y+98))
 
         # Body
-        pygame.draw.ellipse(surf,(20,20,52),(x-31,y+14,62,84))
+        gfx.ellipse(surf,(20,20,52),(x-31,y+14,62,84))
         # Belly
-        for i in range(8):
-            t2=i/7
-            bc=lc((242,250,255),(198,218,245),t2)
-            bw=int(lerp(28,18,t2)); bh=int(lerp(64,42,t2))
-            pygame.draw.ellipse(surf,bc,(x-bw//2,y+20+int(t2*12),bw,bh))
+        for bc,bw,bh,dy in self.BELLY:
+            gfx.ellipse(surf,bc,(x-bw//2,y+20+dy,bw,bh))
 
         # Wings
         lwx = x-31-22+int(wf)
-        pygame.draw.polygon(surf,(16,16,48),[(x-29,y+30),(lwx,y+46),(x-25-18,y+80),(x-20,y+72)])
+        gfx.polygon(surf,(16,16,48),[(x-29,y+30),(lwx,y+46),(x-25-18,y+80),(x-20,y+72)])
         rwx = x+31+22-int(wf)
-        pygame.draw.polygon(surf,(16,16,48),[(x+29,y+30),(rwx,y+46),(x+25+18,y+80),(x+20,y+72)])
+        gfx.polygon(surf,(16,16,48),[(x+29,y+30),(rwx,y+46),(x+25+18,y+80),(x+20,y+72)])
 
         # Feet
         fb = int(abs(math.sin(self.dance_t*5))*6) if self.happy else 0
-        pygame.draw.ellipse(surf,(255,185,30),(x-25,y+97+fb,22,11))
-        pygame.draw.ellipse(surf,(255,185,30),(x+3, y+97-fb,22,11))
+        gfx.ellipse(surf,(255,185,30),(x-25,y+97+fb,22,11))
+        gfx.ellipse(surf,(255,185,30),(x+3, y+97-fb,22,11))
 
         # Head
-        pygame.draw.circle(surf,(20,20,52),(x,y+10),30)
+        gfx.circle(surf,(20,20,52),(x,y+10),30)
         # Face patch
         fp=pygame.Surface((34,31),pygame.SRCALPHA)
         pygame.draw.ellipse(fp,(242,250,255,255),(0,0,34,31))
@@ -506,35 +1330,35 @@ class Penguin:
         # Eyes
         eo = 2 if self.happy else 0
         if self.blinking:
-            pygame.draw.ellipse(surf,(20,20,52),(x-12,y+7,10,4))
-            pygame.draw.ellipse(surf,(20,20,52),(x+2, y+7,10,4))
+            gfx.ellipse(surf,(20,20,52),(x-12,y+7,10,4))
+            gfx.ellipse(surf,(20,20,52),(x+2, y+7,10,4))
         else:
-            pygame.draw.circle(surf,(240,248,255),(x-9, y+10),7)
-            pygame.draw.circle(surf,(240,248,255),(x+9, y+10),7)
-            pygame.draw.circle(surf,(25,25,55),(x-8, y+10+eo),5)
-            pygame.draw.circle(surf,(25,25,55),(x+10,y+10+eo),5)
-            pygame.draw.circle(surf,WHITE,(x-6,y+8+eo),2)
-            pygame.draw.circle(surf,WHITE,(x+12,y+8+eo),2)
+            gfx.circle(surf,(240,248,255),(x-9, y+10),7)
+            gfx.circle(surf,(240,248,255),(x+9, y+10),7)
+            gfx.circle(surf,(25,25,55),(x-8, y+10+eo),5)
+            gfx.circle(surf,(25,25,55),(x+10,y+10+eo),5)
+            gfx.circle(surf,WHITE,(x-6,y+8+eo),2)
+            gfx.circle(surf,WHITE,(x+12,y+8+eo),2)
 
         # Beak
         by2 = y+19
-        pygame.draw.polygon(surf,(255,190,40),[(x-7,by2),(x+7,by2),(x,by2+11)])
+        gfx.polygon(surf,(255,190,40),[(x-7,by2),(x+7,by2),(x,by2+11)])
         if self.happy:
-            pygame.draw.arc(surf,(255,80,110),(x-8,by2+2,16,8),math.pi,2*math.pi,2)
+            gfx.arc(surf,(255,80,110),(x-8,by2+2,16,8),math.pi,2*math.pi,2)
         elif self.sad:
-            pygame.draw.arc(surf,(80,80,165),(x-8,by2+7,16,8),0,math.pi,2)
+            gfx.arc(surf,(80,80,165),(x-8,by2+7,16,8),0,math.pi,2)
             td=pygame.Surface((6,10),pygame.SRCALPHA)
             pygame.draw.ellipse(td,(140,180,255,165),(0,0,6,10))
             surf.blit(td,(x+11,y+15))
 
         # Chef hat
-        pygame.draw.rect(surf,(246,246,252),(x-24,y-21,48,8),border_radius=4)
+        gfx.rect(surf,(246,246,252),(x-24,y-21,48,8),border_radius=4)
         hat=[(x-20,y-21),(x+20,y-21),(x+15,y-55),(x-15,y-55)]
-        pygame.draw.polygon(surf,(246,246,252),hat)
+        gfx.polygon(surf,(246,246,252),hat)
         band_c=[PINK,CYAN,GOLD,LIME,PURP][self.outfit % 5]
-        pygame.draw.polygon(surf,band_c,[(x-19,y-23),(x+19,y-23),(x+18,y-30),(x-18,y-30)])
-        pygame.draw.polygon(surf,(235,235,248),hat,2)
-        pygame.draw.circle(surf,(246,246,252),(x,y-55),8)
+        gfx.polygon(surf,band_c,[(x-19,y-23),(x+19,y-23),(x+18,y-30),(x-18,y-30)])
+        gfx.polygon(surf,(235,235,248),hat,2)
+        gfx.circle(surf,(246,246,252),(x,y-55),8)
 
         # Happy sparkles (cheap — just lines/circles, no surface alloc)
         if self.happy:
@@ -543,21 +1367,169 @@ class Penguin:
                 sx3 = x + int(math.cos(a3)*42)
                 sy3 = (y-22) + int(math.sin(a3)*20)
                 sc3 = [GOLD,PINK,CYAN][i]
-                pygame.draw.circle(surf, sc3, (sx3,sy3), 4)
-                pygame.draw.circle(surf, WHITE, (sx3,sy3), 2)
+                gfx.circle(surf, sc3, (sx3,sy3), 4)
+                gfx.circle(surf, WHITE, (sx3,sy3), 2)
+
+# ── CUSTOMER CROWD (one penguin per open order, level of detail) ───
+CUSTOMER_LOOKS = [(PINK,False),(CYAN,True),(GOLD,False),(LIME,True),(PURP,False),(CORAL,True)]
+
+def _draw_customer(surf, x, y, s, phase, look, mood=0, blink=False, walk=False):
+    """Full-detail customer penguin standing with its feet at (x, y), scaled
+    by s.  look = (scarf colour, beanie?); mood 1 happy, -1 sad."""
+    col, beanie = look
+    y -= math.sin(phase)*2.5*s
+    wf = math.sin(phase*2)*(9 if mood > 0 else 3)*s
+    fs = math.sin(phase*3)*3*s if walk else 0
+    gfx.ellipse(surf,(255,185,30),(x-17*s,y-8*s-fs,15*s,8*s))               # feet
+    gfx.ellipse(surf,(255,185,30),(x+2*s, y-8*s+fs,15*s,8*s))
+    gfx.ellipse(surf,(20,20,52),(x-22*s,y-67*s,44*s,62*s))                  # body
+    gfx.ellipse(surf,(236,244,255),(x-13*s,y-58*s,26*s,46*s))               # belly
+    gfx.polygon(surf,(16,16,48),[(x-20*s,y-50*s),(x-30*s-wf,y-38*s),(x-19*s,y-22*s)])
+    gfx.polygon(surf,(16,16,48),[(x+20*s,y-50*s),(x+30*s+wf,y-38*s),(x+19*s,y-22*s)])
+    gfx.circle(surf,(20,20,52),(x,y-74*s),21*s)                             # head
+    gfx.ellipse(surf,(242,250,255),(x-12*s,y-80*s,24*s,20*s))               # face
+    ey=y-73*s+(2*s if mood < 0 else 0)
+    if blink:
+        gfx.line(surf,(20,20,52),(x-9*s,ey),(x-3*s,ey),max(1,int(2*s)))
+        gfx.line(surf,(20,20,52),(x+3*s,ey),(x+9*s,ey),max(1,int(2*s)))
+    else:
+        gfx.circle(surf,(25,25,55),(x-6*s,ey),3*s); gfx.circle(surf,(25,25,55),(x+6*s,ey),3*s)
+    gfx.polygon(surf,(255,190,40),[(x-5*s,y-68*s),(x+5*s,y-68*s),(x,y-60*s)])  # beak
+    if mood < 0: gfx.ellipse(surf,(140,180,255),(x+9*s,y-70*s,4*s,7*s))      # tear
+    gfx.rect(surf,col,(x-17*s,y-56*s,34*s,6*s),border_radius=max(1,int(3*s)))   # scarf
+    gfx.rect(surf,col,(x+6*s,y-54*s,6*s,14*s))
+    if beanie:
+        gfx.ellipse(surf,col,(x-17*s,y-101*s,34*s,22*s))
+        gfx.circle(surf,WHITE,(x,y-101*s),4*s)
+
+class Customer:
+    __slots__=("sid","pos","t","last","look","blink_off","leaving","x","y","s")
+    def __init__(self, sid, pos, now):
+        self.sid=sid; self.pos=pos; self.last=now; self.leaving=0
+        # variety from the serial, not an RNG: v1 replays share FX with gameplay
+        self.t=sid*2.399%10; self.blink_off=sid*1.618%4
+        self.look=sid*5%len(CUSTOMER_LOOKS)
+        self.x=self.y=0.0; self.s=0.0
+    @property
+    def blink(self): return (self.t+self.blink_off)%3.6 < 0.12
+
+class Crowd:
+    """The queue of customer penguins in front of the counter, one per open
+    order (oldest at the front), receding toward a vanishing point.
+
+    Level of detail follows on-screen scale: near customers are drawn in
+    full, the middle of the queue blits cached sprites (pre-rendered poses
+    per look and scale step) and the far end flat silhouettes; sprites and
+    silhouettes go out in one Surface.blits() batch.  Animation is
+    staggered: the NEAR front customers step every frame, the rest one in
+    STAGGER per frame with the elapsed time, so a long queue costs a
+    fraction of its length.  Past QUALITY["crowd"] nobody is stepped or
+    drawn — they are over the horizon."""
+    FRONT=(905,505)          # feet of the front customer, scale 1
+    VANISH=(330,262)         # where an endless queue converges
+    DEPTH=0.16               # scale at queue position p: 1/(1+DEPTH·p)
+    FULL_S=0.7; SPRITE_S=0.3; MIN_S=0.05
+    NEAR=3; STAGGER=4
+    POSES=8; STEP=0.05       # sprite cache: poses per cycle, scale quantum
+    SPRITE=(72,122); FEET=(36,116)
+    LEAVE_T=2.5
+    def __init__(self):
+        self.queue=[]; self.by_sid={}; self.leavers=[]
+        self.t=0.0; self.frame=0
+        self._poses={}; self._sprites={}; self._shadows={}
+        self.stats=dict(full=0, sprite=0, silhouette=0)
+
+    def join(self, sid):
+        c=Customer(sid, len(self.queue)+2.0, self.t)
+        self.queue.append(c); self.by_sid[sid]=c
+    def leave(self, sid, happy):
+        c=self.by_sid.pop(sid, None)
+        if c is None: return
+        self.queue.remove(c); c.leaving=1 if happy else -1; c.last=self.t
+        if c.s>=self.MIN_S: self.leavers.append(c)
+    def clear(self):
+        self.queue.clear(); self.by_sid.clear(); self.leavers.clear()
+
+    def _step(self, c, i):
+        dt=self.t-c.last; c.last=self.t; c.t+=dt
+        c.pos+=(i-c.pos)*min(1.0,dt*3)
+        self._place(c)
+    def _place(self, c):
+        c.s=s=1/(1+self.DEPTH*max(0.0,c.pos))
+        c.x=lerp(self.VANISH[0],self.FRONT[0],s); c.y=lerp(self.VANISH[1],self.FRONT[1],s)
+
+    def update(self, dt):
+        self.t+=dt; self.frame+=1
+        q=self.queue; n=min(len(q),QUALITY["crowd"]); near=min(n,self.NEAR)
+        for i in range(near): self._step(q[i],i)
+        k=self.frame%self.STAGGER
+        for i in range(near+(k-near)%self.STAGGER, n, self.STAGGER): self._step(q[i],i)
+        for c in self.leavers:
+            dt2=self.t-c.last; c.last=self.t; c.t+=dt2
+            c.x+=(150 if c.leaving>0 else 70)*c.s*dt2
+        if self.leavers:
+            self.leavers=[c for c in self.leavers if self.t-c.last<self.LEAVE_T and c.x<SW+60]
+
+    # ── drawing ──
+    def _pose(self, c): return int(c.t*2.4/math.tau*self.POSES)%self.POSES
+    def _sprite(self, look, pose, b):
+        key=(look,pose,b); spr=self._sprites.get(key)
+        if spr is None:
+            base=self._poses.get((look,pose))
+            if base is None:
+                base=self._poses[look,pose]=pygame.Surface(self.SPRITE,pygame.SRCALPHA)
+                _draw_customer(base,*self.FEET,1.0,pose/self.POSES*math.tau,CUSTOMER_LOOKS[look])
+            w,h=self.SPRITE; sc=b*self.STEP
+            spr=self._sprites[key]=pygame.transform.smoothscale(base,(max(1,round(w*sc)),max(1,round(h*sc))))
+        return spr
+    def _silhouette(self, b):
+        spr=self._shadows.get(b)
+        if spr is None:
+            spr=self._shadows[b]=pygame.mask.from_surface(self._sprite(0,0,b)).to_surface(
+                setcolor=(30,42,84,255), unsetcolor=(0,0,0,0))
+        return spr
+
+    def draw(self, surf):
+        q=self.queue; n=min(len(q),QUALITY["crowd"])
+        batch=[]; full=[]; fx,fy=self.FEET; nsil=0
+        for i in range(n-1,-1,-1):
+            c=q[i]; s=c.s
+            if s<self.MIN_S: continue
+            if s>=self.FULL_S: full.append(c); continue
+            b=round(s/self.STEP); sc=b*self.STEP
+            if s>=self.SPRITE_S:                        # the pose carries the bob
+                batch.append((self._sprite(c.look,self._pose(c),b),(c.x-fx*sc,c.y-fy*sc)))
+            else:
+                nsil+=1; bob=math.sin(c.t*2.4)*2.5*s
+                batch.append((self._silhouette(b),(c.x-fx*sc,c.y-fy*sc-bob)))
+        for c in self.leavers:                         # a handful, in front
+            if c.s>=self.FULL_S: full.append(c); continue
+            hop=abs(math.sin(c.t*8))*10*c.s if c.leaving>0 else 0
+            b=round(c.s/self.STEP); sc=b*self.STEP
+            batch.append((self._sprite(c.look,self._pose(c),b),(c.x-fx*sc,c.y-fy*sc-hop)))
+        if batch: surf.blits(batch, False)
+        for c in full:
+            if c.leaving:
+                hop=abs(math.sin(c.t*8))*10*c.s if c.leaving>0 else 0
+                _draw_customer(surf,c.x,c.y-hop,c.s,c.t*2.4,CUSTOMER_LOOKS[c.look],
+                               mood=c.leaving,walk=True)
+            else:
+                _draw_customer(surf,c.x,c.y,c.s,c.t*2.4,CUSTOMER_LOOKS[c.look],
+                               blink=c.blink,walk=abs(c.pos-round(c.pos))>0.05)
+        st=self.stats; st["full"]=len(full); st["sprite"]=len(batch)-nsil; st["silhouette"]=nsil
 
 # ── PARTICLES (pooled, no per-update surface alloc) ───────────
 class Particle:
     __slots__ = ["x","y","vx","vy","color","life","decay","r","label","star","grav"]
     def __init__(self,x,y,color,label=None,star=False,rise=False):
-        self.x=x+random.uniform(-16,16); self.y=y+random.uniform(-8,8)
-        spd=random.uniform(80,160)
-        ang=random.uniform(0,math.pi*2)
+        self.x=x+FX.uniform(-16,16); self.y=y+FX.uniform(-8,8)
+        spd=FX.uniform(80,160)
+        ang=FX.uniform(0,math.pi*2)
         self.vx=math.cos(ang)*spd
-        self.vy=(random.uniform(-140,-60) if rise else math.sin(ang)*spd)
+        self.vy=(FX.uniform(-140,-60) if rise else math.sin(ang)*spd)
         self.color=color; self.label=label; self.star=star
-        self.life=1.0; self.decay=random.uniform(0.75,1.35)
-        self.r=random.randint(3,8); self.grav=125
+        self.life=1.0; self.decay=FX.uniform(0.75,1.35)
+        self.r=FX.randint(3,8); self.grav=125
     def update(self,dt):
         self.x+=self.vx*dt; self.y+=self.vy*dt
         self.vy+=self.grav*dt; self.life-=self.decay*dt
@@ -603,22 +1575,69 @@ class DropAnim:
 
 # ── ORDER CARD ────────────────────────────────────────────────
 class OrderCard:
+    """One order.  Nothing here ticks per frame: the timer, slide-in and
+    exit are read off the game's play clock (a Scheduler), whose timers
+    call expire() at the deadline — an idle card costs nothing."""
     W=200; H=155
-    def __init__(self,recipe,speed=1.0):
-        self.recipe=recipe
+    SLIDE=0.2                # slide-in time (s)
+    LINGER=1.25              # a served card stays this long
+    FACES={}                 # recipe name → cached name/stars/icons layer
+    CALM=Ramp(CYAN,PINK); URGENT=Ramp(RED,GOLD); RING=Ramp(RED,GREEN)
+    def __init__(self,recipe,speed=1.0,rid=None,clock=None):
+        self.recipe=recipe; self.rid=rid
+        self.clock=Scheduler() if clock is None else clock
         self.total=recipe["time"]/speed
-        self.remain=self.total
-        self.done=False; self.failed=False
-        self.slide=0.0; self.done_t=1.5
-    def update(self,dt):
-        self.slide=min(1.0,self.slide+dt*5)
-        if self.done:
-            self.done_t=max(0,self.done_t-dt*1.2); return
-        if self.failed: return
-        self.remain=max(0,self.remain-dt)
-        if self.remain<=0: self.failed=True; sfx("expire")
+        self.born=self.clock.t; self.deadline=self.born+self.total
+        self.done=False; self.failed=False; self.end_t=None
+        self.timer=None          # pending expiry / exit on the clock
+    def serve(self):
+        self.done=True; self.end_t=self.clock.t
+    def expire(self):
+        self.failed=True; self.end_t=self.clock.t; sfx("expire")
+    @property
+    def gone_at(self):
+        """When a served card leaves the rail."""
+        return max(self.end_t+self.LINGER, self.born+self.SLIDE)
+    @property
+    def remain(self):
+        return max(0.0, self.deadline-(self.clock.t if self.end_t is None else self.end_t))
+    @property
+    def slide(self): return min(1.0,(self.clock.t-self.born)/self.SLIDE)
     @property
     def ratio(self): return clamp(self.remain/self.total,0,1)
+    @classmethod
+    def face(cls,recipe):
+        """The recipe's cached face, painted on first use."""
+        f=cls.FACES.get(recipe["name"])
+        if f is None: f=cls.FACES[recipe["name"]]=cls._paint_face(recipe)
+        return f
+    @classmethod
+    def _paint_face(cls,recipe):
+        W=cls.W; s=pygame.Surface((W,cls.H),pygame.SRCALPHA)
+        # Name
+        nm=F_XS.render(recipe["name"],True,OFFWH)
+        s.blit(nm,nm.get_rect(centerx=W//2,top=7))
+
+        # Stars
+        strs=recipe["stars"]
+        stx=W//2-strs*10
+        for si in range(strs):
+            pygame.draw.circle(s,GOLD,(stx+si*20+10,26),5)
+
+        # Ingredient icons
+        ingrs=recipe["ing"]; n=len(ingrs)
+        sp=min((W-16)//n,36); isx=W//2-sp*(n-1)//2
+        for i,short in enumerate(ingrs):
+            ix=isx+i*sp; iy=52
+            icon=ICONS_SM.get(short)
+            if icon: s.blit(icon,icon.get_rect(center=(ix,iy)))
+            # step badge
+            bdg=pygame.Surface((13,13),pygame.SRCALPHA)
+            pygame.draw.circle(bdg,(*PURP,190),(6,6),6)
+            ns=F_XS.render(str(i+1),True,WHITE)
+            bdg.blit(ns,ns.get_rect(center=(6,6)))
+            s.blit(bdg,(ix-6,iy-20))
+        return s
     def draw(self,surf,ox,oy):
         W,H=self.W,self.H
         # slide in from top
@@ -628,44 +1647,26 @@ class OrderCard:
         rat=self.ratio
         if   self.done:    bc=LIME
         elif self.failed:  bc=RED
-        elif rat>0.5:      bc=lc(CYAN,PINK,1-rat)
+        elif rat>0.5:      bc=self.CALM(1-rat)
         elif rat>0.25:     bc=ORNGE
         else:
-            fl=0.5+0.5*math.sin(time.time()*11)
-            bc=lc(RED,GOLD,fl)
+            fl=0.5+0.5*math.sin(self.remain*11)   # own clock — frames stay reproducible
+            bc=self.URGENT(fl)
 
         draw_glass(surf,ox,ay,W,H,r=16,alpha=195,border=bc,glow=bc)
 
-        # Name
-        nm=F_XS.render(self.recipe["name"],True,OFFWH)
-        surf.blit(nm,nm.get_rect(centerx=ox+W//2,top=ay+7))
-
-        # Stars
-        strs=self.recipe["stars"]
-        stx=ox+W//2-strs*10
-        for si in range(strs):
-            glow_dot(surf,GOLD,stx+si*20+10,ay+26,5)
-
-        # Ingredient icons
-        ingrs=self.recipe["ing"]; n=len(ingrs)
-        sp=min((W-16)//n,36); isx=ox+W//2-sp*(n-1)//2
-        for i,short in enumerate(ingrs):
-            ix=isx+i*sp; iy=ay+52
-            icon=ICONS_SM.get(short)
-            if icon: surf.blit(icon,icon.get_rect(center=(ix,iy)))
-            # step badge
-            bdg=pygame.Surface((13,13),pygame.SRCALPHA)
-            pygame.draw.circle(bdg,(*PURP,190),(6,6),6)
-            ns=F_XS.render(str(i+1),True,WHITE)
-            bdg.blit(ns,ns.get_rect(center=(6,6)))
-            surf.blit(bdg,(ix-6,iy-20))
+        # Name, stars, ingredient icons — fixed per recipe, so painted once
+        face=self.face(self.recipe)
+        surf.blit(face,(ox,ay))
+        strs=self.recipe["stars"]; stx=ox+W//2-strs*10
+        for si in range(strs): BLOOM.dot(GOLD,stx+si*20+10,ay+26,9)
 
         # Ring timer
         rcx=ox+W//2; rcy=ay+H-26; rr=20
-        pygame.draw.circle(surf,(18,28,65),(rcx,rcy),rr+4)
-        pygame.draw.circle(surf,(28,42,90),(rcx,rcy),rr,5)
+        gfx.circle(surf,(18,28,65),(rcx,rcy),rr+4)
+        gfx.circle(surf,(28,42,90),(rcx,rcy),rr,5)
         if not self.done and not self.failed and rat>0:
-            draw_ring(surf,rcx,rcy,rr,rat,lc(RED,GREEN,rat))
+            draw_ring(surf,rcx,rcy,rr,rat,self.RING(rat))
         ts=F_XS.render(
             "DONE!" if self.done else ("GONE!" if self.failed else f"{int(self.remain)+1}"),
             True, LIME if self.done else (RED if self.failed else WHITE))
@@ -681,91 +1682,432 @@ class OrderCard:
             pygame.draw.rect(ov,(*RED,45),(0,0,W,H),border_radius=16)
             surf.blit(ov,(ox,ay))
 
+# ── OBJECT POOLS + GC POLICY ──────────────────────────────────
+class Pool:
+    """Free list for short-lived objects.  get() re-runs __init__ on a spare
+    instance instead of allocating; reap() compacts a live list in place and
+    hands the dead back."""
+    __slots__ = ("cls", "free", "cap", "made", "reused")
+    def __init__(self, cls, cap=256):
+        self.cls = cls; self.free = []; self.cap = cap
+        self.made = self.reused = 0
+    def get(self, *args):
+        if self.free:
+            obj = self.free.pop(); obj.__init__(*args); self.reused += 1
+            return obj
+        self.made += 1
+        return self.cls(*args)
+    def put(self, obj):
+        if len(self.free) < self.cap: self.free.append(obj)
+    def put_all(self, items):
+        for obj in items: self.put(obj)
+        items.clear()
+    def reap(self, items, dead):
+        j = 0
+        for obj in items:
+            if dead(obj): self.put(obj)
+            else: items[j] = obj; j += 1
+        del items[j:]
+
+PARTICLES = Pool(Particle)
+FLOATS    = Pool(FloatText, 32)
+DROPS     = Pool(DropAnim, 16)
+CARDS     = Pool(OrderCard, 16)
+POOLS     = {"particles": PARTICLES, "floats": FLOATS, "drops": DROPS, "orders": CARDS}
+
+class GCPolicy:
+    """Keeps the cyclic GC out of gameplay frames.
+
+    start() collects once, freezes everything allocated during startup
+    (modules, packs, icons, fonts) into the permanent generation and turns
+    automatic collection off.  checkpoint() runs a collection at level
+    transitions (rush levels included), the end screen and restarts.
+    Should gen-0 grow past `valve` objects anyway, frame() collects it
+    young, and every `old`-th such collection is a full one so survivors
+    promoted into gen-1/gen-2 are freed too — an endless rush session never
+    reaches a checkpoint once it hits the last level.  Startup objects are
+    frozen, so the full pass only walks what the session allocated.
+    """
+    def __init__(self, valve=20000, old=10):
+        self.active = False; self.valve = valve; self.old = old
+    def start(self):
+        gc.collect(); gc.freeze(); gc.disable(); self.active = True
+    def stop(self):
+        if self.active: gc.unfreeze(); gc.enable(); self.active = False
+    def checkpoint(self, generation=2):
+        if self.active: gc.collect(generation)
+    def frame(self):
+        if not self.active: return
+        young, promoted, _ = gc.get_count()     # promoted: gen-0 passes since the last gen-1
+        if young > self.valve: gc.collect(2 if promoted >= self.old else 0)
+
+GC = GCPolicy()
+
+def _dead_life(o):     return o.life <= 0
+def _drop_done(d):     return d.done
+
+class GCStats:
+    """--gc-stats: collector pauses (via gc.callbacks) and the per-frame net
+    change in allocated memory blocks, split by whether a game was running."""
+    def __init__(self):
+        self.pauses = []            # (generation, ms, during play?)
+        self.blocks = {True: [], False: []}
+        self.playing = True
+        self._t = 0.0; self._b = sys.getallocatedblocks()
+        gc.callbacks.append(self._cb)
+    def _cb(self, phase, info):
+        if phase == "start": self._t = time.perf_counter()
+        else: self.pauses.append((info["generation"], (time.perf_counter()-self._t)*1000, self.playing))
+    def frame(self, playing):
+        b = sys.getallocatedblocks()
+        self.blocks[playing].append(b - self._b); self._b = b
+        self.playing = playing
+    def report(self):
+        gc.callbacks.remove(self._cb)
+        print(f"🧹 GC ({'deferred' if GC.active else 'default'} policy):")
+        for playing, label in ((True, "play"), (False, "menus")):
+            ps = [ms for _, ms, p in self.pauses if p == playing]
+            d = sorted(self.blocks[playing])
+            if not d: continue
+            print(f"   {label:<6} {len(d):6d} frames  net blocks/frame mean {sum(d)/len(d):+7.1f} "
+                  f"p99 {d[int(len(d)*0.99)]:+6d}  |  {len(ps)} collections, "
+                  f"{sum(ps):.1f} ms total, max {max(ps, default=0):.2f} ms")
+        for gen in range(3):
+            ps = [ms for g, ms, _ in self.pauses if g == gen]
+            if ps: print(f"   gen{gen}: {len(ps)} × avg {sum(ps)/len(ps):.2f} ms")
+        print("   pools: " + ", ".join(f"{k} {p.made} made / {p.reused} reused"
+                                        for k, p in POOLS.items()))
+
+# ── SURFACE ALLOCATION TRACKER (opt-in: --surface-stats) ──────
+class SurfaceStats:
+    """--surface-stats: attributes every Surface the game makes to its call
+    site and subsystem, and follows live pixel bytes per subsystem.
+
+    While active, pygame.Surface is a tracking subclass, and Font.render
+    (through LazyFont) and the pygame.transform calls the game uses are
+    wrapped, so their results count too; copies and subsurfaces do not.
+    A surface's bytes (pitch × height) are added when it is made and taken
+    off by a weakref finalizer, which also notes whether it died within a
+    frame.  The subsystem is the creating function's class, or the function
+    itself: draw_glass, OrderCard, EndScreen, Aurora …
+
+    SDL allocates pixels outside Python's allocator, where tracemalloc cannot
+    see them, so tracemalloc runs alongside for the Python heap.  It takes
+    snapshots after `warmup` frames and at exit; the report diffs them next
+    to the surface bytes at the same two points."""
+    TRANSFORMS = ("smoothscale", "rotozoom", "flip", "scale")
+
+    def __init__(self, warmup=120, trace=True):
+        self.warmup = warmup; self.trace = trace; self.n = 0
+        self.total = 0; self.peak = (0, 0)           # live bytes; (peak bytes, frame)
+        self.series = []                             # live bytes at the end of each frame
+        self.live = collections.Counter(); self.peak_sub = collections.Counter()
+        self.allocs = collections.Counter(); self.bytes = collections.Counter()
+        self.short = collections.Counter()           # freed within a frame of being made
+        self.max_frame = collections.Counter(); self._cur = collections.Counter()
+        self.sites = collections.Counter(); self._subs = {}
+        self._snap = None
+        if trace:
+            import tracemalloc; tracemalloc.start()
+        base = self._base = pygame.Surface; track = self._track
+        class TrackedSurface(base):
+            def __init__(s, *a, **k):
+                base.__init__(s, *a, **k); track(s, sys._getframe(1))
+        pygame.Surface = TrackedSurface
+        self._transforms = {name: getattr(pygame.transform, name) for name in self.TRANSFORMS}
+        for name, fn in self._transforms.items():
+            def wrapped(*a, _fn=fn, **k):
+                out = _fn(*a, **k); track(out, sys._getframe(1)); return out
+            setattr(pygame.transform, name, wrapped)
+        def render(font, *a, **k):
+            out = font.__getattr__("render")(*a, **k); track(out, sys._getframe(1)); return out
+        LazyFont.render = render
+
+    def _track(self, s, f):
+        code = f.f_code
+        sub = self._subs.get(code)
+        if sub is None:
+            q = getattr(code, "co_qualname", code.co_name)
+            sub = self._subs[code] = q.split(".<locals>")[0].split(".")[0]
+        n = s.get_pitch()*s.get_height()
+        self.total += n; self.live[sub] += n
+        if self.live[sub] > self.peak_sub[sub]: self.peak_sub[sub] = self.live[sub]
+        self.allocs[sub] += 1; self.bytes[sub] += n; self._cur[sub] += 1
+        self.sites[(code, f.f_lineno)] += 1
+        weakref.finalize(s, self._freed, sub, n, self.n).atexit = False
+
+    def _freed(self, sub, n, born):
+        self.total -= n; self.live[sub] -= n
+        if self.n - born <= 1: self.short[sub] += 1
+
+    def frame(self):
+        self.n += 1
+        self.series.append(self.total)
+        if self.total > self.peak[0]: self.peak = (self.total, self.n)
+        for sub, c in self._cur.items():
+            if c > self.max_frame[sub]: self.max_frame[sub] = c
+        self._cur.clear()
+        if self.trace and self.n == self.warmup:
+            import tracemalloc
+            self._snap = (tracemalloc.take_snapshot(), self.total)
+
+    def stop(self):
+        pygame.Surface = self._base
+        for name, fn in self._transforms.items(): setattr(pygame.transform, name, fn)
+        del LazyFont.render
+
+    def report(self):
+        self.stop()
+        mb = lambda b: f"{b/(1 << 20):.1f} MB"
+        frames = max(1, self.n)
+        steady = statistics.median(self.series[len(self.series)//2:]) if self.series else 0
+        print(f"🖼  Surfaces over {self.n} frames: {mb(self.total)} live now, peak {mb(self.peak[0])} "
+              f"at frame {self.peak[1]}, steady {mb(steady)} (median of the second half)")
+        print(f"   {'subsystem':<20} {'made/frame':>10} {'max/frame':>9} {'KB/frame':>9} "
+              f"{'live KB':>8} {'peak KB':>8} {'≤1 frame':>8}")
+        for sub, b in self.bytes.most_common():
+            a = self.allocs[sub]
+            print(f"   {sub:<20} {a/frames:>10.2f} {self.max_frame[sub]:>9d} {b/frames/1024:>9.1f} "
+                  f"{self.live[sub]/1024:>8.0f} {self.peak_sub[sub]/1024:>8.0f} "
+                  f"{100*self.short[sub]/a:>7.0f}%")
+        print("   busiest call sites:")
+        for (code, line), c in self.sites.most_common(8):
+            print(f"     {c/frames:8.2f}/frame  {getattr(code, 'co_qualname', code.co_name)} "
+                  f"({os.path.basename(code.co_filename)}:{line})")
+        if not self.trace: return
+        import tracemalloc
+        cur, peak = tracemalloc.get_traced_memory()
+        print(f"   Python heap (tracemalloc): {mb(cur)} now, peak {mb(peak)}")
+        if self._snap:
+            snap, surf = self._snap
+            own = (tracemalloc.Filter(False, tracemalloc.__file__),)
+            snap = snap.filter_traces(own); end = tracemalloc.take_snapshot().filter_traces(own)
+            print(f"   frame {self.warmup} → {self.n}: surfaces {mb(surf)} → {mb(self.total)}, "
+                  f"Python heap growth by line:")
+            for st in end.compare_to(snap, "lineno")[:8]:
+                fr = st.traceback[0]
+                print(f"     {st.size_diff/1024:+9.1f} KB {st.count_diff:+7d} blocks  "
+                      f"{os.path.basename(fr.filename)}:{fr.lineno}")
+        tracemalloc.stop()
+
+# ── RETAINED UI ───────────────────────────────────────────────
+class Widget:
+    """A node of the retained UI tree.
+
+    Its look lives in two cached surfaces: a glass back (draw_glass with the
+    (r, alpha, border) from back()) and a face that paint() fills on a clear
+    layer.  Each is redrawn only when back() / key() change or after
+    invalidate(), so an unchanged widget costs a blit or two.  Keeping them
+    apart matters: blending text onto translucent glass inside one surface
+    would not match blending it onto the screen.  Bloom is queued from
+    bloom() every frame in screen coordinates, since cached pixels can't
+    carry it.  Interactive widgets are filed in UI's hit grid and receive
+    on_click() / set_hover() from events."""
+    interactive=False; hoverable=False
+    def __init__(self, rect, paint=None, key=None, glass=None, glow=None, bloom=None):
+        self.rect=pygame.Rect(rect); self.children=[]
+        self._paint=paint; self._keyf=key; self._glass=glass
+        self.glow=glow; self._bloomf=bloom
+        self.hover=False; self.visible=True
+        self._surf=None; self._key=None; self._back=None; self._back_key=None
+        self._primed=None
+    def add(self, *ws): self.children.extend(ws); return self
+    def walk(self):
+        yield self
+        for c in self.children: yield from c.walk()
+    def key(self): return self._keyf() if self._keyf else None
+    def back(self): return self._glass() if callable(self._glass) else self._glass
+    def paint(self, surf):
+        if self._paint: self._paint(surf)
+    def bloom(self):
+        if self._bloomf: self._bloomf()
+        elif self.glow: BLOOM.rect(self.glow, *self.rect)
+    def invalidate(self): self._surf=self._back=self._primed=None
+    def set_hover(self, on): self.hover=on
+    def on_click(self, pos): return False
+    def _glass_surf(self, g):
+        s=pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        r,alpha,border=g; draw_glass(s,0,0,*self.rect.size,r=r,alpha=alpha,border=border)
+        return s
+    def prime(self, k, g=None):
+        """Paint the face for a future key() k (and the back for a future
+        back() g) now, e.g. from a background job; draw() swaps them in
+        when the widget gets there instead of painting on that frame."""
+        s=pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        cur=self._key; self._key=k; self.paint(s); self._key=cur
+        self._primed=(k, s, g, None if g is None else self._glass_surf(g))
+    def draw(self, surf):
+        if not self.visible: return
+        g=self.back(); pr=self._primed
+        if g is not None:
+            if self._back is None or g!=self._back_key:
+                self._back=pr[3] if pr and pr[2]==g else self._glass_surf(g)
+                self._back_key=g
+            surf.blit(self._back, self.rect)
+        k=self.key()
+        if self._surf is None or k!=self._key:
+            self._key=k
+            if pr and pr[0]==k: self._surf=pr[1]; self._primed=None
+            else:
+                self._surf=pygame.Surface(self.rect.size, pygame.SRCALPHA)   # new: a DrawList may hold the old one
+                self.paint(self._surf)
+        surf.blit(self._surf, self.rect)
+        self.bloom()
+        for c in self.children: c.draw(surf)
+
+class UI:
+    """Hit index and event routing for a widget tree.  Interactive widgets
+    are filed in a grid of CELL-px cells, so a hit test looks at one cell
+    (topmost first) however many widgets exist.  Hover only changes in
+    pointer(), i.e. on MOUSEMOTION — idle frames do no UI work."""
+    CELL=64
+    def __init__(self, *roots):
+        self.roots=list(roots); self.grid={}; self.hovered=None
+        for w in self.widgets():
+            if w.interactive: self._file(w)
+    def widgets(self):
+        for r in self.roots: yield from r.walk()
+    def _file(self, w):
+        c=self.CELL; r=w.rect
+        for gx in range(r.left//c, (r.right-1)//c+1):
+            for gy in range(r.top//c, (r.bottom-1)//c+1):
+                self.grid.setdefault((gx,gy),[]).append(w)
+    def hit(self, pos):
+        for w in reversed(self.grid.get((pos[0]//self.CELL, pos[1]//self.CELL), ())):
+            if w.visible and w.rect.collidepoint(pos): return w
+        return None
+    def pointer(self, pos):
+        w=self.hit(pos)
+        if w is not None and not w.hoverable: w=None
+        if w is not self.hovered:
+            if self.hovered: self.hovered.set_hover(False)
+            if w: w.set_hover(True)
+            self.hovered=w
+    def click(self, pos):
+        w=self.hit(pos)
+        return w is not None and w.on_click(pos)
+
+class Button(Widget):
+    """Glass push button; lit while active() is true, glows on hover."""
+    interactive=True; hoverable=True
+    def __init__(self, rect, color, text, font, on_press, active=None):
+        super().__init__(rect)
+        self.color=color; self.text=text; self.font=font
+        self.on_press=on_press; self.active=active or (lambda: True)
+    def key(self): return self.active()
+    def back(self): return (12,200,self.color) if self.active() else (12,90,(40,50,80))
+    def paint(self, surf):
+        tc = lc(self.color, WHITE, 0.7) if self._key else (55, 70, 110)
+        t = self.font.render(self.text, True, tc)
+        surf.blit(t, t.get_rect(center=(self.rect.w//2, self.rect.h//2)))
+    def bloom(self):
+        if self.hover and self._key: BLOOM.rect(self.color, *self.rect)
+    def on_click(self, pos): self.on_press(); return True
+
 # ── INGREDIENT BUTTON ─────────────────────────────────────────
-class IngBtn:
-    H=48
-    def __init__(self,ing,x,y,w):
-        self.ing=ing; self.rect=pygame.Rect(x,y,w,self.H)
-        self.press_t=0; self.hover=False; self.locked=False
-    def update(self,dt,mp,unlocked):
-        self.locked = not unlocked
-        self.hover  = self.rect.collidepoint(mp) and not self.locked
-        if self.press_t>0: self.press_t-=dt
-    def press(self): self.press_t=0.12
-    def draw(self,surf):
-        col=self.ing["color"]; rx,ry,rw,rh=self.rect
+class IngBtn(Widget):
+    H=48; PRESS=0.12
+    interactive=True; hoverable=True
+    def __init__(self,ing,x,y,w,clock=None,on_press=None):
+        super().__init__((x,y,w,self.H))
+        self.ing=ing; self.on_press=on_press
+        self.clock=Scheduler() if clock is None else clock
+        self.pressed_at=-self.PRESS; self.locked=False
+    def press(self): self.pressed_at=self.clock.t
+    @property
+    def press_t(self): return max(0.0,self.pressed_at+self.PRESS-self.clock.t)
+    def key(self):
+        return self.locked, round(clamp(self.press_t/self.PRESS,0,1),2)
+    def back(self, locked=None):
+        if locked is None: locked=self.locked
+        return (10,90,(38,48,88)) if locked else (10,215,self.ing["color"])
+    def prime_unlocked(self):
+        """Pre-paint the unlocked, resting look (see Game._warm_level)."""
+        self.prime((False,0.0), self.back(False))
+    def bloom(self):
+        if not self.locked and (self.hover or self.press_t>0): BLOOM.rect(self.ing["color"],*self.rect)
+    def paint(self,surf):
+        col=self.ing["color"]; rw,rh=self.rect.size
         if self.locked:
-            draw_glass(surf,rx,ry,rw,rh,r=10,alpha=90,border=(38,48,88))
             lt2=F_XS.render("LOCKED",True,(55,75,115))
-            surf.blit(lt2,lt2.get_rect(center=(rx+rw//2,ry+rh//2))); return
-        pr=clamp(self.press_t/0.12,0,1)
-        draw_glass(surf,rx,ry,rw,rh,r=10,alpha=215,border=col,
-                   glow=col if (self.hover or pr>0) else None)
+            surf.blit(lt2,lt2.get_rect(center=(rw//2,rh//2))); return
+        pr=self._key[1]
         icon=ICONS.get(self.ing["short"])
         if icon:
             ic=(pygame.transform.rotozoom(icon,0,1.0+0.08*pr) if pr>0.01 else icon)
-            surf.blit(ic,ic.get_rect(center=(rx+26,ry+rh//2)))
+            surf.blit(ic,ic.get_rect(center=(26,rh//2)))
         nc=lc(col,WHITE,0.72)
         nm=F_SM.render(self.ing["name"],True,nc)
-        surf.blit(nm,nm.get_rect(midleft=(rx+52,ry+rh//2)))
-    def is_clicked(self,pos): return self.rect.collidepoint(pos) and not self.locked
+        surf.blit(nm,nm.get_rect(midleft=(52,rh//2)))
+    def on_click(self,pos):
+        if self.locked or self.on_press is None: return False
+        self.on_press(self); return True
 
 # ── BACKGROUND STARS (lightweight) ────────────────────────────
 class Stars:
     def __init__(self,n=60):
-        self.data=[(random.randint(0,SW),random.randint(0,SH),
-                    random.uniform(0.8,2.2),random.uniform(0,math.pi*2),
-                    random.uniform(1.5,3.5)) for _ in range(n)]
+        self.data=[(FX.randint(0,SW),FX.randint(0,SH),
+                    FX.uniform(0.8,2.2),FX.uniform(0,math.pi*2),
+                    FX.uniform(1.5,3.5)) for _ in range(n)]
         self.t=0
     def update(self,dt): self.t+=dt
     def draw(self,surf):
-        for (sx,sy,sr,sph,ssp) in self.data:
+        for (sx,sy,sr,sph,ssp) in itertools.islice(self.data,QUALITY["stars"]):
             a=int(160*(0.4+0.6*abs(math.sin(sph+self.t*ssp))))
             r=int(sr)
             if r<1: continue
-            pygame.draw.circle(surf,(210,228,255,255)[:3],(sx,sy),r)
+            gfx.circle(surf,(210,228,255,255)[:3],(sx,sy),r)
 
-# ── AURORA (2 waves, cached surface updated every 6 frames) ───
+# ── AURORA (2 waves, cached surface refreshed by a job every 6 frames) ───
 class Aurora:
     def __init__(self):
         self.waves=[
-            {"phase":random.uniform(0,math.pi*2),"speed":0.22,"y":int(SH*0.20),
+            {"phase":FX.uniform(0,math.pi*2),"speed":0.22,"y":int(SH*0.20),
              "amp":55,"color":(0,220,180),"width":280,"alpha":22},
-            {"phase":random.uniform(0,math.pi*2),"speed":0.34,"y":int(SH*0.38),
+            {"phase":FX.uniform(0,math.pi*2),"speed":0.34,"y":int(SH*0.38),
              "amp":45,"color":(80,60,255),"width":240,"alpha":18},
         ]
         self._surf=pygame.Surface((SW,SH),pygame.SRCALPHA)
+        self._spare=pygame.Surface((SW,SH),pygame.SRCALPHA)   # ping-pong for DrawLists in flight
         self._frame=0
     def update(self,dt):
         for w in self.waves: w["phase"]+=w["speed"]*dt
-    def draw(self,surf):
+        every=QUALITY["aurora_every"]
+        if not every: return
         self._frame+=1
-        if self._frame%6==0:      # only redraw aurora every 6 frames
-            self._surf.fill((0,0,0,0))
-            for w in self.waves:
-                top,bot=[],[]
-                for x in range(0,SW+20,18):
-                    off=math.sin(x*0.007+w["phase"])*w["amp"]
-                    top.append((x,w["y"]+off))
-                    bot.append((x,w["y"]+off+w["width"]))
-                pts=top+list(reversed(bot))
-                if len(pts)>=3:
-                    pygame.draw.polygon(self._surf,(*w["color"],w["alpha"]),pts)
-        surf.blit(self._surf,(0,0))
+        if self._frame%every==0:  # only redraw aurora every few frames
+            JOBS.submit(self._refresh([w["phase"] for w in self.waves],QUALITY["aurora_step"]),key=self)
+    def _refresh(self,phases,step):
+        """Job: paint the waves at `phases` into the spare surface, one wave
+        per step, then swap it in (a DrawList in flight keeps the old one)."""
+        s=self._spare; s.fill((0,0,0,0)); yield
+        for w,ph in zip(self.waves,phases):
+            top,bot=[],[]
+            for x in range(0,SW+step+2,step):
+                off=math.sin(x*0.007+ph)*w["amp"]
+                top.append((x,w["y"]+off))
+                bot.append((x,w["y"]+off+w["width"]))
+            pts=top+list(reversed(bot))
+            if len(pts)>=3:
+                pygame.draw.polygon(s,(*w["color"],w["alpha"]),pts)
+            yield
+        self._surf,self._spare=s,self._surf
+    def draw(self,surf):
+        if QUALITY["aurora_every"]: surf.blit(self._surf,(0,0))
 
 # ── SNOWFLAKES (simple dots) ───────────────────────────────────
 class Snowflake:
     __slots__=["x","y","sp","dr","r","al"]
     def __init__(self,fresh=False):
-        self.x=random.uniform(0,SW)
-        self.y=random.uniform(0,SH) if not fresh else -10
-        self.sp=random.uniform(18,55); self.dr=random.uniform(-12,12)
-        self.r=random.uniform(1.5,3.5); self.al=random.randint(55,145)
+        self.x=FX.uniform(0,SW)
+        self.y=FX.uniform(0,SH) if not fresh else -10
+        self.sp=FX.uniform(18,55); self.dr=FX.uniform(-12,12)
+        self.r=FX.uniform(1.5,3.5); self.al=FX.randint(55,145)
     def update(self,dt):
         self.y+=self.sp*dt; self.x+=self.dr*dt
         if self.y>SH+10: self.__init__(fresh=True)
     def draw(self,surf):
-        pygame.draw.circle(surf,(200,225,255),(int(self.x),int(self.y)),max(1,int(self.r)))
+        gfx.circle(surf,(200,225,255),(int(self.x),int(self.y)),max(1,int(self.r)))
 
 # ══════════════════════════════════════════════════════════════
 #  END SCREEN  (animated win / lose — full procedural display)
@@ -782,18 +2124,9 @@ def _draw_outlined_text(surf, font, text, color, outline_col, cx, cy, outline=3)
     surf.blit(t, t.get_rect(center=(cx, cy)))
 
 def _draw_gradient_rect(surf, rect, top_c, bot_c, radius=24):
-    """Vertical gradient fill inside a rounded rect (cached per call)."""
+    """Vertical gradient fill inside a rounded rect (cached, see gradient_surf)."""
     x,y,w,h = rect
-    tmp = pygame.Surface((w,h), pygame.SRCALPHA)
-    for row in range(h):
-        t = row/h
-        c = lc(top_c, bot_c, t)
-        pygame.draw.line(tmp, (*c,225), (0,row), (w,row))
-    # apply rounded mask
-    mask = pygame.Surface((w,h), pygame.SRCALPHA)
-    pygame.draw.rect(mask, (255,255,255,255),(0,0,w,h), border_radius=radius)
-    tmp.blit(mask,(0,0),special_flags=pygame.BLEND_RGBA_MIN)
-    surf.blit(tmp,(x,y))
+    surf.blit(gradient_surf(w, h, top_c, bot_c, radius, alpha=225), (x,y))
 
 class EndScreen:
     """Animated full-screen win or lose overlay."""
@@ -826,55 +2159,81 @@ class EndScreen:
         "Every master chef had a bad day once.",
     ]
 
+    CARD = (720, 420)
+    CARD_GRAD = {True: ((18,38,88),(10,22,58)), False: ((55,12,18),(30,8,12))}
+    ASSETS = {}              # win → pre-rendered card gradient and stat boxes
+
+    @classmethod
+    def warm(cls, win):
+        """Job: render the static parts of the win or lose card, one per step."""
+        if win in cls.ASSETS: return
+        a = {"card": gradient_surf(*cls.CARD, *cls.CARD_GRAD[win], radius=32, alpha=225)}
+        yield
+        for label, col in (("SCORE", GOLD), ("STARS", CYAN), ("LEVEL", LIME if win else CORAL)):
+            box = pygame.Surface((130,55), pygame.SRCALPHA)
+            pygame.draw.rect(box,(*col,45),(0,0,130,55),border_radius=14)
+            pygame.draw.rect(box,(*col,140),(0,0,130,55),2,border_radius=14)
+            a[label] = box
+            yield
+        cls.ASSETS[win] = a
+
     def __init__(self, win: bool, score: int, stars: int, level: int):
+        self.floaties = []
+        self.timers = Scheduler()
+        self.peng_l = Penguin(SW//2 - 280, SH//2 + 80)
+        self.peng_r = Penguin(SW//2 + 280, SH//2 + 80)
+        self.setup(win, score, stars, level)
+
+    def setup(self, win, score, stars, level):
+        """(Re)initialise for a new result — reuses the floatie dicts and
+        side penguins of a previous end screen."""
         self.win   = win
         self.score = score
         self.stars = stars
         self.level = level
         self.t     = 0.0          # animation time
         self.phase = 0.0          # continuous oscillation
+        self._shim_key = None     # inner shimmer strip, rebuilt while fading in
 
         # Pick random personality strings
-        self.headline = random.choice(self.WIN_MSGS if win else self.LOSE_MSGS)
-        self.subtitle  = random.choice(self.WIN_SUBS  if win else self.LOSE_SUBS)
+        self.headline = FX.choice(self.WIN_MSGS if win else self.LOSE_MSGS)
+        self.subtitle  = FX.choice(self.WIN_SUBS  if win else self.LOSE_SUBS)
 
         # Floating decoration elements (emoji-like drawn shapes)
-        self.floaties = []
+        while len(self.floaties) < 18: self.floaties.append({})
         symbols = ["star","heart","snowflake","fish","note"] if win else \
                   ["snowflake","fish","note","drop","zzz"]
-        for i in range(18):
-            self.floaties.append({
-                "x": random.uniform(40, SW-40),
-                "y": random.uniform(SH*0.05, SH*0.92),
-                "sym": random.choice(symbols),
-                "col": random.choice([PINK,CYAN,LIME,GOLD,PURP,TEAL,CORAL,OFFWH]),
-                "size": random.randint(12, 26),
-                "spd": random.uniform(18, 50),
-                "phase": random.uniform(0, math.pi*2),
-                "rot": random.uniform(0, 360),
-                "rot_spd": random.uniform(-40, 40),
-                "alpha": random.randint(140, 230),
+        for f in self.floaties:
+            f.update({
+                "x": FX.uniform(40, SW-40),
+                "y": FX.uniform(SH*0.05, SH*0.92),
+                "sym": FX.choice(symbols),
+                "col": FX.choice([PINK,CYAN,LIME,GOLD,PURP,TEAL,CORAL,OFFWH]),
+                "size": FX.randint(12, 26),
+                "spd": FX.uniform(18, 50),
+                "phase": FX.uniform(0, math.pi*2),
+                "rot": FX.uniform(0, 360),
+                "rot_spd": FX.uniform(-40, 40),
+                "alpha": FX.randint(140, 230),
             })
 
         # Two side penguins for the end screen
-        self.peng_l = Penguin(SW//2 - 280, SH//2 + 80)
-        self.peng_r = Penguin(SW//2 + 280, SH//2 + 80)
+        self.peng_l.__init__(SW//2 - 280, SH//2 + 80)
+        self.peng_r.__init__(SW//2 + 280, SH//2 + 80)
         self.peng_l.outfit = 2
         self.peng_r.outfit = 4
-        if win:
-            self.peng_l.react_happy()
-            self.peng_r.react_happy()
-        else:
-            self.peng_l.react_sad()
-            self.peng_r.react_sad()
+        self.timers.clear()
+        self._cheer()
+        self.timers.every(1.8 if win else 2.2, self._cheer)
 
         # Grade
         grade_idx = min(5, stars // 4)
         self.grade     = ["F","D","C","B","A","S"][grade_idx]
         self.grade_col = [RED,CORAL,ORNGE,GOLD,LIME,CYAN][grade_idx]
 
-        # Pre-build panel gradient surfaces (cached)
-        self._panel_surf = None
+        # Card gradient and stat boxes (normally warmed by a job already)
+        JOBS.finish(("end", win), lambda: self.warm(win))
+        self.assets = self.ASSETS[win]
 
     def update(self, dt):
         self.t     += dt
@@ -885,14 +2244,16 @@ class EndScreen:
             f["x"]   += math.sin(self.phase*0.8 + f["phase"]) * 18 * dt
             if f["y"] < -40:
                 f["y"] = SH + 20
-                f["x"] = random.uniform(40, SW-40)
+                f["x"] = FX.uniform(40, SW-40)
         self.peng_l.update(dt)
         self.peng_r.update(dt)
-        # Keep penguins reacting
-        if self.win and self.t % 1.8 < dt*2:
-            self.peng_l.react_happy(); self.peng_r.react_happy()
-        elif not self.win and self.t % 2.2 < dt*2:
-            self.peng_l.react_sad(); self.peng_r.react_sad()
+        self.timers.advance(dt)
+
+    def _cheer(self):
+        """Keep the side penguins reacting — once per period, exactly."""
+        for p in (self.peng_l, self.peng_r):
+            if self.win: p.react_happy()
+            else: p.react_sad()
 
     def _draw_floatie(self, surf, f):
         """Draw a floating decoration symbol."""
@@ -958,44 +2319,39 @@ class EndScreen:
         ea   = int(ease * 255)
 
         # ── Full-screen dim overlay ──────────────────────────
-        ov = pygame.Surface((SW,SH), pygame.SRCALPHA)
-        ov.fill((3,5,18,int(ea*0.88)))
-        surf.blit(ov,(0,0))
+        surf.blit(veil((3,5,18), int(ea*0.88)), (0,0))
+
+        fx = QUALITY["end_fx"]        # False → simplified screen
+        ol = 4 if fx else 1
 
         # ── Floating decorations ─────────────────────────────
-        for f in self.floaties:
+        for f in (self.floaties if fx else ()):
             self._draw_floatie(surf, f)
 
-        # ── Outer glow ring ──────────────────────────────────
+        # Accent colour (the concentric glow that used to be drawn here sat
+        # entirely under the main card, so it is gone rather than bloomed)
         glow_c = LIME if self.win else CORAL
-        ring_r = int(lerp(320, 295, 0.5+0.5*math.sin(self.phase*1.8)))
-        for gr in range(30, 0, -4):
-            ga = int(28*(1-gr/30)**1.5 * ease)
-            gs2 = pygame.Surface((gr*2, gr*2), pygame.SRCALPHA)
-            pygame.draw.circle(gs2,(*glow_c,ga),(gr,gr),gr)
-            surf.blit(gs2,(SW//2-gr, SH//2-gr-60))
 
         # ── Main card ────────────────────────────────────────
-        cw, ch = 720, 420
+        cw, ch = self.CARD
         cx_card, cy_card = SW//2 - cw//2, SH//2 - ch//2 - 40
 
         # Gradient background
-        top_c = (18,38,88) if self.win else (55,12,18)
-        bot_c = (10,22,58) if self.win else (30,8,12)
-        _draw_gradient_rect(surf,(cx_card,cy_card,cw,ch),top_c,bot_c,radius=32)
+        surf.blit(self.assets["card"], (cx_card, cy_card))
 
         # Glowing border
         border_s = pygame.Surface((cw,ch),pygame.SRCALPHA)
-        border_c = lc(glow_c,WHITE, 0.3+0.2*abs(math.sin(self.phase*2)))
+        border_c = ramp(glow_c,WHITE)(0.3+0.2*abs(math.sin(self.phase*2)))
         pygame.draw.rect(border_s,(*border_c,200),(0,0,cw,ch),3,border_radius=32)
         surf.blit(border_s,(cx_card,cy_card))
 
         # Inner shimmer line at top
-        sh_s = pygame.Surface((cw-20,3),pygame.SRCALPHA)
-        for sx in range(cw-20):
-            t2=sx/(cw-20); ca=int(80*math.sin(math.pi*t2)*ease)
-            pygame.draw.line(sh_s,(*glow_c,ca),(sx,0),(sx,3))
-        surf.blit(sh_s,(cx_card+10,cy_card+12))
+        if fx:
+            if self._shim_key != (glow_c, ease):     # constant once faded in
+                self._shim_key = (glow_c, ease)
+                self._shim = strip_surf([(*glow_c, int(80*math.sin(math.pi*sx/(cw-20))*ease))
+                                         for sx in range(cw-20)], cw-20, 3, horizontal=True)
+            surf.blit(self._shim,(cx_card+10,cy_card+12))
 
         # ── Win/Lose HEADLINE ────────────────────────────────
         ccx = SW//2
@@ -1016,13 +2372,13 @@ class EndScreen:
             for ci, ch2 in enumerate(chars):
                 ccol = h_cols[ci % len(h_cols)]
                 _draw_outlined_text(surf, F_HERO, ch2, ccol, (10,10,40),
-                                    lx + F_HERO.size(ch2)[0]//2, bob_y, outline=4)
+                                    lx + F_HERO.size(ch2)[0]//2, bob_y, outline=ol)
                 lx += F_HERO.size(ch2)[0]
         else:
             # Sad wobble for lose
             wobble = int(math.sin(self.phase*3)*4)
             _draw_outlined_text(surf, F_HERO, "GAME OVER", RED, (30,5,5),
-                                ccx, cy_card+65+wobble, outline=4)
+                                ccx, cy_card+65+wobble, outline=ol)
 
         # ── Personality sub-message ──────────────────────────
         pulse_a = 180+int(75*abs(math.sin(self.phase*1.5)))
@@ -1043,10 +2399,7 @@ class EndScreen:
             ("STARS", str(self.stars),   CYAN,  ccx),
             ("LEVEL", str(self.level),   glow_c, ccx+200),
         ]:
-            box_s = pygame.Surface((130,55),pygame.SRCALPHA)
-            pygame.draw.rect(box_s,(*col2,45),(0,0,130,55),border_radius=14)
-            pygame.draw.rect(box_s,(*col2,140),(0,0,130,55),2,border_radius=14)
-            surf.blit(box_s,(bx2-65,stat_y))
+            surf.blit(self.assets[label],(bx2-65,stat_y))
             v_s = F_LG.render(val, True, col2)
             surf.blit(v_s, v_s.get_rect(centerx=bx2, top=stat_y+4))
             l_s = F_XS.render(label, True, lc(col2,WHITE,0.5))
@@ -1056,9 +2409,9 @@ class EndScreen:
         grade_y = cy_card+295
         grade_r = int(34 + 4*abs(math.sin(self.phase*2.5)))
         glow_dot(surf, self.grade_col, ccx, grade_y, grade_r)
-        pygame.draw.circle(surf, lc(self.grade_col,(5,5,20),0.5), (ccx,grade_y), grade_r)
+        gfx.circle(surf, lc(self.grade_col,(5,5,20),0.5), (ccx,grade_y), grade_r)
         _draw_outlined_text(surf, F_BIG, self.grade, self.grade_col, (5,5,20),
-                            ccx, grade_y, outline=3)
+                            ccx, grade_y, outline=min(3, ol))
         gl2 = F_SM.render("CHEF GRADE", True, lc(self.grade_col,WHITE,0.55))
         surf.blit(gl2, gl2.get_rect(centerx=ccx, top=grade_y+40))
 
@@ -1080,8 +2433,8 @@ class EndScreen:
         self.peng_r.draw(surf)
 
         # ── Corner fish decorations ─────────────────────────
-        for i, (fx, fy, flip) in enumerate([(55,55,False),(SW-55,55,True),
-                                             (55,SH-55,False),(SW-55,SH-55,True)]):
+        for i, (fx2, fy, flip) in enumerate([(55,55,False),(SW-55,55,True),
+                                             (55,SH-55,False),(SW-55,SH-55,True)] if fx else ()):
             fish_s = pygame.Surface((48,28),pygame.SRCALPHA)
             col3 = [CYAN,PINK,GOLD,LIME][i]
             pts3 = [(2,14),(10,5),(38,9),(46,14),(38,19),(10,23)]
@@ -1092,7 +2445,250 @@ class EndScreen:
             if flip:
                 fish_s=pygame.transform.flip(fish_s,True,False)
             bob2 = int(math.sin(self.phase*1.8+i)*6)
-            surf.blit(fish_s,(fx-24,fy-14+bob2))
+            surf.blit(fish_s,(fx2-24,fy-14+bob2))
+
+
+# ══════════════════════════════════════════════════════════════
+#  TELEMETRY  (ring buffer on the game thread, I/O on a writer thread)
+# ══════════════════════════════════════════════════════════════
+class Telemetry:
+    """Session telemetry.  emit() only appends a (time, kind, fields) tuple
+    to an in-memory ring — no serialization, no locks, no I/O — so it is
+    safe from try_serve() or Game.update().  A daemon thread wakes every
+    `interval` seconds, or early once the ring is half full, and writes
+    whatever is queued as one batch: JSON lines, or rows in a SQLite
+    database in WAL mode when the path ends in .db/.sqlite.
+
+    When the ring is full the game thread still never waits: policy
+    "drop_new" discards the incoming event, "drop_old" lets the bounded
+    deque evict the oldest queued one; either way `dropped` counts it.
+    `dropped` belongs to the game thread and `failed` (events lost to write
+    errors) to the writer.  Once the file passes `max_bytes` it is rotated
+    to .1 … .keep.
+    """
+    def __init__(self):
+        self.on = False
+        self.written = self.dropped = self.failed = self.rotations = 0
+        self._frames = []; self._frames_t = 0.0
+
+    def open(self, path, capacity=8192, policy="drop_new", max_bytes=8 << 20,
+             keep=3, interval=1.0):
+        self.path = path; self.capacity = capacity; self.policy = policy
+        self.max_bytes = max_bytes; self.keep = keep; self.interval = interval
+        self.sqlite = path.endswith((".db", ".sqlite"))
+        self.session = os.urandom(6).hex()      # not `random`: that is the seeded gameplay stream
+        self.ring = collections.deque(maxlen=capacity if policy == "drop_old" else None)
+        self._wake = threading.Event(); self._stop = False
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+        self.on = True
+        self.emit("session", pid=os.getpid(), pack=content()["name"])
+        return self
+
+    # ── game thread ──────────────────────────────────────────
+    def emit(self, kind, **fields):
+        if FLIGHT.on: FLIGHT.mark(kind)
+        if not self.on: return
+        ring = self.ring
+        if len(ring) >= self.capacity:
+            self.dropped += 1
+            if self.policy == "drop_new": return
+        ring.append((time.time(), kind, fields))
+        if len(ring) > self.capacity >> 1: self._wake.set()
+
+    def frame(self, work_ms, mode, every=5.0):
+        """Aggregate frame times; emits one "perf" summary per `every` s."""
+        if not self.on: return
+        f = self._frames; f.append(work_ms)
+        now = time.perf_counter()
+        if now - self._frames_t < every: return
+        if self._frames_t:
+            f.sort()
+            self.emit("perf", frames=len(f), mean_ms=round(sum(f)/len(f), 2),
+                      p95_ms=round(f[int(len(f)*0.95)], 2), max_ms=round(f[-1], 2),
+                      quality=QUALITY["name"], mode=mode)
+        self._frames = []; self._frames_t = now
+
+    def close(self):
+        if not self.on: return
+        self.emit("session_end", dropped=self.dropped)
+        self.on = False; self._stop = True; self._wake.set()
+        self._thread.join(timeout=5)
+        print(f"📈 Telemetry: {self.written} events → {self.path} "
+              f"({self.dropped} dropped, {self.failed} failed, {self.rotations} rotations)")
+
+    # ── writer thread ────────────────────────────────────────
+    def _run(self):
+        sink = self._open_sink()
+        while True:
+            self._wake.wait(self.interval); self._wake.clear()
+            stop = self._stop
+            batch = []
+            ring = self.ring
+            while ring: batch.append(ring.popleft())
+            if batch:
+                try:
+                    if self._size() > self.max_bytes:
+                        self._close_sink(sink); self._rotate(); sink = self._open_sink()
+                    self._write(sink, batch)
+                    self.written += len(batch)
+                except (OSError, ValueError) as e:       # never take the game down
+                    self.failed += len(batch)
+                    print(f"⚠ Telemetry write failed: {e}")
+            if stop: break
+        self._close_sink(sink)
+
+    def _open_sink(self):
+        d = os.path.dirname(self.path)
+        if d: os.makedirs(d, exist_ok=True)
+        if not self.sqlite: return open(self.path, "a", encoding="utf-8")
+        import sqlite3
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL"); db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS events"
+                   " (session TEXT, t REAL, kind TEXT, data TEXT)")
+        return db
+
+    def _close_sink(self, sink):
+        try: sink.close()
+        except Exception: pass
+
+    def _write(self, sink, batch):
+        sess = self.session
+        if self.sqlite:
+            with sink:
+                sink.executemany("INSERT INTO events VALUES (?,?,?,?)",
+                                 [(sess, t, k, json.dumps(f)) for t, k, f in batch])
+        else:
+            sink.write("".join(json.dumps({"session": sess, "t": round(t, 3), "kind": k, **f}) + "\n"
+                               for t, k, f in batch))
+            sink.flush()
+
+    def _size(self):
+        n = 0
+        for f in (self.path, self.path + "-wal"):      # WAL pages count too
+            try: n += os.path.getsize(f)
+            except OSError: pass
+        return n
+
+    def _rotate(self):
+        for i in range(self.keep - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"): os.replace(f"{self.path}.{i}", f"{self.path}.{i+1}")
+        os.replace(self.path, f"{self.path}.1")
+        self.rotations += 1
+
+TELEMETRY = Telemetry()
+
+
+# ══════════════════════════════════════════════════════════════
+#  FLIGHT RECORDER  (last few seconds of frames + sampled stacks, dumped on a hitch)
+# ══════════════════════════════════════════════════════════════
+class FlightRecorder:
+    """Always-on hitch recorder.  frame() and mark() append to bounded rings
+    (per-frame work times; event markers: telemetry events, clicks, GC
+    passes, quality changes), and a daemon thread samples the main thread's
+    stack through sys._current_frames() `hz` times a second, keeping only
+    code objects.  When a frame's work exceeds `threshold_ms`, the last
+    `window` seconds are handed to a writer thread, which names the frames
+    and writes
+
+      <stem>.json    timeline: frames and markers in ms relative to the slow frame
+      <stem>.folded  collapsed stacks (flamegraph.pl / speedscope), rooted
+                     at "hitch" for samples inside the slow frame and
+                     "before" for the rest of the window
+
+    Dumps are at least `cooldown` seconds apart, at most `max_dumps` a session."""
+    def __init__(self):
+        self.on = False; self.dumps = 0; self.worst = 0.0
+
+    def start(self, threshold_ms=50.0, window=4.0, hz=100, directory=None,
+              cooldown=5.0, max_dumps=20):
+        self.threshold = threshold_ms; self.window = window; self.hz = hz
+        self.dir = directory; self.cooldown = cooldown; self.max_dumps = max_dumps
+        self.frames = collections.deque(maxlen=int(window*FPS*2))
+        self.marks = collections.deque(maxlen=1024)
+        self.samples = collections.deque(maxlen=int(window*hz))
+        self.n = 0; self._next_dump = 0.0; self._writers = []
+        self._main = threading.get_ident(); self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="flight-sampler", daemon=True)
+        self._thread.start()
+        gc.callbacks.append(self._gc)
+        self.on = True
+        return self
+
+    # ── game thread ──────────────────────────────────────────
+    def mark(self, kind):
+        if self.on: self.marks.append((time.perf_counter(), kind))
+
+    def _gc(self, phase, info):
+        self.marks.append((time.perf_counter(), f"gc{info['generation']} {phase}"))
+
+    def frame(self, t0, work_ms, mode):
+        """One frame that started at perf_counter() t0 and worked work_ms."""
+        if not self.on: return
+        self.n += 1
+        self.frames.append((t0, work_ms, mode))
+        if work_ms < self.threshold: return
+        self.worst = max(self.worst, work_ms)
+        now = time.perf_counter()
+        if now < self._next_dump or self.dumps >= self.max_dumps: return
+        self._next_dump = now + self.cooldown; self.dumps += 1
+        snap = (list(self.frames), list(self.marks), list(self.samples), t0, work_ms, self.n)
+        w = threading.Thread(target=self._dump, args=snap, name="flight-writer", daemon=True)
+        w.start(); self._writers.append(w)
+
+    def stop(self):
+        if not self.on: return
+        self.on = False; self._stop.set(); self._thread.join(timeout=1)
+        gc.callbacks.remove(self._gc)
+        for w in self._writers: w.join(timeout=5)
+        if self.dumps:
+            print(f"🛩  Flight recorder: {self.dumps} hitch dump(s) over {self.threshold:.0f} ms "
+                  f"(worst {self.worst:.1f} ms) → {self.dir}")
+
+    # ── sampler / writer threads ─────────────────────────────
+    def _sample(self):
+        interval = 1.0/self.hz; main = self._main; out = self.samples
+        while not self._stop.wait(interval):
+            f = sys._current_frames().get(main); codes = []
+            while f is not None: codes.append(f.f_code); f = f.f_back
+            out.append((time.perf_counter(), tuple(codes)))
+
+    @staticmethod
+    def _name(code):
+        return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+    def _dump(self, frames, marks, samples, t0, work_ms, n):
+        lo = t0 - self.window; hi = t0 + work_ms/1000
+        rel = lambda t: round((t - t0)*1000, 2)
+        names = {}; folded = collections.Counter()
+        for t, codes in samples:
+            if t < lo: continue
+            stack = ["hitch" if t0 <= t <= hi else "before"]
+            for c in reversed(codes):
+                nm = names.get(c)
+                if nm is None: nm = names[c] = self._name(c).replace(";", ":")
+                stack.append(nm)
+            folded[";".join(stack)] += 1
+        timeline = {
+            "frame": n, "ms": round(work_ms, 2), "threshold_ms": self.threshold,
+            "hz": self.hz, "when": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frames": [(rel(t), round(ms, 2), m) for t, ms, m in frames if t >= lo],
+            "marks": [(rel(t), k) for t, k in marks if t >= lo],
+            "samples": sum(folded.values()),
+            "hitch_samples": sum(c for s, c in folded.items() if s.startswith("hitch")),
+        }
+        try:
+            if self.dir is None: self.dir = os.path.join(cache_dir(), "hitches")
+            os.makedirs(self.dir, exist_ok=True)
+            stem = os.path.join(self.dir, f"hitch-{time.strftime('%Y%m%d-%H%M%S')}-f{n:06d}-{int(work_ms)}ms")
+            with open(stem + ".json", "w") as f: json.dump(timeline, f, indent=1)
+            with open(stem + ".folded", "w") as f:
+                f.writelines(f"{s} {c}\n" for s, c in folded.most_common())
+        except OSError as e:                                    # never take the game down
+            print(f"⚠ Flight recorder dump failed: {e}")
+
+FLIGHT = FlightRecorder()
 
 
 # ══════════════════════════════════════════════════════════════
@@ -1100,15 +2696,23 @@ class EndScreen:
 # ══════════════════════════════════════════════════════════════
 class Game:
     MAX_ORDERS=4; MAX_FAILS=5
-
-    # Per-level config: (duration_sec, score_target, label)
-    LEVEL_CONFIG = [
-        (60,  80,  "Apprentice Chef 🐣"),
-        (70,  180, "Sous Chef 🐧"),
-        (75,  320, "Head Chef 🎩"),
-        (80,  500, "Master Chef ⭐"),
-        (90,  750, "Legendary Pingu 👑"),
-    ]
+    # Rush hour (Game(rush=True)): endless, orders pile up on a scrolling rail
+    RUSH_MAX=600             # open-order cap
+    RUSH_FAILS=50
+    RUSH_TIME=5.0            # multiplier on every recipe's time limit
+    RUSH_GAP=1.5             # seconds between orders at the start …
+    RUSH_RAMP=15.0           # … shrinking as 1/(1 + t/RUSH_RAMP)
+    RUSH_MIN_GAP=0.08
+    RUSH_LEVEL_T=40.0        # seconds per level
+    RAIL_GAP=12              # space between cards on the rail
+    LEVEL_SCREEN=3.5         # level-complete interstitial (s)
+    cosmetic=True            # False → headless sims skip scenery and particles
+    SPEED_STEP=0.18          # order speed-up per level
+    TIME_SCALE=1.0           # multiplier on every recipe's time limit
+    PROG_RAMP=Ramp(CORAL,LIME); CLOCK_RAMP=Ramp(RED,LIME)   # HUD bar colours
+
+    # Per-level config: (duration_sec, score_target, label) — from the content pack
+    LEVEL_CONFIG = LEVEL_CONFIG
 
     # Layout constants (designed for 1280×780)
     LEFT_W    = 200          # ingredient panel width
@@ -1123,228 +2727,365 @@ class Game:
     BOWL_W    = 310
     BOWL_H    = 130
 
-    def __init__(self):
+    def __init__(self, rush=False):
+        content()
+        self.rush      = rush
         self.aurora    = Aurora()
         self.stars_bg  = Stars(60)
         self.snows     = [Snowflake() for _ in range(28)]
         self.penguin   = Penguin(SW-115, SH-185)
-        self.particles = []; self.floats=[]; self.drops=[]
+        self.crowd     = Crowd()
+        self.particles = []; self.floats=[]; self.drops=[]; self.orders=[]
+        self.sched = Scheduler()     # play clock: runs only while a level is live
+        self.ui_sched = Scheduler()  # runs during the level-complete interstitial
+        self.spawn_timer = self.combo_timer = self.level_timer = None
+        self._expired = []
+        self._spare_end = None
         self.end_screen = None
         self.level_complete = False
-        self.level_screen_t = 0.0
         self.GAME_DUR = self.LEVEL_CONFIG[0][0]
         self.level_score_start = 0
-        self._build_buttons()
+        self.matcher   = BowlMatcher(INDEX)
+        self._build_ui()
         self.reset()
 
-    def _build_buttons(self):
-        self.buttons=[]
+    def _build_ui(self):
+        """The retained widget tree; see Widget / UI."""
         bw = self.LEFT_W - 16
-        for i,ing in enumerate(INGREDIENTS):
-            self.buttons.append(IngBtn(ing, self.LEFT_X+8,
-                                       self.TOP_BAR_H+50+i*52, bw))
+        self.buttons=[IngBtn(ing, self.LEFT_X+8, self.TOP_BAR_H+50+i*52, bw,
+                             self.sched, self._add_to_bowl)
+                      for i,ing in enumerate(INGREDIENTS)]
+        bcx,bcy,bw,bh=self.BOWL_CX,self.BOWL_CY,self.BOWL_W,self.BOWL_H
+        self.w_top=Widget((0,0,SW,self.TOP_BAR_H), self._paint_title, glass=(0,195,None))
+        self.w_top.add(Widget((0,self.TOP_BAR_H-1,SW,2), self._paint_shimmer))
+        self.w_left=Widget((self.LEFT_X,self.TOP_BAR_H+4,self.LEFT_W,len(INGREDIENTS)*52+60),
+                           self._paint_left_panel, key=lambda: self.level,
+                           glass=(16,178,CYAN), glow=CYAN)
+        self.w_left.add(*self.buttons)
+        self.w_bowl=Widget((bcx-bw//2,bcy-bh//2,bw,bh), self._paint_bowl,
+                           key=lambda: tuple(self.bowl), bloom=self._bowl_bloom,
+                           glass=lambda: (28,210,self._bowl_color()))
+        has_bowl=lambda: bool(self.bowl)
+        self.w_serve=Button(self._serve_rect(),LIME,"SERVE ▲",F_MD,self.try_serve,has_bowl)
+        self.w_clear=Button(self._clear_rect(),CORAL,"✕",F_MD,self._undo,has_bowl)
+        self.w_hud=Widget((SW-self.HUD_W-self.HUD_MARG,self.TOP_BAR_H+4,self.HUD_W,self.HUD_H),
+                          self._paint_hud, key=self._hud_state, glass=(16,188,PURP), glow=PURP)
+        self.ui=UI(self.w_top,self.w_left,self.w_bowl,self.w_serve,self.w_clear,self.w_hud)
+
+    def _refresh_locks(self):
+        ul=self.unlocked()
+        for btn in self.buttons: btn.locked = btn.ing["short"] not in ul
 
     def reset(self):
-        self.score=0; self.stars_earned=0; self.orders=[]; self.bowl=[]
-        self.next_order_t=2.5; self.game_t=0.0
+        TELEMETRY.emit("game_start")
+        self.score=0; self.stars_earned=0; self.order_serial=0
+        self._clear_orders(); self._clear_bowl()
+        self.sched.clear(); self.ui_sched.clear(); self.rail_x=self.rail_to=0.0
+        self._arm_spawn(2.5); self.game_t=0.0
         self.game_over=False; self.win=False
-        self.level=1; self.combo=0; self.combo_t=0
+        self.level=1; self.combo=0; self.show_combo=False
         self.failed_count=0
-        self.particles=[]; self.floats=[]; self.drops=[]
+        PARTICLES.put_all(self.particles); FLOATS.put_all(self.floats); DROPS.put_all(self.drops)
         self.penguin.outfit=0
+        if self.end_screen is not None: self._spare_end = self.end_screen; GC.checkpoint()
         self.end_screen = None
         self.level_complete = False
-        self.level_screen_t = 0.0
         self.GAME_DUR = self.LEVEL_CONFIG[0][0]
         self.level_score_start = 0
+        self._refresh_locks()
         for _ in range(2): self.spawn_order()
+        if self.cosmetic:
+            for win in (False, True): JOBS.submit(EndScreen.warm(win), key=("end", win))
+            if self.rush: self._prewarm(2)
+
+    def _prewarm(self, lv):
+        if self.cosmetic and lv<=self.last_level: JOBS.submit(self._warm_level(lv), key=(self, lv))
+
+    def _warm_level(self, lv):
+        """Job: paint what level lv unlocks (buttons, recipe faces) while
+        the current one is still being played."""
+        ul=INDEX.unlocked_at(lv)
+        for btn in self.buttons:
+            if btn.locked and btn.ing["short"] in ul: btn.prime_unlocked(); yield
+        for rid in INDEX.avail_at(lv):
+            r=INDEX.recipes[rid]
+            if r["name"] not in OrderCard.FACES: OrderCard.face(r); yield
 
     def unlocked(self):
-        return {i["short"] for i in INGREDIENTS if i["unlock"]<=self.level}
+        return INDEX.unlocked_at(self.level)
+
+    def speed(self): return 1.0+(self.level-1)*self.SPEED_STEP
 
-    def speed(self): return 1.0+(self.level-1)*0.18
+    @property
+    def max_orders(self): return self.RUSH_MAX if self.rush else self.MAX_ORDERS
+    @property
+    def max_fails(self): return self.RUSH_FAILS if self.rush else self.MAX_FAILS
+
+    @property
+    def last_level(self): return len(self.LEVEL_CONFIG)
 
     def spawn_order(self):
-        if len(self.orders)>=self.MAX_ORDERS: return
-        ul=self.unlocked()
-        avail=[r for r in RECIPES
-               if r["unlock"]<=self.level and all(i in ul for i in r["ing"])]
+        if len(self.orders)>=self.max_orders: return
+        avail=INDEX.avail_at(self.level)
         if avail:
-            self.orders.append(OrderCard(random.choice(avail), self.speed()))
+            rid=random.choice(avail)
+            spd=self.speed()/self.TIME_SCALE
+            if self.rush: spd/=self.RUSH_TIME
+            o=CARDS.get(INDEX.recipes[rid], spd, rid, self.sched)
+            self.orders.append(o); self.matcher.add_order(o)
+            self.order_serial+=1; o.serial=self.order_serial
+            self.crowd.join(o.serial)
+            o.timer=self.sched.at(o.deadline, self._expire, o)
+            TELEMETRY.emit("order_spawn", order=o.serial, recipe=o.recipe["name"],
+                           level=self.level, limit=round(o.total,2))
+
+    def _clear_orders(self):
+        for o in self.orders: o.timer.cancel()
+        CARDS.put_all(self.orders); self.matcher.clear_orders()
+        self._expired.clear(); self.crowd.clear()
+
+    # ── timers (all on self.sched unless noted) ──────────────
+    def _expire(self, o):
+        o.expire(); self._expired.append(o)      # counted at the start of next frame
+
+    def _retire(self, o):
+        self.orders.remove(o); CARDS.put(o)
+
+    def _arm_spawn(self, delay):
+        if self.spawn_timer: self.spawn_timer.cancel()
+        self.spawn_waiting=False
+        self.spawn_timer=self.sched.after(delay, self._spawn_due)
+
+    def _spawn_due(self):
+        """Spawn timer fired: the order arrives at the timer's exact due time.
+        With the strip full it waits for a free slot instead."""
+        if len(self.orders)>=self.max_orders: self.spawn_waiting=True; return
+        self._arm_spawn(self._order_gap())
+        self.spawn_order()
+
+    def _hide_combo(self): self.show_combo=False
+
+    def _next_level(self):
+        """End of the level-complete interstitial (on self.ui_sched)."""
+        self.level += 1
+        self.penguin.outfit = self.level - 1
+        self.level_score_start = self.score
+        self.game_t = 0.0
+        self.GAME_DUR = self.LEVEL_CONFIG[self.level-1][0]
+        self.failed_count = 0
+        self._clear_orders(); self._clear_bowl()
+        self._arm_spawn(1.5)
+        self.level_complete = False
+        self._refresh_locks()
+        for _ in range(2): self.spawn_order()
+
+    def _level_clear(self):
+        self.level_complete = True
+        self.level_timer = self.ui_sched.after(self.LEVEL_SCREEN, self._next_level)
+        self._prewarm(self.level+1)
+        TELEMETRY.emit("level_clear", level=self.level, score=self.score)
+        GC.checkpoint()
+
+    @property
+    def level_screen_t(self):
+        """Seconds left on the level-complete interstitial."""
+        if not self.level_complete: return 0.0
+        return max(0.0, self.level_timer.when-self.ui_sched.t)
+
+    def _order_gap(self):
+        if self.rush:
+            gap=self.RUSH_GAP/(1+self.game_t/self.RUSH_RAMP)
+            return max(self.RUSH_MIN_GAP, random.uniform(0.6,1.4)*gap)
+        return random.uniform(5,10)/self.speed()
+
+    def _rush_level(self):
+        lv=min(self.last_level, 1+int(self.game_t//self.RUSH_LEVEL_T))
+        if lv!=self.level:
+            self.level=lv; self.penguin.outfit=lv-1; self.penguin.react_happy()
+            self._refresh_locks()
+            self._prewarm(lv+1)
+            GC.checkpoint(1)
+            sfx("lvl"); self.add_float(f"RUSH LEVEL {lv}!",self.BOWL_CX,self.BOWL_CY-130,LIME,True)
+
+    def _clear_bowl(self):
+        self.bowl=[]; self.matcher.clear_bowl()
 
     def emit(self,cx,cy,color,n=12,rise=False,label=None):
-        for i in range(min(n,14)):       # cap particles
-            self.particles.append(Particle(cx,cy,color,
-                                           label if i==n//2 else None,
-                                           i%3==0, rise))
+        if not self.cosmetic: return
+        n=max(1,round(min(n,14)*QUALITY["emit"]))   # cap particles
+        for i in range(n):
+            self.particles.append(PARTICLES.get(cx,cy,color,
+                                                label if i==n//2 else None,
+                                                i%3==0, rise))
 
     def add_float(self,text,x,y,color,large=False):
-        self.floats.append(FloatText(text,x,y,color,large))
+        self.floats.append(FLOATS.get(text,x,y,color,large))
 
     def try_serve(self):
         if not self.bowl: return
         bcx,bcy=self.BOWL_CX,self.BOWL_CY
-        for o in self.orders:
-            if o.done or o.failed: continue
-            if self.bowl==o.recipe["ing"]:
-                o.done=True; st=o.recipe["stars"]
-                spd=clamp(o.remain/o.total,0,1)
-                pts=int(st*20*(0.5+spd))
-                if self.combo>=2: pts=int(pts*(1+self.combo*0.25))
-                self.score+=pts; self.stars_earned+=st
-                self.combo+=1; self.combo_t=2.2
-                c=[GOLD,LIME,CYAN,PINK,PURP][self.combo%5]
-                self.emit(bcx,bcy,c,14,rise=True)
-                self.add_float(f"+{pts}",bcx,bcy-50,GOLD,large=True)
-                if self.combo>1:
-                    self.add_float(f"x{self.combo} COMBO!",bcx,bcy-90,c,True)
-                    sfx("combo")
-                else: sfx("ok")
-                self.penguin.react_happy(); self.bowl=[]
-                # Level up check (score target for this level)
-                ol=self.level
-                _, score_target, _ = self.LEVEL_CONFIG[self.level-1]
-                level_score = self.score - self.level_score_start
-                if level_score >= score_target and self.level < 5:
-                    self.level_complete = True
-                    self.level_screen_t = 3.5
-                    sfx("lvl")
-                    self.add_float(f"LEVEL {self.level} CLEAR!", self.BOWL_CX, bcy-130, LIME, True)
-                    self.penguin.react_happy()
-                elif self.level==5 and level_score >= score_target:
-                    # Beat all 5 levels!
-                    self.game_over=True; self.win=True; self.penguin.react_happy()
-                else:
-                    # Outfit changes with level
-                    self.penguin.outfit = self.level - 1
-                return
+        o=self.matcher.match()
+        if o is not None:
+            o.serve(); st=o.recipe["stars"]
+            self.matcher.remove_order(o); self.crowd.leave(o.serial, happy=True)
+            o.timer.cancel(); o.timer=self.sched.at(o.gone_at, self._retire, o)
+            spd=clamp(o.remain/o.total,0,1)
+            pts=int(st*20*(0.5+spd))
+            if self.combo>=2: pts=int(pts*(1+self.combo*0.25))
+            self.score+=pts; self.stars_earned+=st
+            self.combo+=1; self.show_combo=True
+            if self.combo_timer: self.combo_timer.cancel()
+            self.combo_timer=self.sched.after(2.2, self._hide_combo)
+            TELEMETRY.emit("order_served", order=o.serial, recipe=o.recipe["name"],
+                           level=self.level, took=round(o.total-o.remain,2),
+                           limit=round(o.total,2), pts=pts, combo=self.combo)
+            c=[GOLD,LIME,CYAN,PINK,PURP][self.combo%5]
+            self.emit(bcx,bcy,c,14,rise=True)
+            self.add_float(f"+{pts}",bcx,bcy-50,GOLD,large=True)
+            if self.combo>1:
+                self.add_float(f"x{self.combo} COMBO!",bcx,bcy-90,c,True)
+                sfx("combo")
+            else: sfx("ok")
+            self.penguin.react_happy(); self._clear_bowl()
+            # Level up check (score target for this level)
+            ol=self.level
+            _, score_target, _ = self.LEVEL_CONFIG[self.level-1]
+            level_score = self.score - self.level_score_start
+            if self.rush:
+                pass                            # rush levels follow the clock
+            elif level_score >= score_target and self.level < self.last_level:
+                self._level_clear()
+                sfx("lvl")
+                self.add_float(f"LEVEL {self.level} CLEAR!", self.BOWL_CX, bcy-130, LIME, True)
+                self.penguin.react_happy()
+            elif self.level==self.last_level and level_score >= score_target:
+                # Beat every level!
+                self.game_over=True; self.win=True; self.penguin.react_happy()
+            else:
+                # Outfit changes with level
+                self.penguin.outfit = self.level - 1
+            return
         # wrong
+        TELEMETRY.emit("wrong_serve", bowl=list(self.bowl), level=self.level, combo_lost=self.combo)
         self.combo=0
         self.emit(bcx,bcy,RED,8)
         self.add_float("WRONG!",bcx,bcy,RED)
-        sfx("wrong"); self.penguin.react_sad(); self.bowl=[]
+        sfx("wrong"); self.penguin.react_sad(); self._clear_bowl()
 
     def handle_click(self,pos):
         if self.game_over: return
         if self.level_complete: return
-        for btn in self.buttons:
-            if btn.is_clicked(pos):
-                if len(self.bowl)<6:
-                    self.bowl.append(btn.ing["short"])
-                    btn.press()
-                    icon=ICONS.get(btn.ing["short"])
-                    if icon:
-                        self.drops.append(DropAnim(icon,
-                            (btn.rect.centerx,btn.rect.centery),
-                            (self.BOWL_CX,self.BOWL_CY)))
-                    self.emit(self.BOWL_CX,self.BOWL_CY,btn.ing["color"],5)
-                    sfx("pop")
-                return
-        # Serve
-        sv=self._serve_rect()
-        cl=self._clear_rect()
-        if sv.collidepoint(pos): self.try_serve()
-        elif cl.collidepoint(pos):
-            if self.bowl: self.bowl.pop(); sfx("click")
+        self.ui.click(pos)
+
+    def pointer(self,pos):
+        """Mouse moved: the only place hover state changes."""
+        self.ui.pointer(pos)
+
+    def _add_to_bowl(self,btn):
+        if len(self.bowl)>=6: return
+        self.bowl.append(btn.ing["short"])
+        self.matcher.push(btn.ing["short"])
+        btn.press()
+        icon=ICONS.get(btn.ing["short"])
+        if icon:
+            self.drops.append(DROPS.get(icon,
+                (btn.rect.centerx,btn.rect.centery),
+                (self.BOWL_CX,self.BOWL_CY)))
+        self.emit(self.BOWL_CX,self.BOWL_CY,btn.ing["color"],5)
+        sfx("pop")
+
+    def _undo(self):
+        if self.bowl: self.bowl.pop(); self.matcher.pop(); sfx("click")
 
     def _serve_rect(self):
         return pygame.Rect(self.BOWL_CX-95,self.BOWL_CY+88,190,46)
     def _clear_rect(self):
         return pygame.Rect(self.BOWL_CX-95-58,self.BOWL_CY+88,50,46)
 
+    def _update_scenery(self,dt):
+        if not self.cosmetic: return
+        self.aurora.update(dt); self.stars_bg.update(dt)
+        want=QUALITY["snow"]
+        if len(self.snows)>want: del self.snows[want:]
+        while len(self.snows)<want: self.snows.append(Snowflake(fresh=True))
+        for sn in self.snows: sn.update(dt)
+        self.crowd.update(dt)
+
     def update(self,dt):
         # Always update end screen if active
         if self.game_over:
             if self.end_screen is None:
-                self.end_screen = EndScreen(
-                    self.win, self.score, self.stars_earned, self.level)
+                es = self._spare_end; self._spare_end = None
+                if es is None: es = EndScreen(self.win, self.score, self.stars_earned, self.level)
+                else: es.setup(self.win, self.score, self.stars_earned, self.level)
+                self.end_screen = es
+                TELEMETRY.emit("game_over", score=self.score, level=self.level, win=self.win,
+                               stars=self.stars_earned)
+                GC.checkpoint()
             self.end_screen.update(dt)
             # Keep background alive too
-            self.aurora.update(dt); self.stars_bg.update(dt)
-            for sn in self.snows: sn.update(dt)
+            self._update_scenery(dt)
             return
 
         # Level complete transition screen
         if self.level_complete:
-            self.level_screen_t -= dt
-            self.aurora.update(dt); self.stars_bg.update(dt)
-            for sn in self.snows: sn.update(dt)
+            self._update_scenery(dt)
             self.penguin.update(dt)
             for p in self.particles: p.update(dt)
-            self.particles=[p for p in self.particles if p.life>0]
+            PARTICLES.reap(self.particles, _dead_life)
             for f in self.floats: f.update(dt)
-            self.floats=[f for f in self.floats if f.life>0]
-            if self.level_screen_t <= 0:
-                # Advance to next level
-                self.level += 1
-                self.penguin.outfit = self.level - 1
-                self.level_score_start = self.score
-                self.game_t = 0.0
-                self.GAME_DUR = self.LEVEL_CONFIG[self.level-1][0]
-                self.failed_count = 0
-                self.orders = []; self.bowl = []
-                self.next_order_t = 1.5
-                self.level_complete = False
-                for _ in range(2): self.spawn_order()
+            FLOATS.reap(self.floats, _dead_life)
+            self.ui_sched.advance(dt)            # → _next_level()
             return
 
         self.game_t+=dt
-        if self.game_t>=self.GAME_DUR:
+        if self.rush: self._rush_level()
+        elif self.game_t>=self.GAME_DUR:
             # Time ran out — check if score target was met
             _, score_target, _ = self.LEVEL_CONFIG[self.level-1]
             level_score = self.score - self.level_score_start
             if level_score < score_target:
                 self.game_over=True; self.win=False; self.penguin.react_sad()
             else:
-                if self.level < 5:
-                    self.level_complete = True
-                    self.level_screen_t = 3.5
+                if self.level < self.last_level:
+                    self._level_clear()
                     sfx("lvl"); self.penguin.react_happy()
                     self.add_float(f"LEVEL {self.level} CLEAR!", self.BOWL_CX, self.BOWL_CY-130, LIME, True)
                 else:
                     self.game_over=True; self.win=True; self.penguin.react_happy()
             return
 
-        self.aurora.update(dt); self.stars_bg.update(dt)
-        for sn in self.snows: sn.update(dt)
+        self._update_scenery(dt)
         self.penguin.update(dt)
 
-        # Handle expired orders
-        expired=[o for o in self.orders if o.failed and not o.done]
-        for o in expired:
-            self.orders.remove(o)
+        # Orders that expired last frame
+        for o in self._expired:
+            TELEMETRY.emit("order_expired", order=o.serial, recipe=o.recipe["name"],
+                           level=self.level, combo_lost=self.combo)
+            self.orders.remove(o); self.matcher.remove_order(o); CARDS.put(o)
+            self.crowd.leave(o.serial, happy=False)
             self.failed_count+=1; self.combo=0
             self.add_float("EXPIRED!",self.BOWL_CX,200,CORAL)
             self.penguin.react_sad()
-        if self.failed_count>=self.MAX_FAILS:
+        self._expired.clear()
+        if self.failed_count>=self.max_fails:
             self.game_over=True; self.win=False; return
 
-        for o in self.orders: o.update(dt)
-        # Remove cards that finished their done animation
-        self.orders=[o for o in self.orders
-                     if not(o.done and o.slide>=1.0 and o.done_t<=0)]
-
-        self.next_order_t-=dt
-        if self.next_order_t<=0 and len(self.orders)<self.MAX_ORDERS:
-            self.next_order_t=random.uniform(5,10)/self.speed()
-            self.spawn_order()
-
-        if self.combo_t>0: self.combo_t-=dt
-
-        mp=pygame.mouse.get_pos(); ul=self.unlocked()
-        for btn in self.buttons: btn.update(dt,mp,btn.ing["short"] in ul)
+        self.sched.advance(dt)               # expiries, exits, spawns, combo banner
+        if self.spawn_waiting and len(self.orders)<self.max_orders: self._spawn_due()
+        if self.rush: self._update_rail(dt)
 
-        self.particles=[p for p in self.particles if p.life>0]
+        PARTICLES.reap(self.particles, _dead_life)
         for p in self.particles: p.update(dt)
-        self.floats=[f for f in self.floats if f.life>0]
+        FLOATS.reap(self.floats, _dead_life)
         for f in self.floats: f.update(dt)
-        self.drops=[d for d in self.drops if not d.done]
+        DROPS.reap(self.drops, _drop_done)
         for d in self.drops: d.update(dt)
 
     # ── DRAW ─────────────────────────────────────────────────
     def draw(self):
         # 1. Static background (pre-built, one blit)
-        screen.blit(BG_SURF,(0,0))
+        screen.blit(bg_surf(),(0,0))
 
         # 2. Stars + aurora
         self.stars_bg.draw(screen)
@@ -1353,23 +3094,28 @@ class Game:
         # 3. Snowflakes (just circles now — super fast)
         for sn in self.snows: sn.draw(screen)
 
+        # 3b. Customer queue (behind all the UI)
+        self.crowd.draw(screen)
+
         # 4. Top bar
-        self._draw_topbar()
+        self.w_top.draw(screen)
 
         # 5. Orders
         self._draw_orders()
 
         # 6. Left panel
-        self._draw_left_panel()
+        self.w_left.draw(screen)
 
         # 7. Bowl
-        self._draw_bowl()
+        self.w_bowl.draw(screen)
+        for d in self.drops: d.draw(screen)
+        self.w_serve.draw(screen); self.w_clear.draw(screen)
 
         # 8. Penguin
         self.penguin.draw(screen)
 
         # 9. HUD
-        self._draw_hud()
+        self.w_hud.draw(screen)
 
         # 10. Particles & float texts
         for p in self.particles: p.draw(screen)
@@ -1384,43 +3130,59 @@ class Game:
             True,(62,100,160))
         screen.blit(ht,ht.get_rect(centerx=SW//2,centery=SH-12))
 
-        # 12. Game over overlay (last)
+        # 12. Bloom for everything above — before overlays dim the scene
+        BLOOM.flush(screen)
+
+        # 13. Game over overlay (last)
         if self.game_over: self._draw_gameover()
 
-        # 13. Level complete overlay
+        # 14. Level complete overlay
         if self.level_complete: self._draw_level_complete()
+        BLOOM.flush(screen)                 # overlay glows
 
-    def _draw_topbar(self):
-        draw_glass(screen,0,0,SW,self.TOP_BAR_H,r=0,alpha=195)
-        # shimmer line
-        for x in range(0,SW,3):
-            t=x/SW; c=lc(CYAN,PINK,t); a=int(170*math.sin(math.pi*t))
-            pygame.draw.line(screen,(*c,a),(x,self.TOP_BAR_H-1),(x,self.TOP_BAR_H))
+    # Widget painters: local coordinates, called only when the widget's key changes.
+    def _paint_title(self,s):
         tt=F_TITLE.render("Pingu’s Cozy Kitchen",True,WHITE)
-        screen.blit(tt,tt.get_rect(centerx=SW//2,centery=self.TOP_BAR_H//2))
+        s.blit(tt,tt.get_rect(centerx=SW//2,centery=self.TOP_BAR_H//2))
+
+    def _paint_shimmer(self,s):
+        # opaque — the screen never honoured the old per-line alpha anyway
+        s.blit(strip_surf([(*lc(CYAN,PINK,x/SW),255) if x%3==0 else (0,0,0,0)
+                           for x in range(SW)], SW, 2, horizontal=True), (0,0))
 
-    def _draw_left_panel(self):
-        ph=len(INGREDIENTS)*52+60
-        draw_glass(screen,self.LEFT_X,self.TOP_BAR_H+4,
-                   self.LEFT_W,ph,r=16,alpha=178,border=CYAN,glow=CYAN)
+    def _paint_left_panel(self,s):
+        pw,ph=s.get_size()
         lbl=F_SM.render("INGREDIENTS",True,CYAN)
-        screen.blit(lbl,lbl.get_rect(centerx=self.LEFT_X+self.LEFT_W//2,
-                                      top=self.TOP_BAR_H+8))
+        s.blit(lbl,lbl.get_rect(centerx=pw//2,top=4))
         ul_lbl=F_XS.render(f"Level {self.level}  —  unlock more!",True,(72,120,175))
-        screen.blit(ul_lbl,ul_lbl.get_rect(centerx=self.LEFT_X+self.LEFT_W//2,
-                                             top=self.TOP_BAR_H+26))
-        for btn in self.buttons: btn.draw(screen)
+        s.blit(ul_lbl,ul_lbl.get_rect(centerx=pw//2,top=22))
+
+    def _rail_area(self):
+        """(left, width) of the strip between the left panel and the HUD."""
+        hud_left = SW - self.HUD_W - self.HUD_MARG
+        area_left = self.LEFT_X + self.LEFT_W + 8
+        return area_left, hud_left - area_left - 8
+
+    def scroll_rail(self, cards):
+        """Scroll the rush rail by a number of cards (mouse wheel, ←/→)."""
+        self.rail_to += cards*(OrderCard.W+self.RAIL_GAP)
+
+    def _update_rail(self, dt):
+        span=len(self.orders)*(OrderCard.W+self.RAIL_GAP)-self.RAIL_GAP-self._rail_area()[1]
+        self.rail_to=clamp(self.rail_to,0,max(0,span))
+        self.rail_x+=(self.rail_to-self.rail_x)*min(1.0,dt*12)
 
     def _draw_orders(self):
-        lbl=F_SM.render("INCOMING ORDERS",True,GOLD)
+        title="INCOMING ORDERS"
+        if self.rush: title+=f"  ·  {len(self.orders)} open"
+        lbl=F_SM.render(title,True,GOLD)
         screen.blit(lbl,lbl.get_rect(x=self.LEFT_X+self.LEFT_W+10,y=self.TOP_BAR_H+4))
+        if self.rush: self._draw_rail(); return
 
         active=self.orders[:self.MAX_ORDERS]
         if not active: return
         # Dynamic spacing: fill gap between left panel and HUD panel
-        hud_left = SW - self.HUD_W - self.HUD_MARG
-        area_left = self.LEFT_X + self.LEFT_W + 8
-        area_w    = hud_left - area_left - 8
+        area_left, area_w = self._rail_area()
         cw        = OrderCard.W
         n         = len(active)
         total_cw  = n * cw
@@ -1429,105 +3191,137 @@ class Game:
             ox = area_left + gap + i*(cw+gap)
             o.draw(screen, ox, self.ORDER_Y+18)
 
-    def _draw_bowl(self):
-        bcx,bcy=self.BOWL_CX,self.BOWL_CY
-        bw,bh=self.BOWL_W,self.BOWL_H
-        bc=TEAL if self.bowl else (28,58,98)
-        # Glow
-        gs=pygame.Surface((bw+30,bh+30),pygame.SRCALPHA)
-        pygame.draw.ellipse(gs,(*bc,28),(0,0,bw+30,bh+30))
-        screen.blit(gs,(bcx-bw//2-15,bcy-bh//2-15))
-        draw_glass(screen,bcx-bw//2,bcy-bh//2,bw,bh,r=28,alpha=210,border=bc)
+    def _draw_rail(self):
+        """Rush rail: cards sit at fixed pitch along a strip that may be far
+        wider than the screen; only those overlapping the viewport are drawn."""
+        left,w=self._rail_area(); pitch=OrderCard.W+self.RAIL_GAP
+        n=len(self.orders); x0=int(self.rail_x); y=self.ORDER_Y+18
+        first=max(0,x0//pitch); last=min(n,(x0+w)//pitch+1)
+        clip=screen.get_clip()
+        screen.set_clip(pygame.Rect(left,0,w,y+OrderCard.H+4))
+        for i in range(first,last):
+            self.orders[i].draw(screen,left+i*pitch-x0,y)
+        screen.set_clip(clip)
+        span=n*pitch-self.RAIL_GAP
+        if span>w:                                   # scrollbar
+            by=y+OrderCard.H+8; tw=max(24,w*w//span)
+            tx=left+int((w-tw)*min(1.0,x0/(span-w)))
+            gfx.rect(screen,(14,22,52),(left,by,w,5),border_radius=3)
+            gfx.rect(screen,GOLD,(tx,by,tw,5),border_radius=3)
+
+    def _bowl_slots(self):
+        """(ingredient, x, y) of each bowl item, in screen coordinates."""
+        n=len(self.bowl)
+        if not n: return []
+        sp=min((self.BOWL_W-24)//n,50); sx=self.BOWL_CX-sp*(n-1)//2
+        return [(IMAP[short],sx+i*sp,self.BOWL_CY+10) for i,short in enumerate(self.bowl)]
+
+    def _bowl_color(self): return TEAL if self.bowl else (28,58,98)
+
+    def _bowl_bloom(self):
+        bc=self._bowl_color()
+        BLOOM.rect(bc,*self.w_bowl.rect,strength=0.2)            # halo
+        for ing,ix,iy in self._bowl_slots(): BLOOM.dot(ing["color"],ix,iy,22)
+
+    def _paint_bowl(self,s):
+        bw,bh=s.get_size(); ox,oy=self.w_bowl.rect.topleft
+        bc=self._bowl_color()
         bl=F_SM.render("YOUR MIXING BOWL",True,bc)
-        screen.blit(bl,bl.get_rect(centerx=bcx,top=bcy-bh//2+8))
+        s.blit(bl,bl.get_rect(centerx=bw//2,top=8))
 
         if not self.bowl:
             ph=F_XS.render("← click ingredients",True,(45,75,125))
-            screen.blit(ph,ph.get_rect(center=(bcx,bcy+10)))
+            s.blit(ph,ph.get_rect(center=(self.BOWL_CX-ox,self.BOWL_CY+10-oy)))
+        for ing,ix,iy in self._bowl_slots():
+            ix-=ox; iy-=oy
+            pygame.draw.circle(s,ing["color"],(ix,iy),18)
+            icon=ICONS.get(ing["short"])
+            if icon: s.blit(icon,icon.get_rect(center=(ix,iy)))
+            nm=F_XS.render(ing["name"],True,lc(ing["color"],WHITE,0.65))
+            s.blit(nm,nm.get_rect(centerx=ix,top=iy+20))
+
+    def _hud_state(self):
+        """Everything the HUD shows, quantised to what changes its pixels."""
+        if self.rush:
+            into = self.game_t % self.RUSH_LEVEL_T; top = self.level >= self.last_level
+            ratio_score = 1.0 if top else into/self.RUSH_LEVEL_T
+            goal = "Top level" if top else f"Next level in {int(self.RUSH_LEVEL_T-into)+1}s"
+            ratio=max(0.0,1-self.failed_count/self.RUSH_FAILS); t=int(self.game_t)
+            clock_txt=f"{t//60}:{t%60:02d}"
         else:
-            n=len(self.bowl); sp=min((bw-24)//n,50)
-            sx=bcx-sp*(n-1)//2
-            for i,short in enumerate(self.bowl):
-                ing=IMAP[short]; ix=sx+i*sp; iy=bcy+10
-                glow_dot(screen,ing["color"],ix,iy,18)
-                icon=ICONS.get(short)
-                if icon: screen.blit(icon,icon.get_rect(center=(ix,iy)))
-                nm=F_XS.render(ing["name"],True,lc(ing["color"],WHITE,0.65))
-                screen.blit(nm,nm.get_rect(centerx=ix,top=iy+20))
+            _, score_target, _ = self.LEVEL_CONFIG[self.level-1]
+            level_score = self.score - self.level_score_start
+            ratio_score = min(1.0, level_score / max(1, score_target))
+            goal = f"Lvl goal  {level_score}/{score_target}"
+            remaining=max(0,self.GAME_DUR-self.game_t); ratio=remaining/self.GAME_DUR
+            clock_txt=f"{int(remaining)}s"
+        pw=tw=self.HUD_W-20
+        prog=(int(pw*ratio_score), self.PROG_RAMP(ratio_score)) if ratio_score>0 else None
+        fill=int(tw*ratio)
+        bar=(fill, self.CLOCK_RAMP(ratio)) if fill>0 else None
+        combo=self.combo if self.combo>=2 and self.show_combo else 0
+        return (self.score, self.stars_earned, self.level, self.failed_count, combo,
+                goal, prog, clock_txt, bar)
 
-        for d in self.drops: d.draw(screen)
 
-        # Buttons
-        sv=self._serve_rect(); cl=self._clear_rect()
-        mp=pygame.mouse.get_pos()
-        draw_btn(screen,sv.x,sv.y,sv.w,sv.h,LIME,"SERVE ▲",F_MD,
-                 active=bool(self.bowl),hover=sv.collidepoint(mp))
-        draw_btn(screen,cl.x,cl.y,cl.w,cl.h,CORAL,"✕",F_MD,
-                 active=bool(self.bowl),hover=cl.collidepoint(mp))
-
-    def _draw_hud(self):
-        # Anchored to right edge
-        hx = SW - self.HUD_W - self.HUD_MARG
-        hy = self.TOP_BAR_H + 4
-        hw,hh = self.HUD_W, self.HUD_H
-        draw_glass(screen,hx,hy,hw,hh,r=16,alpha=188,border=PURP,glow=PURP)
+    def _paint_hud(self,s):
+        hw,hh = s.get_size()
+        score,stars,level,fails,combo,goal,prog,clock_txt,bar = self.w_hud._key
 
         # Score
-        sc=F_LG.render(f"{self.score:,}",True,GOLD)
-        screen.blit(sc,sc.get_rect(centerx=hx+hw//2,top=hy+8))
+        sc=F_LG.render(f"{score:,}",True,GOLD)
+        s.blit(sc,sc.get_rect(centerx=hw//2,top=8))
         sl=F_XS.render("SCORE",True,GOLD)
-        screen.blit(sl,sl.get_rect(centerx=hx+hw//2,top=hy+40))
+        s.blit(sl,sl.get_rect(centerx=hw//2,top=40))
 
         # Divider
         dv=pygame.Surface((hw-28,1),pygame.SRCALPHA)
-        dv.fill((*PURP,85)); screen.blit(dv,(hx+14,hy+55))
+        dv.fill((*PURP,85)); s.blit(dv,(14,55))
 
         # Stars
-        stt=F_XS.render(f"Stars  {self.stars_earned}",True,GOLD)
-        screen.blit(stt,(hx+12,hy+62))
+        stt=F_XS.render(f"Stars  {stars}",True,GOLD)
+        s.blit(stt,(12,62))
 
         # Level badge
-        lc2=[CYAN,LIME,GOLD,PINK,PURP][self.level-1]
+        lc2=[CYAN,LIME,GOLD,PINK,PURP][(level-1)%5]
         lb=pygame.Surface((68,22),pygame.SRCALPHA)
         pygame.draw.rect(lb,(*lc2,188),(0,0,68,22),border_radius=8)
-        screen.blit(lb,(hx+hw-80,hy+60))
-        lt=F_XS.render(f"LV {self.level}",True,(10,10,30))
-        screen.blit(lt,lt.get_rect(center=(hx+hw-46,hy+71)))
+        s.blit(lb,(hw-80,60))
+        lt=F_XS.render(f"LV {level}",True,(10,10,30))
+        s.blit(lt,lt.get_rect(center=(hw-46,71)))
 
         # Fails
-        fc=RED if self.failed_count>=3 else OFFWH
-        ft=F_XS.render(f"Fails  {'■'*self.failed_count}{'□'*(self.MAX_FAILS-self.failed_count)}",True,fc)
-        screen.blit(ft,(hx+12,hy+88))
+        if self.rush:
+            fc=RED if fails>=self.RUSH_FAILS*0.6 else OFFWH
+            ft=F_XS.render(f"Fails  {fails}/{self.RUSH_FAILS}",True,fc)
+        else:
+            fc=RED if fails>=3 else OFFWH
+            ft=F_XS.render(f"Fails  {'■'*fails}{'□'*(self.MAX_FAILS-fails)}",True,fc)
+        s.blit(ft,(12,88))
 
         # Combo
-        if self.combo>=2 and self.combo_t>0:
-            cc=[GOLD,PINK,CYAN,LIME][self.combo%4]
-            ct=F_SM.render(f" x{self.combo} COMBO!",True,cc)
-            screen.blit(ct,ct.get_rect(centerx=hx+hw//2,top=hy+112))
-
-        # Level score progress bar
-        _, score_target, _ = self.LEVEL_CONFIG[self.level-1]
-        level_score = self.score - self.level_score_start
-        ratio_score = min(1.0, level_score / max(1, score_target))
-        pw, ph2 = hw-20, 12; px, py2 = hx+10, hy+136
-        pygame.draw.rect(screen,(14,22,52),(px,py2,pw,ph2),border_radius=6)
-        if ratio_score>0:
-            col_prog = lc(CORAL, LIME, ratio_score)
-            pygame.draw.rect(screen, col_prog, (px, py2, int(pw*ratio_score), ph2), border_radius=6)
-        pygame.draw.rect(screen,(*lc2,100),(px,py2,pw,ph2),1,border_radius=6)
-        pg_lbl = F_XS.render(f"Lvl goal  {level_score}/{score_target}", True, lc(lc2,WHITE,0.5))
-        screen.blit(pg_lbl, pg_lbl.get_rect(centerx=hx+hw//2, top=py2+14))
-
-        # Timer bar (fast — single rect)
-        remaining=max(0,self.GAME_DUR-self.game_t); ratio=remaining/self.GAME_DUR
-        tw,th=hw-20,16; tx,ty=hx+10,hy+hh-28
-        pygame.draw.rect(screen,(14,22,52),(tx,ty,tw,th),border_radius=8)
-        fill=int(tw*ratio)
-        if fill>0:
-            pygame.draw.rect(screen,lc(RED,LIME,ratio),(tx,ty,fill,th),border_radius=8)
-        pygame.draw.rect(screen,(*PURP,100),(tx,ty,tw,th),1,border_radius=8)
-        tl=F_XS.render(f"{int(remaining)}s",True,WHITE)
-        screen.blit(tl,tl.get_rect(centerx=tx+tw//2,centery=ty+th//2))
+        if combo:
+            cc=[GOLD,PINK,CYAN,LIME][combo%4]
+            ct=F_SM.render(f" x{combo} COMBO!",True,cc)
+            s.blit(ct,ct.get_rect(centerx=hw//2,top=112))
+
+        # Level progress bar (rush: time to the next level)
+        pw, ph2 = hw-20, 12; px, py2 = 10, 136
+        pygame.draw.rect(s,(14,22,52),(px,py2,pw,ph2),border_radius=6)
+        if prog:
+            pygame.draw.rect(s, prog[1], (px, py2, prog[0], ph2), border_radius=6)
+        pygame.draw.rect(s,lc2,(px,py2,pw,ph2),1,border_radius=6)
+        pg_lbl = F_XS.render(goal, True, lc(lc2,WHITE,0.5))
+        s.blit(pg_lbl, pg_lbl.get_rect(centerx=hw//2, top=py2+14))
+
+        # Timer bar (rush: fails left, elapsed time)
+        tw,th=hw-20,16; tx,ty=10,hh-28
+        pygame.draw.rect(s,(14,22,52),(tx,ty,tw,th),border_radius=8)
+        if bar:
+            pygame.draw.rect(s,bar[1],(tx,ty,bar[0],th),border_radius=8)
+        pygame.draw.rect(s,PURP,(tx,ty,tw,th),1,border_radius=8)
+        tl=F_XS.render(clock_txt,True,WHITE)
+        s.blit(tl,tl.get_rect(centerx=tx+tw//2,centery=ty+th//2))
 
     def _draw_gameover(self):
         if self.end_screen:
@@ -1535,15 +3329,13 @@ class Game:
 
     def _draw_level_complete(self):
         """Animated between-level interstitial."""
-        t = max(0, 3.5 - self.level_screen_t)
+        t = max(0, self.LEVEL_SCREEN - self.level_screen_t)
         ease = min(1.0, t * 3.0)
         _, _, label = self.LEVEL_CONFIG[self.level-1]
-        next_lv = self.level + 1 if self.level < 5 else 5
+        next_lv = min(self.level + 1, self.last_level)
 
         # Dim overlay
-        ov = pygame.Surface((SW, SH), pygame.SRCALPHA)
-        ov.fill((3, 8, 28, int(ease * 210)))
-        screen.blit(ov, (0, 0))
+        screen.blit(veil((3, 8, 28), int(ease * 210)), (0, 0))
 
         # Card
         cw, ch = 640, 320
@@ -1551,7 +3343,7 @@ class Game:
         _draw_gradient_rect(screen, (cx, cy, cw, ch), (18,55,22), (8,28,12), radius=28)
         border_s = pygame.Surface((cw,ch),pygame.SRCALPHA)
         pulse = 0.5+0.5*abs(math.sin(t*3))
-        bc = lc(LIME, CYAN, pulse)
+        bc = ramp(LIME, CYAN)(pulse)
         pygame.draw.rect(border_s,(*bc,200),(0,0,cw,ch),3,border_radius=28)
         screen.blit(border_s,(cx,cy))
 
@@ -1567,43 +3359,1446 @@ class Game:
         screen.blit(sc_s, sc_s.get_rect(centerx=SW//2, top=cy+188))
 
         # Next level hint
-        if next_lv <= 5:
+        if next_lv > self.level:
             _, nt, nl = self.LEVEL_CONFIG[next_lv-1]
             nl_s = F_SM.render(f"▶  Next: Level {next_lv} — {nl}  (target: {nt} pts)", True, CYAN)
             screen.blit(nl_s, nl_s.get_rect(centerx=SW//2, top=cy+228))
 
         # Countdown bar
-        ratio = max(0, self.level_screen_t / 3.5)
+        ratio = max(0, self.level_screen_t / self.LEVEL_SCREEN)
         bw=400; bh=10; bx=SW//2-bw//2; by=cy+ch-28
-        pygame.draw.rect(screen,(14,35,18),(bx,by,bw,bh),border_radius=5)
+        gfx.rect(screen,(14,35,18),(bx,by,bw,bh),border_radius=5)
         if ratio>0:
-            pygame.draw.rect(screen,LIME,(bx,by,int(bw*ratio),bh),border_radius=5)
-        pygame.draw.rect(screen,(*LIME,80),(bx,by,bw,bh),1,border_radius=5)
+            gfx.rect(screen,LIME,(bx,by,int(bw*ratio),bh),border_radius=5)
+        gfx.rect(screen,(*LIME,80),(bx,by,bw,bh),1,border_radius=5)
+
+def bench_rush(counts=(4, 16, 64, 256, 1024), frames=120):
+    """Time rush-mode update and draw against the number of open orders.
+    Expiry only looks at the heap top and the rail only draws what is on
+    screen, so both columns should stay flat."""
+    init(headless=True); mute_audio(); seed_rng(1)
+    print(f"{'orders':>7} {'update ms':>10} {'draw ms':>8}")
+    for n in counts:
+        g = Game(rush=True); g.RUSH_MAX = n; g.RUSH_TIME = 1e6
+        while len(g.orders) < n: g.spawn_order()
+        g.spawn_timer.cancel(); g.scroll_rail(n//2)
+        up = dr = 0.0
+        for _ in range(frames):
+            t0 = time.perf_counter(); g.update(1/60)
+            t1 = time.perf_counter(); JOBS.drain(); g.draw()
+            up += t1-t0; dr += time.perf_counter()-t1
+        print(f"{n:>7} {up/frames*1e3:>10.3f} {dr/frames*1e3:>8.2f}")
+
+def bench_crowd(counts=(10, 50, 100, 200), frames=240):
+    """Time Crowd update and draw against queue length, with the share of
+    customers at each level of detail."""
+    init(headless=True); mute_audio(); seed_rng(1)
+    print(f"{'queue':>6} {'update ms':>10} {'draw ms':>8}   full / sprite / silhouette")
+    for n in counts:
+        cr = Crowd()
+        for i in range(n): cr.join(i)
+        for _ in range(120): cr.update(1/60); cr.draw(screen)       # walk in, warm caches
+        up = dr = 0.0
+        for _ in range(frames):
+            t0 = time.perf_counter(); cr.update(1/60)
+            t1 = time.perf_counter(); cr.draw(screen)
+            up += t1-t0; dr += time.perf_counter()-t1
+        st = cr.stats
+        print(f"{n:>6} {up/frames*1e3:>10.3f} {dr/frames*1e3:>8.2f}   "
+              f"{st['full']} / {st['sprite']} / {st['silhouette']}")
+
+def bench_render(frames=600):
+    """Serial loop vs RenderThread on the same seeded bot game.  Throughput is
+    unpaced frames per second; latency runs from the start of a frame's
+    update to that frame being flipped."""
+    init(headless=True); mute_audio()
+    print(f"{os.cpu_count()} CPU(s), {frames} frames")
+    print(f"{'loop':>8} {'fps':>7} {'lat ms':>7} {'p95 ms':>7}")
+    for threaded in (False, True):
+        seed_rng(1); g = Game(); bot = Bot(rng=random.Random(1)); lat = []
+        rt = RenderThread(screen) if threaded else None
+        t_start = time.perf_counter()
+        for _ in range(frames):
+            t0 = time.perf_counter()
+            bot.update(g, 1/60); g.update(1/60); JOBS.drain()
+            if rt:
+                rt.submit(record_frame(g.draw), after=lambda t, t0=t0: lat.append(t-t0))
+            else:
+                g.draw(); pygame.display.flip(); lat.append(time.perf_counter()-t0)
+        if rt: rt.close()
+        wall = time.perf_counter()-t_start; lat.sort()
+        print(f"{'thread' if threaded else 'serial':>8} {frames/wall:>7.1f} "
+              f"{sum(lat)/len(lat)*1e3:>7.2f} {lat[int(len(lat)*0.95)]*1e3:>7.2f}")
+
+# ══════════════════════════════════════════════════════════════
+#  MICROBENCHMARKS  (primitives, JSON history keyed by git commit)
+# ══════════════════════════════════════════════════════════════
+BENCH_HISTORY = os.path.join(BASE_DIR, "bench_history.json")
+
+def micro_cases():
+    """name → zero-argument callable for every timed primitive; needs
+    init(headless=True).  Glow variants include the BLOOM flush, which is
+    a cache hit after the first call — the steady state of a static glow."""
+    content()
+    s = pygame.Surface((SW, SH)); s.fill((10, 16, 40))
+    def with_flush(fn):
+        def run(): fn(); BLOOM.flush(s)
+        return run
+    cases = {
+        "draw_glass":          lambda: draw_glass(s, 100, 100, 240, 160, border=CYAN),
+        "draw_glass+glow":     with_flush(lambda: draw_glass(s, 100, 100, 240, 160, border=CYAN, glow=CYAN)),
+        "glow_dot":            with_flush(lambda: glow_dot(s, GOLD, 400, 300, 12)),
+    }
+    for ratio in (0.0, 0.25, 0.5, 1.0):
+        cases[f"draw_ring@{ratio}"] = lambda ratio=ratio: draw_ring(s, 500, 300, 22, ratio, LIME)
+    cases["_draw_gradient_rect"] = lambda: _draw_gradient_rect(s, (280, 140, 720, 420), (18,38,88), (10,22,58), 32)
+    def build():
+        _GRADIENTS.pop((720, 420, (18,38,88), (10,22,58), 32, 225, False), None)
+        gradient_surf(720, 420, (18,38,88), (10,22,58), 32, 225)
+    cases["gradient_surf:build"] = build
+    cases["lc"]   = lambda: lc(RED, GREEN, 0.37)
+    cases["Ramp"] = lambda r=Ramp(RED, GREEN): r(0.37)
+    cases["_draw_outlined_text"] = lambda: _draw_outlined_text(s, F_HERO, "GAME OVER", RED, (30,5,5), 640, 200, 4)
+    for ing in INGREDIENTS:
+        cases[f"_make_icon:{ing['short']}"] = lambda sh=ing["short"]: _make_icon(sh, ICONS.size)
+    cases["_sine_buf"]  = lambda: _sine_buf(*SFX_SPECS["wrong"][1])
+    cases["_chord_buf"] = lambda: _chord_buf(*SFX_SPECS["lvl"][1])
+    cases["_bgm_buf"]   = _bgm_buf
+    peng = Penguin(SW//2, SH//2)
+    cases["Penguin.draw"] = lambda: peng.draw(s)
+    card = OrderCard(RECIPES[0], clock=Scheduler()); card.clock.t = card.total/2
+    cases["OrderCard.draw"] = lambda: card.draw(s, 300, 60)
+    return cases
+
+def _time_case(fn, warmup=0.05, repeat=15, min_time=0.01, max_time=1.0):
+    """Per-call µs for `repeat` samples, each timing enough back-to-back calls
+    to fill min_time.  Warms up for `warmup` s (at least one call), and
+    trims `repeat` (down to 3) to stay near max_time per case."""
+    end = time.perf_counter() + warmup
+    while True:
+        t0 = time.perf_counter(); fn(); one = time.perf_counter() - t0
+        BLOOM.shapes.clear()
+        if t0 + one >= end: break
+    loops = max(1, int(min_time/max(one, 1e-7)))
+    repeat = max(3, min(repeat, int(max_time/max(one*loops, 1e-9))))
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops): fn()
+        samples.append((time.perf_counter()-t0)/loops*1e6)
+        BLOOM.shapes.clear()
+    return samples, loops
+
+def _summarize(samples, loops):
+    med = statistics.median(samples)
+    return {"median": med, "mad": statistics.median(abs(x-med) for x in samples),
+            "min": min(samples), "mean": statistics.fmean(samples),
+            "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "loops": loops, "repeat": len(samples)}
+
+def _git_commit():
+    """Short HEAD hash, with +dirty when tracked files have changed."""
+    import subprocess
+    def git(*a):
+        return subprocess.run(["git", "-C", BASE_DIR, *a], capture_output=True,
+                              text=True, timeout=30).stdout.strip()
+    try:
+        head = git("rev-parse", "--short", "HEAD")
+        dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return (head or "unknown") + ("+dirty" if dirty else "")
+
+def _load_history(path):
+    try:
+        with open(path) as f: return json.load(f)
+    except (OSError, ValueError):
+        return {"version": 1, "runs": {}}
+
+def _fmt_us(us):
+    return f"{us/1000:.2f} ms" if us >= 1000 else f"{us:.1f} µs"
+
+def microbench(names=None, path=BENCH_HISTORY, noise=0.10):
+    """Time every primitive (or those whose name starts with one of `names`),
+    print median ± MAD, and store the results in the history under the
+    current commit, replacing what an earlier run of that commit measured.
+    Then compares with the previous commit in the history; returns False if
+    anything got slower."""
+    init(headless=True); mute_audio(); set_quality(0)
+    cases = micro_cases()
+    if names: cases = {k: fn for k, fn in cases.items() if k.startswith(tuple(names))}
+    commit = _git_commit()
+    print(f"⏱  Microbenchmarks @ {commit} — median ± MAD per call")
+    results = {}
+    was = gc.isenabled(); gc.disable()
+    try:
+        for name, fn in cases.items():
+            r = results[name] = _summarize(*_time_case(fn))
+            print(f"   {name:<22} {_fmt_us(r['median']):>10} ± {r['mad']/r['median']*100:4.1f}%  "
+                  f"({r['repeat']}×{r['loops']})")
+    finally:
+        if was: gc.enable()
+    hist = _load_history(path); runs = hist["runs"]
+    old = runs.pop(commit, None)                    # re-appended: runs stay in time order
+    if names and old: results = {**old["cases"], **results}
+    runs[commit] = {"when": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+                    "pygame": pygame.version.ver, "cases": results}
+    with open(path, "w") as f: json.dump(hist, f, indent=1)
+    print(f"   saved → {path}")
+    base = [c for c in runs if c.split("+")[0] != commit.split("+")[0]]
+    return microbench_compare(base[-1], commit, path, noise) if base else True
+
+def microbench_compare(base=None, head=None, path=BENCH_HISTORY, noise=0.10):
+    """Compare two runs of the history (default: the last two).  A case is
+    flagged when its median moved by more than `noise` (a fraction) and by
+    more than three times the two runs' combined MAD.  Commits may be given
+    as prefixes.  Returns False if any case got slower."""
+    runs = _load_history(path)["runs"]
+    def find(c, default):
+        if c is None: return default
+        hits = [k for k in runs if k.startswith(c)]
+        if len(hits) != 1:
+            raise ValueError(f"{'no' if not hits else 'ambiguous'} run matching {c!r} in {path}")
+        return hits[0]
+    keys = list(runs)
+    head = find(head, keys[-1] if keys else None)
+    base = find(base, keys[-2] if len(keys) > 1 else None)
+    if base is None or head is None:
+        print(f"⚠ Need two runs in {path} to compare"); return True
+    a, b = runs[base]["cases"], runs[head]["cases"]
+    print(f"⚖  {base} → {head} (flagging changes over {noise*100:.0f}% and 3× MAD)")
+    slower = faster = 0
+    for name in b:
+        if name not in a: continue
+        x, y = a[name], b[name]
+        d = y["median"]/x["median"] - 1
+        band = max(noise, 3*(x["mad"]/x["median"] + y["mad"]/y["median"]))
+        mark = ""
+        if d > band: slower += 1; mark = "⚠ slower"
+        elif -d > band: faster += 1; mark = "✔ faster"
+        print(f"   {name:<22} {_fmt_us(x['median']):>10} → {_fmt_us(y['median']):>10}  {d*100:+6.1f}%  {mark}")
+    print(f"{'✘' if slower else '✔'} {slower} slower, {faster} faster, "
+          f"{len(b) - slower - faster} within noise")
+    return not slower
+
+# ══════════════════════════════════════════════════════════════
+#  INPUT RECORDING / REPLAY
+# ══════════════════════════════════════════════════════════════
+# A recording is the RNG seed plus every input main() handles, as a
+# stream of varints.  Each record is  kind | value<<2 :
+#   TICK    value = clock.tick() ms for one frame (frame index is implicit)
+#   CLICK   followed by x, y
+#   RESTART (K_r)
+#   END     followed by final score, level — used to verify a replay
+# From version 3 the seed is followed by a varint of mode flags.
+REC_MAGIC   = b"PKREC"
+REC_VERSION = 4          # 2: effects use their own RNG stream (see seed_rng)
+                         # 3: mode flags after the seed
+                         # 4: timers fire at their exact due time (Scheduler)
+REC_RUSH    = 1          # mode flag: rush hour
+REC_TICK, REC_CLICK, REC_RESTART, REC_END = range(4)
+
+def _put_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80); n >>= 7
+    buf.append(n)
+
+def _get_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]; pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80: return n, pos
+        shift += 7
+
+def frame_dt(ms):
+    """clock.tick() ms → simulation dt (capped — prevents spiral of death)."""
+    return min(ms/1000.0, 0.05)
+
+class InputRecorder:
+    """Appends inputs to an in-memory varint stream; written once on save()."""
+    def __init__(self, path, seed, rush=False):
+        self.path = path; self.seed = seed; self.frames = 0
+        self.buf = bytearray(REC_MAGIC); self.buf.append(REC_VERSION)
+        _put_varint(self.buf, seed); _put_varint(self.buf, REC_RUSH if rush else 0)
+    def tick(self, ms):
+        self.frames += 1
+        _put_varint(self.buf, REC_TICK | max(0, int(ms)) << 2)
+    def click(self, pos):
+        _put_varint(self.buf, REC_CLICK)
+        _put_varint(self.buf, max(0, int(pos[0]))); _put_varint(self.buf, max(0, int(pos[1])))
+    def restart(self):
+        _put_varint(self.buf, REC_RESTART)
+    def save(self, game):
+        _put_varint(self.buf, REC_END)
+        _put_varint(self.buf, game.score); _put_varint(self.buf, game.level)
+        with open(self.path, "wb") as f: f.write(self.buf)
+        print(f"⏺ Recorded {self.frames} frames ({len(self.buf):,} bytes) → {self.path}")
+
+class Recording:
+    """A parsed recording: seed, mode, per-frame (ms, events) and the expected end state."""
+    def __init__(self, path):
+        with open(path, "rb") as f: data = f.read()
+        if not data.startswith(REC_MAGIC):
+            raise ValueError(f"{path}: not a Pingu recording")
+        self.version = data[len(REC_MAGIC)]
+        if not 1 <= self.version <= REC_VERSION:
+            raise ValueError(f"{path}: recording version {self.version}, expected ≤{REC_VERSION}")
+        self.seed, pos = _get_varint(data, len(REC_MAGIC)+1)
+        flags = 0
+        if self.version >= 3: flags, pos = _get_varint(data, pos)
+        self.rush = bool(flags & REC_RUSH)
+        self.frames = []; self.end = None
+        events = None
+        while pos < len(data):
+            rec, pos = _get_varint(data, pos)
+            kind, val = rec & 3, rec >> 2
+            if kind == REC_TICK:
+                events = []; self.frames.append((val, events))
+            elif kind == REC_CLICK:
+                x, pos = _get_varint(data, pos); y, pos = _get_varint(data, pos)
+                events.append(("click", (x, y)))
+            elif kind == REC_RESTART:
+                events.append(("restart", None))
+            else:
+                score, pos = _get_varint(data, pos); level, pos = _get_varint(data, pos)
+                self.end = (score, level)
+
+def replay(path, speed=1.0, headless=False, on_frame=None):
+    """Feed a recording back through Game.  speed=N paces at N× real time;
+    speed=0 draws every frame without pacing; headless skips drawing and
+    pacing entirely; on_frame(game, dt) runs after every frame.  Returns True if the final score and level match the
+    recording."""
+    rec = Recording(path)
+    if headless: mute_audio()
+    else: init()
+    seed_rng(rec.seed, legacy=rec.version < 2)
+    if rec.version < 2: set_quality(0)     # v1 effects drew from the gameplay RNG
+    was_exact = Scheduler.exact
+    Scheduler.exact = rec.version >= 4     # older: timers saw the end of the frame
+    try:
+        game = Game(rush=rec.rush)
+        t0 = time.perf_counter(); due = t0
+        last = len(rec.frames) - 1
+        for i, (ms, events) in enumerate(rec.frames):
+            if not headless:
+                pygame.event.pump()
+                if speed > 0:
+                    due += ms/1000.0/speed
+                    wait = due - time.perf_counter()
+                    if wait > 0: time.sleep(wait)
+            for kind, arg in events:
+                if kind == "click": game.handle_click(arg)
+                else: game.reset()
+            if i == last and rec.end is not None:
+                break                 # main() quits before updating its final frame
+            dt = frame_dt(ms)
+            game.update(dt)
+            if not headless:
+                JOBS.drain(); game.draw(); pygame.display.flip()
+            if on_frame: on_frame(game, dt)
+    finally:
+        Scheduler.exact = was_exact
+    took = time.perf_counter() - t0
+    got = (game.score, game.level)
+    ok = rec.end is None or got == rec.end
+    sim = sum(ms for ms, _ in rec.frames)/1000.0
+    print(f"⏵ Replayed {len(rec.frames)} frames ({sim:.1f}s of play) in {took:.2f}s")
+    if rec.end is None:
+        print(f"⚠ Recording has no end marker — final score {got[0]}, level {got[1]}")
+    elif ok:
+        print(f"✔ Replay matches: score {got[0]}, level {got[1]}")
+    else:
+        print(f"✘ Replay diverged: score {got[0]}, level {got[1]} "
+              f"(recorded score {rec.end[0]}, level {rec.end[1]})")
+    return ok
+
+_IMPORT_PROBE = r"""
+import json, os, sys, time
+import pygame
+sys.path.insert(0, sys.argv[1])
+t0 = time.perf_counter()
+import pinguKictchen
+ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({"ms": ms, "display": pygame.display.get_init(),
+                  "surface": pygame.display.get_surface() is not None,
+                  "mixer": bool(pygame.mixer.get_init()),
+                  "sounds": len(pinguKictchen.SFX), "icons": len(pinguKictchen.ICONS),
+                  "cache": os.path.exists(os.environ["PINGU_CACHE_DIR"])}))
+"""
+
+def check_import(budget_ms=150.0):
+    """Import the module in a fresh interpreter and check it stayed inert:
+    no display, no mixer, nothing synthesized, no pack cache written (the
+    probe points $PINGU_CACHE_DIR at a path that must not appear), and
+    under budget_ms.  pygame itself is imported first so only our own cost
+    is timed."""
+    import subprocess, json, tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "PINGU_CACHE_DIR": os.path.join(tmp, "cache")}
+        out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE, BASE_DIR], env=env,
+                             capture_output=True, text=True, check=True).stdout
+    r = json.loads(out.strip().splitlines()[-1])
+    problems = [k for k in ("display", "surface", "mixer", "sounds", "icons", "cache") if r[k]]
+    if r["ms"] > budget_ms: problems.append(f"{r['ms']:.0f} ms > {budget_ms:.0f} ms")
+    print(f"{'✔' if not problems else '✘'} import pinguKictchen: {r['ms']:.1f} ms"
+          + (f" — {', '.join(problems)}" if problems else ", no window, no audio"))
+    return not problems
+
+# ══════════════════════════════════════════════════════════════
+#  SNAPSHOT / RESUME
+# ══════════════════════════════════════════════════════════════
+# A snapshot is the whole gameplay state of one Game — counters, clocks,
+# pending timers, orders, bowl, penguin and both RNG streams — as a plain
+# dict, marshalled and zlib-compressed behind a magic and version byte.
+# Orders and the bowl refer to recipes and ingredients by name, so a
+# snapshot survives content updates: recipes that are gone are dropped and
+# the level is clamped to the pack's.  Scenery, particles and every cached
+# surface are not stored; they rebuild on first draw.
+SNAP_MAGIC   = b"PKSNAP"
+SNAP_VERSION = 1
+SNAP_FIELDS  = ("score", "stars_earned", "order_serial", "level", "combo", "show_combo",
+                "failed_count", "game_t", "level_score_start", "game_over", "win",
+                "level_complete", "spawn_waiting", "rail_x", "rail_to")
+SNAP_PENGUIN = ("outfit", "happy", "sad", "bounce", "bounce_v",
+                "bob_t", "wing_t", "idle_t", "dance_t")
+
+def _due(tm): return tm.when if tm is not None and tm.live else None
+
+def snapshot_state(game):
+    """game → marshal-able dict.  Only reads and copies (tens of µs), so it
+    can run on the game thread; encoding and I/O belong to the caller."""
+    p = game.penguin
+    return {
+        "pack": PACK["name"], "rush": game.rush,
+        "game": {k: getattr(game, k) for k in SNAP_FIELDS},
+        "clock": (game.sched.t, game.ui_sched.t),
+        "timers": {"spawn": _due(game.spawn_timer), "combo": _due(game.combo_timer),
+                   "level": _due(game.level_timer)},
+        "orders": [(o.recipe["name"], o.serial, o.born, o.total, o.done, o.failed, o.end_t)
+                   for o in game.orders],
+        "bowl": list(game.bowl),
+        "penguin": {**{k: getattr(p, k) for k in SNAP_PENGUIN},
+                    "happy_t": _due(p._happy_tm), "sad_t": _due(p._sad_tm), "t": p.timers.t},
+        "rng": random.getstate(), "fx": None if FX is random else FX.getstate(),
+    }
+
+def restore_state(game, st):
+    """Put `game` (same mode as the snapshot) into state `st` straight in
+    its level.  Returns the number of orders dropped because the current
+    pack no longer has their recipe."""
+    g = game
+    g._clear_orders(); g._clear_bowl(); g.sched.clear(); g.ui_sched.clear()
+    PARTICLES.put_all(g.particles); FLOATS.put_all(g.floats); DROPS.put_all(g.drops)
+    for k, v in st["game"].items():
+        if k in SNAP_FIELDS: setattr(g, k, v)
+    g.level = clamp(g.level, 1, g.last_level)
+    g.GAME_DUR = g.LEVEL_CONFIG[g.level-1][0]
+    g.sched.t, g.ui_sched.t = st["clock"]
+    rids = {r["name"]: rid for rid, r in enumerate(INDEX.recipes)}
+    dropped = 0
+    for name, serial, born, total, done, failed, end_t in st["orders"]:
+        rid = rids.get(name)
+        if rid is None: dropped += 1; continue
+        o = CARDS.get(INDEX.recipes[rid], 1.0, rid, g.sched)
+        o.born = born; o.total = total; o.deadline = born+total
+        o.done = done; o.failed = failed; o.end_t = end_t; o.serial = serial
+        g.orders.append(o)
+        if done: o.timer = g.sched.at(o.gone_at, g._retire, o); continue
+        g.matcher.add_order(o)
+        if failed:                       # expired last frame, counted next update
+            o.timer = Timer(o.deadline, 0.0, g._expire, (o,)); o.timer.cancel()
+            g._expired.append(o)
+        else:
+            o.timer = g.sched.at(o.deadline, g._expire, o); g.crowd.join(serial)
+    for sh in st["bowl"]:
+        if sh in IMAP: g.bowl.append(sh); g.matcher.push(sh)
+    tm = st["timers"]
+    g.spawn_timer = None if tm["spawn"] is None else g.sched.at(tm["spawn"], g._spawn_due)
+    g.combo_timer = None if tm["combo"] is None else g.sched.at(tm["combo"], g._hide_combo)
+    g.level_timer = None if tm["level"] is None else g.ui_sched.at(tm["level"], g._next_level)
+    p, ps = g.penguin, st["penguin"]
+    for k in SNAP_PENGUIN: setattr(p, k, ps[k])
+    p.timers.clear(); p.timers.t = ps["t"]; p._next_blink(1.0)
+    p._happy_tm = None if ps["happy_t"] is None else p.timers.at(ps["happy_t"], p._set, "happy", False)
+    p._sad_tm = None if ps["sad_t"] is None else p.timers.at(ps["sad_t"], p._set, "sad", False)
+    g.end_screen = None
+    g._refresh_locks(); g._prewarm(g.level+1)
+    random.setstate(st["rng"])
+    if st["fx"] is not None and FX is not random: FX.setstate(st["fx"])
+    return dropped
+
+def encode_snapshot(st):
+    return SNAP_MAGIC + bytes([SNAP_VERSION]) + zlib.compress(marshal.dumps(st), 1)
+
+def load_snapshot(path):
+    """Read and decode a snapshot file; raises ValueError if it isn't one."""
+    with open(path, "rb") as f: data = f.read()
+    if not data.startswith(SNAP_MAGIC):
+        raise ValueError(f"{path}: not a Pingu snapshot")
+    version = data[len(SNAP_MAGIC)] if len(data) > len(SNAP_MAGIC) else 0
+    if not 1 <= version <= SNAP_VERSION:
+        raise ValueError(f"{path}: snapshot version {version}, expected ≤{SNAP_VERSION}")
+    try:
+        return marshal.loads(zlib.decompress(data[len(SNAP_MAGIC)+1:]))
+    except (zlib.error, ValueError, EOFError, TypeError) as e:
+        raise ValueError(f"{path}: damaged snapshot ({e})") from e
+
+def resume(game, path, tuning=None):
+    """Load `path` into a Game, replacing `game` (with `tuning` applied) when
+    the snapshot is for the other mode.  Returns (game, ms, dropped orders)."""
+    t0 = time.perf_counter()
+    st = load_snapshot(path)
+    if st["rush"] != game.rush:
+        game = Game(rush=st["rush"]); apply_tuning(game, **(tuning or {}))
+    dropped = restore_state(game, st)
+    return game, (time.perf_counter()-t0)*1000, dropped
+
+class SnapshotWriter:
+    """Snapshots a game every `every` seconds.  The game thread only runs
+    snapshot_state(); compression, the write and the atomic rename happen
+    on a daemon thread, which always takes the newest pending state (an
+    older one still waiting is counted in `skipped`)."""
+    def __init__(self, path, every=5.0):
+        self.path = path; self.every = every
+        self.next_t = time.perf_counter() + every
+        self.written = self.skipped = self.bytes = 0; self.ms = 0.0
+        self._pending = None; self._lock = threading.Lock()
+        self._wake = threading.Event(); self._stop = False
+        self._thread = threading.Thread(target=self._run, name="snapshot", daemon=True)
+        self._thread.start()
+
+    # ── game thread ──────────────────────────────────────────
+    def frame(self, game):
+        now = time.perf_counter()
+        if now < self.next_t: return
+        self.next_t = now + self.every
+        self.submit(game)
+
+    def submit(self, game):
+        st = snapshot_state(game)
+        with self._lock:
+            if self._pending is not None: self.skipped += 1
+            self._pending = st
+        self._wake.set()
+
+    def close(self, game=None):
+        """Write a last snapshot of `game` (if given) and stop the writer."""
+        if game is not None: self.submit(game)
+        self._stop = True; self._wake.set()
+        self._thread.join(timeout=5)
+        print(f"💾 Snapshots: {self.written} written → {self.path} "
+              f"({self.bytes:,} bytes, {self.ms:.1f} ms to encode + write, {self.skipped} skipped)")
+
+    # ── writer thread ────────────────────────────────────────
+    def _run(self):
+        while True:
+            self._wake.wait(); self._wake.clear()
+            with self._lock: st, self._pending = self._pending, None
+            if st is not None: self._write(st)
+            if self._stop: break
+
+    def _write(self, st):
+        t0 = time.perf_counter()
+        try:
+            data = encode_snapshot(st)
+            d = os.path.dirname(self.path)
+            if d: os.makedirs(d, exist_ok=True)
+            tmp = self.path + f".{os.getpid()}.tmp"
+            with open(tmp, "wb") as f: f.write(data)
+            os.replace(tmp, self.path)
+            self.written += 1; self.bytes = len(data)
+        except OSError as e:                       # never take the game down
+            print(f"⚠ Snapshot write failed: {e}")
+        self.ms = (time.perf_counter()-t0)*1000
+
+# ══════════════════════════════════════════════════════════════
+#  FRAME CAPTURE
+# ══════════════════════════════════════════════════════════════
+def _png_bytes(rgb, w, h, level=3):
+    """Encode tightly packed RGB24 as a PNG.  Done here rather than with
+    pygame.image.save because zlib releases the GIL while it compresses and
+    pygame's encoder does not — a writer thread must not stall the game."""
+    stride = w*3
+    raw = b"".join(b"\0" + rgb[y*stride:(y+1)*stride] for y in range(h))
+    def chunk(tag, data):
+        return (struct.pack(">I", len(data)) + tag + data
+                + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, level)) + chunk(b"IEND", b""))
+
+class FrameCapture:
+    """Copies presented frames off the game thread's hands.
+
+    frame() copies the screen's pixels through the Surface buffer protocol
+    straight into a pooled bytearray (~0.5 ms at 1280×780) and queues it;
+    writer threads turn buffers into PNGs (path is a directory) or append
+    them to one raw file (path ends in .raw — a FIFO works too) and return
+    them to the pool.  Live capture never waits: with no free buffer or a
+    full queue the frame is dropped and counted.  block=True (offline
+    rendering) waits instead, so every frame lands.
+
+    With fps set, frames are resampled to a fixed rate from the dt passed
+    to frame() — what a video encoder wants from variable-length frames.
+    """
+    def __init__(self, path, fps=None, workers=2, depth=8, block=False):
+        self.path = path; self.fps = fps; self.block = block
+        self.raw = path.endswith(".raw")
+        if not self.raw: os.makedirs(path, exist_ok=True)
+        self.q = queue.Queue(depth)
+        self.free = queue.SimpleQueue()
+        self.nbuf = depth + (1 if self.raw else workers) + 1
+        self.made = 0; self.size = None; self.layout = None
+        self.index = 0; self.written = 0; self.dropped = 0
+        self.copy_ms = 0.0; self.t = 0.0; self.next_t = 0.0
+        self.out = open(path, "wb") if self.raw else None
+        self.threads = [threading.Thread(target=self._work, name=f"capture-{i}", daemon=True)
+                        for i in range(1 if self.raw else workers)]
+        for th in self.threads: th.start()
+
+    def _layout(self, surf):
+        """(frombuffer format, ffmpeg pix_fmt) when the screen's bytes can be
+        used as they are, else None (fall back to a tobytes RGB conversion)."""
+        w, h = surf.get_size()
+        if (surf.get_bytesize() == 4 and surf.get_pitch() == w*4 and sys.byteorder == "little"
+                and surf.get_masks()[:3] == (0xff0000, 0xff00, 0xff)):
+            return ("BGRA", "bgr0")
+        return None
+
+    def _buffer(self, nbytes):
+        while True:
+            try: buf = self.free.get_nowait()
+            except queue.Empty:
+                if self.made < self.nbuf:
+                    self.made += 1; return bytearray(nbytes)
+                if not self.block: return None
+                buf = self.free.get()
+            if len(buf) == nbytes: return buf
+            self.made -= 1                          # stale size after a resize
+
+    def frame(self, surf, dt=None):
+        if self.fps and dt is not None:
+            self.t += dt
+            while self.t >= self.next_t:            # 0, 1 or several output frames
+                self.next_t += 1.0/self.fps
+                self._grab(surf)
+        else:
+            self._grab(surf)
+
+    def _grab(self, surf):
+        t0 = time.perf_counter()
+        size = surf.get_size()
+        if size != self.size:
+            if self.raw and self.size is not None:
+                self.dropped += 1; return          # a raw stream cannot change size
+            self.size = size; self.layout = self._layout(surf)
+        w, h = size
+        nbytes = w*h*4 if self.layout else w*h*3
+        buf = self._buffer(nbytes)
+        if buf is None:
+            self.dropped += 1; return
+        if self.layout:
+            view = surf.get_buffer()
+            memoryview(buf)[:] = view
+            del view                                # unlocks the surface
+        else:
+            buf[:] = pygame.image.tobytes(surf, "RGB")
+        try:
+            self.q.put((self.index, size, buf), block=self.block)
+            self.index += 1
+        except queue.Full:
+            self.free.put(buf); self.dropped += 1
+        self.copy_ms += (time.perf_counter() - t0)*1000
+
+    def _work(self):
+        while True:
+            item = self.q.get()
+            if item is None: break
+            i, size, buf = item
+            try:
+                if self.raw:
+                    self.out.write(buf)
+                else:
+                    rgb = buf
+                    if self.layout:
+                        img = pygame.image.frombuffer(buf, size, "BGRA")
+                        rgb = pygame.image.tobytes(img, "RGB"); del img
+                    data = _png_bytes(memoryview(rgb), *size)
+                    with open(os.path.join(self.path, f"frame_{i:06d}.png"), "wb") as f:
+                        f.write(data)
+                self.written += 1
+            except (OSError, pygame.error) as e:
+                print(f"⚠ Capture write failed: {e}"); self.dropped += 1
+            self.free.put(buf)
+
+    def close(self):
+        for _ in self.threads: self.q.put(None)
+        for th in self.threads: th.join()
+        if self.out: self.out.close()
+        n = self.written + self.dropped
+        print(f"🎬 Captured {self.written} frames → {self.path} ({self.dropped} dropped, "
+              f"{self.copy_ms/max(1, n):.2f} ms copy per frame on the game thread)")
+        if self.raw and self.size:
+            pix = self.layout[1] if self.layout else "rgb24"
+            print(f"   ffmpeg -f rawvideo -pix_fmt {pix} -s {self.size[0]}x{self.size[1]} "
+                  f"-r {self.fps or FPS} -i {self.path} -pix_fmt yuv420p out.mp4")
+
+# ══════════════════════════════════════════════════════════════
+#  GOLDEN FRAMES  (visual regression)
+# ══════════════════════════════════════════════════════════════
+# Each scene is (seed, quality tier, frames to check, action).  The scene
+# starts from seed_rng(seed) and a fresh Game, steps at GOLDEN_DT, calls
+# action(game, frame) before every update and draws/checks the listed
+# frames.  Everything drawn depends only on the seed and the frame number.
+GOLDEN_DT  = 1/60
+GOLDEN_DIR = os.path.join(BASE_DIR, "goldens")
+
+def _golden_click_order(g, n):
+    """Click the next n ingredients of the first open order."""
+    for o in g.orders:
+        if o.done or o.failed: continue
+        for short in o.recipe["ing"][len(g.bowl):len(g.bowl)+n]:
+            btn = next(b for b in g.buttons if b.ing["short"] == short)
+            g.handle_click(btn.rect.center)
+        return
+
+def _golden_bot(g, f):
+    if f == 0: g._golden_bot = Bot(reaction=0.25, accuracy=1.0, strategy="urgent", rng=random.Random(7))
+    g._golden_bot.update(g, GOLDEN_DT)
+
+def _golden_rush(g, f):
+    if f == 0: g.rush = True; g.reset()
+    if f == 1800: g.scroll_rail(5)
+
+def _golden_end(win):
+    def act(g, f):
+        if f == 30:
+            g.score, g.stars_earned, g.level = (2650, 21, 5) if win else (140, 3, 2)
+            g.game_over, g.win = True, win
+    return act
+
+GOLDEN_SCENES = {
+    "start":       (1, 0, (1, 20, 60, 120),            None),
+    "bowl":        (2, 0, (61, 64, 70, 85, 100),       lambda g, f: f == 60 and _golden_click_order(g, 2)),
+    "wrong":       (2, 0, (62, 70, 90),                lambda g, f: f == 60 and (_golden_click_order(g, 1), g.try_serve())),
+    "serve_combo": (4, 0, tuple(range(120, 480, 24)),  _golden_bot),
+    "urgent":      (3, 0, (600, 700, 760, 800, 860),   None),
+    "expired":     (3, 0, tuple(range(900, 1300, 50)), None),
+    "level_clear": (5, 0, tuple(range(1500, 2400, 60)),_golden_bot),
+    "lose":        (6, 0, (32, 40, 60, 120, 240),      _golden_end(False)),
+    "win":         (6, 0, (32, 40, 60, 120, 240),      _golden_end(True)),
+    "rush":        (8, 0, (600, 1200, 1799, 1830, 1900), _golden_rush),
+    "start_low":   (1, 2, (1, 60, 120),                None),
+    "bowl_min":    (2, 3, (70, 100),                   lambda g, f: f == 60 and _golden_click_order(g, 2)),
+    "win_low":     (6, 2, (40, 120),                   _golden_end(True)),
+}
+
+def golden_frames(names=None):
+    """Yield (frame id, surface) for the chosen scenes; needs init(headless=True)."""
+    for name in names or GOLDEN_SCENES:
+        seed, tier, frames, act = GOLDEN_SCENES[name]
+        set_quality(tier); seed_rng(seed)
+        g = Game(); want = set(frames)
+        for f in range(max(frames)+1):
+            if act: act(g, f)
+            g.update(GOLDEN_DT); JOBS.drain()
+            if f in want:
+                g.draw()
+                yield f"{name}_{f:05d}", screen
+    set_quality(0)
+
+def _frame_hash(surf):
+    return hashlib.sha1(pygame.image.tobytes(surf, "RGB")).hexdigest()
+
+def _frame_diff(cur, gold, tol):
+    """(pixels differing by more than tol in any channel, diff image).
+    numpy is imported here, not at module level: only a mismatch needs it."""
+    try:
+        import numpy
+        from pygame import surfarray
+    except ImportError:
+        numpy = None
+    if numpy is not None:
+        a = surfarray.array3d(cur).astype(numpy.int16)
+        b = surfarray.array3d(gold).astype(numpy.int16)
+        bad = (numpy.abs(a - b) > tol).any(axis=2)
+        out = (b // 3).astype(numpy.uint8)
+        out[bad] = (255, 0, 255)
+        return int(bad.sum()), surfarray.make_surface(out)
+    d = cur.copy(); d.blit(gold, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    d2 = gold.copy(); d2.blit(cur, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    d.blit(d2, (0, 0), special_flags=pygame.BLEND_RGB_ADD)          # |cur − gold|
+    out = gold.copy(); out.fill((85, 85, 85), special_flags=pygame.BLEND_RGB_MULT)
+    ok = pygame.transform.threshold(out, d, (0, 0, 0), (tol, tol, tol, 255),
+                                    (255, 0, 255), 1, None, False)
+    return d.get_width()*d.get_height() - ok, out
+
+def golden_run(update=False, names=None, directory=GOLDEN_DIR, tol=6, max_frac=0.0005):
+    """Render every golden scene; write goldens (update) or compare with them.
+    An exact hash match passes immediately; otherwise the frame may differ by
+    at most `tol` per channel on at most `max_frac` of its pixels.  Failures
+    write <dir>/diff/<frame>.png (golden dimmed, offending pixels magenta)
+    and the current frame next to it.  Returns True when every frame passes."""
+    init(headless=True); mute_audio()
+    t0 = time.perf_counter()
+    manifest_path = os.path.join(directory, "manifest.json")
+    font = os.path.basename(FONTS.resolve()[True][0] or "pygame-default")
+    if update:
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(manifest_path) as f: manifest = json.load(f)
+        except (OSError, ValueError): manifest = {}
+        frames = manifest.setdefault("frames", {}); manifest["font"] = font
+        for fid, surf in golden_frames(names):
+            frames[fid] = _frame_hash(surf)
+            pygame.image.save(surf, os.path.join(directory, fid + ".png"))
+        with open(manifest_path, "w") as f: json.dump(manifest, f, indent=1, sort_keys=True)
+        print(f"🖼  Wrote {len(frames)} golden frames → {directory} "
+              f"in {time.perf_counter()-t0:.1f}s")
+        return True
+    try:
+        with open(manifest_path) as f: manifest = json.load(f)
+    except (OSError, ValueError):
+        print(f"✘ No goldens in {directory} — run with --golden-update first"); return False
+    if manifest.get("font") != font:
+        print(f"⚠ Goldens were rendered with font {manifest.get('font')}, this machine uses {font}")
+    frames = manifest["frames"]; diff_dir = os.path.join(directory, "diff")
+    n = exact = 0; failed = []
+    for fid, surf in golden_frames(names):
+        n += 1
+        want = frames.get(fid)
+        if want is None:
+            failed.append((fid, "no golden")); continue
+        if _frame_hash(surf) == want:
+            exact += 1; continue
+        try: gold = pygame.image.load(os.path.join(directory, fid + ".png")).convert()
+        except (OSError, pygame.error):
+            failed.append((fid, "golden image missing")); continue
+        bad, diff = _frame_diff(surf, gold, tol)
+        if bad > max_frac*surf.get_width()*surf.get_height():
+            os.makedirs(diff_dir, exist_ok=True)
+            pygame.image.save(diff, os.path.join(diff_dir, fid + ".png"))
+            pygame.image.save(surf, os.path.join(diff_dir, fid + ".actual.png"))
+            failed.append((fid, f"{bad} px differ"))
+    took = time.perf_counter() - t0
+    for fid, why in failed: print(f"  ✘ {fid}: {why}")
+    print(f"{'✘' if failed else '✔'} Golden frames: {n - len(failed)}/{n} pass "
+          f"({exact} exact, {n - exact - len(failed)} within tolerance) in {took:.1f}s"
+          + (f" — diffs in {diff_dir}" if failed else ""))
+    return not failed
+
+# ══════════════════════════════════════════════════════════════
+#  AUTOPLAY BOT + BALANCING SWEEP
+# ══════════════════════════════════════════════════════════════
+class Bot:
+    """Plays through Game.handle_click() like a person would.
+
+    reaction — seconds between clicks (±30% jitter)
+    accuracy — chance a click lands on the intended ingredient; a miss hits
+               a neighbouring button and has to be undone with ✕
+    strategy — which order to work on: urgent | oldest | value | random
+    """
+    STRATEGIES = ("urgent", "oldest", "value", "random")
+
+    def __init__(self, reaction=0.35, accuracy=0.95, strategy="urgent", rng=None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"unknown bot strategy {strategy!r} (choose from {', '.join(self.STRATEGIES)})")
+        self.reaction=reaction; self.accuracy=accuracy; self.strategy=strategy
+        self.rng=rng or random.Random()
+        self.wait=reaction; self.target=None
+
+    def _pick(self, cands):
+        if self.strategy=="urgent": return min(cands, key=lambda o: o.remain)
+        if self.strategy=="oldest": return cands[0]
+        if self.strategy=="value":  return max(cands, key=lambda o: o.recipe["stars"]*(0.5+o.ratio))
+        return self.rng.choice(cands)
+
+    def _click(self, game, rect):
+        rng=self.rng
+        game.handle_click((int(rect.x+rect.w*rng.uniform(0.2,0.8)),
+                           int(rect.y+rect.h*rng.uniform(0.2,0.8))))
+
+    def update(self, game, dt):
+        if game.game_over or game.level_complete:
+            self.target=None; return
+        self.wait-=dt
+        if self.wait>0: return
+        self.wait=self.reaction*self.rng.uniform(0.7,1.3)
+        bowl=game.bowl; n=len(bowl); t=self.target
+        cands=game.matcher.candidates()
+        if t is None or t not in cands:
+            if not cands:                    # bowl matches nothing — undo
+                self.target=None
+                if bowl: self._click(game, game._clear_rect())
+                return
+            t=self.target=self._pick(cands)
+        ing=t.recipe["ing"]
+        if n==len(ing):
+            self.target=None; self._click(game, game._serve_rect()); return
+        ul=game.unlocked()
+        btns=[b for b in game.buttons if b.ing["short"] in ul]
+        i=next(k for k,b in enumerate(btns) if b.ing["short"]==ing[n])
+        if self.rng.random()>self.accuracy and len(btns)>1:
+            i=min(len(btns)-1, max(0, i+self.rng.choice((-1,1))))
+        self._click(game, btns[i].rect)
+
+def apply_tuning(game, speed_step=None, time_scale=None, target_scale=None, dur_scale=None):
+    """Override balance knobs on one Game instance (call reset() afterwards)."""
+    if speed_step is not None: game.SPEED_STEP=speed_step
+    if time_scale is not None: game.TIME_SCALE=time_scale
+    if target_scale is not None or dur_scale is not None:
+        ts=1.0 if target_scale is None else target_scale
+        ds=1.0 if dur_scale is None else dur_scale
+        game.LEVEL_CONFIG=[(dur*ds, max(1,int(round(tgt*ts))), lbl)
+                           for dur,tgt,lbl in Game.LEVEL_CONFIG]
+
+def bot_run(seed, bot_kw=None, tuning=None, dt=1/30, max_t=1800.0):
+    """Play one seeded game headlessly; returns a plain dict of results."""
+    seed_rng(seed)
+    game=Game(); game.cosmetic=False
+    apply_tuning(game, **(tuning or {}))
+    game.reset()
+    bot=Bot(rng=random.Random(seed*7919+1), **(bot_kw or {}))
+    fails={}; t=0.0
+    while not game.game_over and t<max_t:
+        bot.update(game, dt); game.update(dt); t+=dt
+        fails[game.level]=max(fails.get(game.level,0), game.failed_count)
+    return {"seed":seed, "score":game.score, "level":game.level,
+            "win":game.win, "fails":fails}
+
+# --set KEY=V1,V2,...  — the sweep runs the cartesian product of all values
+SWEEP_KEYS = {"speed_step":float, "time_scale":float, "target_scale":float,
+              "dur_scale":float, "reaction":float, "accuracy":float, "strategy":str}
+BOT_KEYS   = ("reaction", "accuracy", "strategy")
+
+def parse_sweep_sets(sets):
+    params={}
+    for item in sets or ():
+        key,_,vals=item.partition("=")
+        key=key.strip()
+        if key not in SWEEP_KEYS or not vals:
+            raise ValueError(f"bad --set {item!r} (keys: {', '.join(SWEEP_KEYS)})")
+        params[key]=[SWEEP_KEYS[key](x) for x in vals.split(",")]
+    return params
+
+def _split_config(cfg):
+    return ({k:v for k,v in cfg.items() if k in BOT_KEYS},
+            {k:v for k,v in cfg.items() if k not in BOT_KEYS})
+
+def _sweep_worker_init():
+    # Forked workers must not touch the mixer (its audio thread lives in the
+    # parent), and SDL's SIGTERM handler would stop Pool.terminate() working.
+    global AUDIO_OK
+    AUDIO_OK = False
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def _sweep_task(task):
+    ci, seed, cfg, dt = task
+    bot_kw, tuning = _split_config(cfg)
+    return ci, bot_run(seed, bot_kw, tuning, dt)
+
+def _pct(sorted_vals, q):
+    return sorted_vals[int(q*(len(sorted_vals)-1))]
+
+def sweep_report(cfg, results, levels=None):
+    levels=levels or len(Game.LEVEL_CONFIG)
+    n=len(results)
+    name="  ".join(f"{k}={v}" for k,v in cfg.items()) or "defaults"
+    scores=sorted(r["score"] for r in results)
+    wins=sum(r["win"] for r in results)
+    lines=[f"── {name}",
+           f"   runs {n}   win {100*wins/n:5.1f}%   score mean {sum(scores)/n:7.1f}"
+           f"   p10 {_pct(scores,.1)}  p50 {_pct(scores,.5)}  p90 {_pct(scores,.9)}",
+           "   level  reached  passed   pass%   expiries/run"]
+    for lv in range(1, levels+1):
+        reached=[r for r in results if r["level"]>=lv]
+        passed=sum(1 for r in reached if r["level"]>lv or (r["win"] and r["level"]==lv))
+        exp=sum(r["fails"].get(lv,0) for r in reached)
+        lines.append(f"   {lv:>5}  {len(reached):>7}  {passed:>6}  "
+                     f"{100*passed/max(1,len(reached)):6.1f}%  {exp/max(1,len(reached)):8.2f}")
+    return "\n".join(lines)
+
+def sweep(params, runs=200, workers=None, dt=1/30, seed=0):
+    """Fan seeded bot runs for every parameter combination over a process
+    pool.  Every configuration plays the same seeds, so rows are paired."""
+    keys=list(params)
+    configs=[dict(zip(keys,vals)) for vals in itertools.product(*params.values())]
+    tasks=[(ci, seed+i, cfg, dt) for ci,cfg in enumerate(configs) for i in range(runs)]
+    workers=workers or os.cpu_count() or 1
+    results=[[] for _ in configs]
+    content()                        # load once; forked workers inherit it
+    t0=time.perf_counter()
+    print(f"🤖 Sweeping {len(configs)} config(s) × {runs} runs on {workers} worker(s)...")
+    with multiprocessing.Pool(workers, initializer=_sweep_worker_init) as pool:
+        for ci,res in pool.imap_unordered(_sweep_task, tasks,
+                                          chunksize=max(1, len(tasks)//(workers*8))):
+            results[ci].append(res)
+    for cfg,res in zip(configs, results):
+        print(sweep_report(cfg, res))
+    print(f"🤖 {len(tasks)} games in {time.perf_counter()-t0:.1f}s")
+    return configs, results
+
+# ══════════════════════════════════════════════════════════════
+#  HOT RELOAD (dev mode: --watch)
+# ══════════════════════════════════════════════════════════════
+# Tuning file: a JSON/TOML table of the balance knobs apply_tuning() takes,
+# e.g. {"time_scale": 1.2, "dur_scale": 0.8}.
+TUNING_KEYS = tuple(k for k in SWEEP_KEYS if k not in BOT_KEYS)
+
+def load_tuning(path):
+    """Read and check a tuning file; raises PackError."""
+    raw = _read_pack_source(path)
+    if not isinstance(raw, dict): raise PackError(f"{path}: expected a table")
+    errs = [f"unknown key '{k}' (expected one of {', '.join(TUNING_KEYS)})"
+            for k in raw if k not in TUNING_KEYS]
+    errs += [f"{k}: expected a positive number" for k, v in raw.items()
+             if k in TUNING_KEYS and not _check(v, "number", k, [])]
+    if errs: raise PackError(f"{len(errs)} problem(s) in {path}:\n  " + "\n  ".join(errs))
+    return {k: float(v) for k, v in raw.items()}
+
+def pack_delta(old, new):
+    """What a switch from pack `old` to `new` invalidates:
+    icons   — shorts whose colour or icon primitives changed
+    buttons — shorts whose IngBtn face changed (icon or name)
+    faces   — recipe names whose OrderCard face must be repainted
+    gone    — recipe names that no longer exist
+    timers  — recipe names whose time changed (orders spawned from now on)
+    index   — ingredient/recipe ids, unlocks or ingredient lists changed
+    levels  — the level table changed"""
+    oi = {i["short"]: i for i in old["ingredients"]}
+    orc = {r["name"]: r for r in old["recipes"]}
+    def look(i): return i["color"], i["icon"]
+    def shape(p): return ([(i["short"], i["unlock"]) for i in p["ingredients"]],
+                          [(r["name"], r["unlock"], r["ing"]) for r in p["recipes"]])
+    icons = {i["short"] for i in new["ingredients"]
+             if i["short"] in oi and look(i) != look(oi[i["short"]])}
+    buttons = icons | {i["short"] for i in new["ingredients"]
+                       if i["short"] in oi and i["name"] != oi[i["short"]]["name"]}
+    faces = {r["name"] for r in new["recipes"] if r["name"] in orc and (
+             (r["stars"], r["ing"]) != (orc[r["name"]]["stars"], orc[r["name"]]["ing"])
+             or icons.intersection(r["ing"]))}
+    return {"icons": icons, "buttons": buttons, "faces": faces,
+            "gone": orc.keys() - {r["name"] for r in new["recipes"]},
+            "timers": {r["name"] for r in new["recipes"]
+                       if r["name"] in orc and r["time"] != orc[r["name"]]["time"]},
+            "index": shape(old) != shape(new), "levels": old["levels"] != new["levels"]}
+
+def hot_reload(game, pack=None, tuning=None):
+    """Install `pack` and/or `tuning` (the full set of apply_tuning knobs,
+    on top of the class defaults) into a running game, keeping its level,
+    score, orders and bowl.  Only derived assets whose inputs changed are
+    rebuilt, eagerly so the cost shows: a recoloured ingredient re-renders
+    its icon at both sizes, its button and the faces of recipes using it.
+    Returns a one-line summary with the rebuild time."""
+    t0 = time.perf_counter(); done = []
+    if pack is not None:
+        d = pack_delta(PACK, pack)
+        shorts = [i["short"] for i in INGREDIENTS]
+        install_pack(pack, icons=d["icons"], faces=d["faces"] | d["gone"])
+        for sh in d["icons"]: ICONS[sh]; ICONS_SM[sh]
+        if d["icons"]: done.append(f"{len(d['icons'])} icon(s) ×2 sizes")
+        if [i["short"] for i in INGREDIENTS] != shorts:
+            game._build_ui(); done.append("ingredient panel")
+        else:
+            for btn in game.buttons:
+                btn.ing = IMAP[btn.ing["short"]]
+                if btn.ing["short"] in d["buttons"]: btn.invalidate()
+            if d["buttons"]: done.append(f"{len(d['buttons'])} button(s)")
+        for r in RECIPES:
+            if r["name"] in d["faces"]: OrderCard.face(r)
+        if d["faces"]: done.append(f"{len(d['faces'])} card face(s)")
+        rids = {r["name"]: rid for rid, r in enumerate(INDEX.recipes)}
+        if d["index"]: game.matcher = BowlMatcher(INDEX)
+        for o in list(game.orders):
+            rid = rids.get(o.recipe["name"])
+            if rid is None:              # recipe removed: the customer gives up
+                if o in game._expired: game._expired.remove(o)
+                if not d["index"]: game.matcher.remove_order(o)
+                o.timer.cancel(); game.orders.remove(o); CARDS.put(o)
+                game.crowd.leave(o.serial, happy=False); continue
+            o.recipe = INDEX.recipes[rid]; o.rid = rid
+            if d["index"] and not o.done: game.matcher.add_order(o)
+        if d["index"]:
+            game.bowl = [sh for sh in game.bowl if sh in IMAP]
+            game.matcher.clear_bowl()
+            for sh in game.bowl: game.matcher.push(sh)
+            game._refresh_locks(); done.append("recipe index")
+        if d["timers"]: done.append(f"{len(d['timers'])} recipe timer(s)")
+        if d["levels"]: done.append("levels")
+    if tuning is not None:
+        knobs = lambda: (game.SPEED_STEP, game.TIME_SCALE, game.LEVEL_CONFIG)
+        was = knobs()
+        for a in ("SPEED_STEP", "TIME_SCALE", "LEVEL_CONFIG"): game.__dict__.pop(a, None)
+        apply_tuning(game, **tuning)
+        if knobs() != was: done.append("tuning")
+    game.level = min(game.level, game.last_level)
+    game.GAME_DUR = game.LEVEL_CONFIG[game.level-1][0]
+    ms = (time.perf_counter()-t0)*1000
+    return f"♻ Reloaded in {ms:.1f} ms — " + (", ".join(done) or "nothing to rebuild")
+
+class ContentWatcher:
+    """Polls the pack (and tuning file) mtimes every `every` seconds from
+    the main loop and hot-reloads whatever changed into the running Game.
+    A file that fails to load or validate is reported and the game keeps
+    its current content; saving a fixed version picks it up."""
+    def __init__(self, pack_path, tuning_path=None, tuning=None, every=0.5):
+        self.paths = [os.path.abspath(p) for p in (pack_path, tuning_path) if p]
+        self.pack_path = self.paths[0]; self.tuning_path = tuning_path and self.paths[1]
+        self.base = dict(tuning or {})
+        self.every = every; self.next_t = 0.0
+        self.stamps = {p: self._stamp(p) for p in self.paths}
+    @staticmethod
+    def _stamp(path):
+        try: st = os.stat(path)
+        except OSError: return None
+        return st.st_mtime_ns, st.st_size
+    def poll(self, game):
+        now = time.perf_counter()
+        if now < self.next_t: return None
+        self.next_t = now + self.every
+        changed = [p for p in self.paths if self._stamp(p) != self.stamps[p]]
+        if not changed: return None
+        for p in changed: self.stamps[p] = self._stamp(p)
+        try:
+            pack = load_pack(self.pack_path) if self.pack_path in changed else None
+            tuning = {**self.base, **(load_tuning(self.tuning_path) if self.tuning_path else {})}
+        except PackError as e:
+            print(f"⚠ Reload skipped: {e}"); return None
+        msg = hot_reload(game, pack, tuning)
+        print(msg)
+        return msg
+
+# ══════════════════════════════════════════════════════════════
+#  FRAME PACING
+# ══════════════════════════════════════════════════════════════
+# mode → (frames per second, block on event.wait instead of sleeping)
+PACE_MODES = {
+    "play":       (FPS, False),   # active game or level transition
+    "lowmotion":  (30,  False),   # end screen, someone is around
+    "background": (20,  False),   # unfocused but mid-game (= frame_dt cap, no slow-mo)
+    "idle":       (5,   True),    # unfocused between games, or end screen untouched
+    "minimized":  (1,   True),    # hidden — game frozen, nothing drawn
+}
+IDLE_AFTER = 10.0                 # seconds without input on the end screen
+JOB_SHARE  = 0.75                 # background jobs may fill a frame up to this share
+
+class FramePacer:
+    """Chooses a frame rate from what is on screen and whether anyone is
+    looking, and keeps process CPU time per mode for the exit report.
+
+    Blocking modes wait in pygame.event.wait() with the frame interval as
+    timeout, so input still wakes the loop at once; the woken event is
+    posted back for main()'s event.get().  busy=True paces "play" with
+    tick_busy_loop for steadier frame times at the cost of a spinning core.
+    """
+    def __init__(self, busy=False):
+        self.busy = busy
+        self.focused = True; self.minimized = False
+        self.last_input = time.perf_counter()
+        self.mode = "play"
+        self.cpu = dict.fromkeys(PACE_MODES, 0.0)
+        self.wall = dict.fromkeys(PACE_MODES, 0.0)
+        self.frames = dict.fromkeys(PACE_MODES, 0)
+        self._cpu0 = time.process_time(); self._wall0 = time.perf_counter()
+        self._tick_ms = 0
+
+    def event(self, ev):
+        t = ev.type
+        if t in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
+            self.last_input = time.perf_counter()
+        elif t == pygame.WINDOWFOCUSLOST:   self.focused = False
+        elif t == pygame.WINDOWFOCUSGAINED: self.focused = True; self.last_input = time.perf_counter()
+        elif t in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):  self.minimized = True
+        elif t in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWMAXIMIZED):
+            self.minimized = False
+
+    def choose(self, game):
+        if self.minimized: return "minimized"
+        playing = not game.game_over
+        if not self.focused: return "background" if playing else "idle"
+        if playing: return "play"
+        return "idle" if time.perf_counter() - self.last_input > IDLE_AFTER else "lowmotion"
+
+    def tick(self, game):
+        """Wait out the frame for the current mode; returns clock.tick() ms."""
+        now_c = time.process_time(); now_w = time.perf_counter()
+        m = self.mode
+        self.cpu[m] += now_c - self._cpu0; self.wall[m] += now_w - self._wall0
+        self.frames[m] += 1
+        self._cpu0, self._wall0 = now_c, now_w
+        self.mode = m = self.choose(game)
+        fps, block = PACE_MODES[m]
+        if block:
+            wait = 1000//fps - (pygame.time.get_ticks() - self._tick_ms)
+            if wait > 0 and not pygame.event.peek():
+                ev = pygame.event.wait(wait)
+                if ev.type != pygame.NOEVENT: pygame.event.post(ev)
+            ms = clock.tick()
+        elif self.busy and m == "play": ms = clock.tick_busy_loop(fps)
+        else: ms = clock.tick(fps)
+        self._tick_ms = pygame.time.get_ticks()
+        return ms
+
+    def report(self):
+        rows = [(m, self.wall[m], self.cpu[m], self.frames[m]) for m in PACE_MODES if self.frames[m]]
+        if not rows: return
+        print("🕒 CPU by pacing mode:")
+        for m, wall, cpu, n in rows:
+            print(f"   {m:<10} {wall:7.1f}s  {n:6d} frames  "
+                  f"{100*cpu/max(wall,1e-9):5.1f}% of a core")
 
 # ── MAIN LOOP ─────────────────────────────────────────────────
-def main():
+def _parse_args(argv):
+    ap = argparse.ArgumentParser(description="Pingu’s Cozy Kitchen")
+    ap.add_argument("--pack", metavar="FILE", help="content pack (.json/.toml) to play instead of packs/base.json")
+    ap.add_argument("--tuning", metavar="FILE",
+                    help=f"balance knobs (.json/.toml table of {', '.join(TUNING_KEYS)}) applied at start")
+    ap.add_argument("--watch", action="store_true",
+                    help="dev mode: hot-reload the pack and --tuning file into the running game on save")
+    ap.add_argument("--seed", type=int, help="RNG seed (random if omitted)")
+    ap.add_argument("--record", metavar="FILE", help="record inputs to FILE")
+    ap.add_argument("--snapshot", metavar="FILE",
+                    help="save the game state to FILE every --snapshot-every s (and at exit); "
+                         "resume from it at startup if it exists")
+    ap.add_argument("--snapshot-every", type=float, default=5.0, metavar="S",
+                    help="seconds between snapshots")
+    ap.add_argument("--replay", metavar="FILE", help="replay a recording and verify it")
+    ap.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (0 = unpaced)")
+    ap.add_argument("--headless", action="store_true",
+                    help="replay without drawing, as fast as possible (with --capture: render off-screen)")
+    ap.add_argument("--autoplay", action="store_true", help="let the bot play (tune it with --set)")
+    ap.add_argument("--rush", action="store_true",
+                    help="rush hour: endless, orders pile up on a scrolling rail")
+    ap.add_argument("--bench-rush", action="store_true",
+                    help="time rush-mode frames against the number of open orders and exit")
+    ap.add_argument("--bench-crowd", action="store_true",
+                    help="time the customer queue against its length and exit")
+    ap.add_argument("--render-thread", action="store_true",
+                    help="rasterize each frame on a render thread while the next one simulates")
+    ap.add_argument("--bench-render", action="store_true",
+                    help="compare the serial loop with --render-thread (throughput, latency) and exit")
+    ap.add_argument("--microbench", nargs="*", metavar="NAME",
+                    help="time the drawing/synthesis primitives (all, or names starting with NAME), "
+                         "store them under the current commit and compare with the previous one")
+    ap.add_argument("--microbench-compare", nargs="*", metavar="COMMIT",
+                    help="compare two stored runs: [BASE [HEAD]] (default: the last two)")
+    ap.add_argument("--bench-history", default=BENCH_HISTORY, metavar="FILE",
+                    help="microbenchmark history (JSON keyed by commit)")
+    ap.add_argument("--bench-noise", type=float, default=10.0, metavar="PCT",
+                    help="smallest change in %% the microbenchmark comparison flags")
+    ap.add_argument("--sweep", action="store_true", help="run a headless bot balancing sweep and exit")
+    ap.add_argument("--set", action="append", metavar="KEY=V1,V2",
+                    help=f"sweep/bot parameter ({', '.join(SWEEP_KEYS)}); repeatable")
+    ap.add_argument("--runs", type=int, default=200, help="seeded runs per sweep config")
+    ap.add_argument("--workers", type=int, help="sweep worker processes (default: all cores)")
+    ap.add_argument("--bot-dt", type=float, default=1/30, help="sweep simulation step (s)")
+    ap.add_argument("--bench-recipes", action="store_true",
+                    help="time the recipe index on synthetic packs up to 10k recipes and exit")
+    ap.add_argument("--quality", choices=["auto", *TIER_NAMES], default="auto",
+                    help="pin a visual quality tier instead of adapting to frame time")
+    ap.add_argument("--pacing", choices=["sleep", "busy"], default="sleep",
+                    help="frame pacing during play: sleep (low CPU) or busy (tick_busy_loop, less jitter)")
+    ap.add_argument("--gc-policy", choices=["deferred", "default"], default="deferred",
+                    help="deferred: freeze startup objects, collect only between levels (default)")
+    ap.add_argument("--gc-stats", action="store_true",
+                    help="report GC pauses, net allocations per frame and pool reuse at exit")
+    ap.add_argument("--job-stats", action="store_true",
+                    help="report background job steps, queue depth and deferred work at exit")
+    ap.add_argument("--hitch-ms", type=float, default=50.0, metavar="MS",
+                    help="flight recorder: dump timeline + sampled stacks for frames over MS (0 = off)")
+    ap.add_argument("--hitch-dir", metavar="DIR",
+                    help="where hitch dumps go (default: <cache dir>/hitches)")
+    ap.add_argument("--surface-stats", action="store_true",
+                    help="attribute Surface allocations and live bytes to subsystems "
+                         "(plus tracemalloc) and report at exit")
+    ap.add_argument("--telemetry", metavar="FILE",
+                    help="write session telemetry to FILE (.jsonl, or .db/.sqlite for SQLite)")
+    ap.add_argument("--telemetry-max-mb", type=float, default=8.0,
+                    help="rotate the telemetry file past this size (keeps 3 old files)")
+    ap.add_argument("--capture", metavar="DIR|FILE.raw",
+                    help="capture frames as PNGs into DIR, or raw video into FILE.raw")
+    ap.add_argument("--capture-fps", type=float,
+                    help="resample captured frames to a fixed rate (default for replays: 60)")
+    ap.add_argument("--golden-update", action="store_true",
+                    help="render the golden scenes and store them as the new reference")
+    ap.add_argument("--golden-check", action="store_true",
+                    help="render the golden scenes and compare with the stored reference")
+    ap.add_argument("--golden-dir", default=GOLDEN_DIR, metavar="DIR", help="where goldens live")
+    ap.add_argument("--golden-scene", action="append", choices=list(GOLDEN_SCENES), metavar="NAME",
+                    help="limit golden rendering to NAME (repeatable)")
+    ap.add_argument("--check-import", nargs="?", type=float, const=150.0, metavar="MS",
+                    help="verify a bare import opens no window/audio and takes under MS ms")
+    args = ap.parse_args(argv)
+    if args.autoplay and args.record:   # bot clicks and --set tuning never reach the recording
+        ap.error("--record can't capture an --autoplay game; record a human session instead")
+    return args
+
+def main(argv=None):
+    args = _parse_args(argv)
+    if args.pack:
+        try:
+            install_pack(load_pack(args.pack))
+        except PackError as e:
+            sys.exit(f"⚠ {e}")
+        print(f"📦 Content pack: {PACK['name']} ({len(INGREDIENTS)} ingredients, "
+              f"{len(RECIPES)} recipes, {len(LEVEL_CONFIG)} levels)")
+    file_tuning = {}
+    if args.tuning:
+        try: file_tuning = load_tuning(args.tuning)
+        except PackError as e: sys.exit(f"⚠ {e}")
+    if args.quality != "auto": set_quality(TIER_NAMES.index(args.quality))
+    gcs = cap = render = mem = None
+    def on_frame(game, dt):
+        GC.frame()
+        if gcs: gcs.frame(not (game.game_over or game.level_complete))
+        if mem: mem.frame()
+        if cap:
+            if render: render.wait()         # capture the finished frame
+            cap.frame(screen, dt)
+    if args.replay:
+        if args.gc_policy == "deferred": GC.start()
+        gcs = GCStats() if args.gc_stats else None
+        mem = SurfaceStats() if args.surface_stats else None
+        headless, speed = args.headless, max(0.0, args.speed)
+        if args.capture:                 # offline render: every frame, fixed rate
+            if headless: init(headless=True); headless = False; speed = 0
+            cap = FrameCapture(args.capture, fps=args.capture_fps or FPS, block=True)
+        ok = replay(args.replay, speed=speed, headless=headless, on_frame=on_frame)
+        if cap: cap.close()
+        if gcs: gcs.report()
+        if mem: mem.report()
+        pygame.quit(); sys.exit(0 if ok else 1)
+    if args.bench_recipes:
+        bench_recipe_index(); pygame.quit(); sys.exit()
+    if args.bench_rush:
+        bench_rush(); pygame.quit(); sys.exit()
+    if args.bench_render:
+        bench_render(); pygame.quit(); sys.exit()
+    if args.bench_crowd:
+        bench_crowd(); pygame.quit(); sys.exit()
+    if args.microbench is not None:
+        ok = microbench(args.microbench, args.bench_history, args.bench_noise/100)
+        pygame.quit(); sys.exit(0 if ok else 1)
+    if args.microbench_compare is not None:
+        if len(args.microbench_compare) > 2: sys.exit("⚠ --microbench-compare takes at most two commits")
+        try:
+            ok = microbench_compare(*args.microbench_compare, path=args.bench_history,
+                                    noise=args.bench_noise/100)
+        except ValueError as e:
+            sys.exit(f"⚠ {e}")
+        sys.exit(0 if ok else 1)
+    if args.check_import is not None:
+        sys.exit(0 if check_import(args.check_import) else 1)
+    if args.golden_update or args.golden_check:
+        ok = golden_run(update=args.golden_update, names=args.golden_scene, directory=args.golden_dir)
+        pygame.quit(); sys.exit(0 if ok else 1)
+    try:
+        params = parse_sweep_sets(args.set)
+    except ValueError as e:
+        sys.exit(f"⚠ {e}")
+    if args.sweep:
+        mute_audio()
+        sweep(params, runs=args.runs, workers=args.workers, dt=args.bot_dt,
+              seed=args.seed or 0)
+        pygame.quit(); sys.exit()
+
+    init()
     print(f"Pingu’s Cozy Kitchen— {SW}×{SH} windowed (safe mode)")
     print("Controls: Mouse | R=restart | ESC=quit")
-    game = Game()
-    while True:
-        dt = min(clock.tick(FPS)/1000.0, 0.05)   # cap dt — prevents spiral of death
+    seed = args.seed if args.seed is not None else random.randrange(1 << 31)
+    seed_rng(seed)
+    rec = InputRecorder(args.record, seed, rush=args.rush) if args.record else None
+    gov = QualityGovernor(None if args.quality == "auto" else TIER_NAMES.index(args.quality))
+    pacer = FramePacer(busy=args.pacing == "busy")
+    if args.telemetry:
+        TELEMETRY.open(args.telemetry, max_bytes=int(args.telemetry_max_mb*(1 << 20)))
+        TELEMETRY.emit("seed", seed=seed)
+    mem = SurfaceStats() if args.surface_stats else None
+    game = Game(rush=args.rush)
+    bot = None; tuning = {}
+    if args.autoplay:
+        bot_kw, tuning = _split_config({k: v[0] for k, v in params.items()})
+        bot = Bot(**bot_kw)
+    if args.autoplay or file_tuning:
+        apply_tuning(game, **{**tuning, **file_tuning}); game.reset()
+    snap = None
+    if args.snapshot:
+        if os.path.exists(args.snapshot):
+            try:
+                if rec: raise ValueError("can't record a resumed game")
+                game, ms, dropped = resume(game, args.snapshot, {**tuning, **file_tuning})
+            except (OSError, ValueError) as e:
+                print(f"⚠ Not resuming: {e}")
+            else:
+                print(f"⏯ Resumed level {game.level}, score {game.score} in {ms:.1f} ms"
+                      + (f" ({dropped} order(s) dropped: recipe no longer in the pack)" if dropped else ""))
+        snap = SnapshotWriter(args.snapshot, args.snapshot_every)
+    watch = ContentWatcher(args.pack or BASE_PACK, args.tuning, tuning) if args.watch else None
+    if args.gc_policy == "deferred": GC.start()
+    gcs = GCStats() if args.gc_stats else None
+    cap = FrameCapture(args.capture, fps=args.capture_fps) if args.capture else None
+    render = RenderThread(screen) if args.render_thread else None
+    if args.hitch_ms > 0: FLIGHT.start(args.hitch_ms, directory=args.hitch_dir)
+    running = True
+    while running:
+        ms = pacer.tick(game)
+        t_work = time.perf_counter()
+        frozen = pacer.mode == "minimized"
+        if rec and not frozen: rec.tick(ms)
+        dt = frame_dt(ms)
 
         for event in pygame.event.get():
+            pacer.event(event)
             if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit(); sys.exit()        # ESC ALWAYS WORKS
-                elif event.key == pygame.K_r:
+                    running = False                  # ESC ALWAYS WORKS
+                elif event.key == pygame.K_r and not frozen:
+                    if rec: rec.restart()
                     game.reset()
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button==1:
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    game.scroll_rail(1 if event.key == pygame.K_RIGHT else -1)
+            elif event.type == pygame.MOUSEWHEEL:
+                game.scroll_rail(-event.y)
+            elif event.type == pygame.MOUSEMOTION:
+                game.pointer(event.pos)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button==1 and not frozen:
+                FLIGHT.mark("click")
+                if rec: rec.click(event.pos)
                 game.handle_click(event.pos)
             elif event.type == pygame.VIDEORESIZE:
                 pass  # handled by RESIZABLE flag automatically
+        if not running: break
+        if frozen: continue
 
+        if watch: watch.poll(game)
+        if bot: bot.update(game, dt)
         game.update(dt)
-        game.draw()
-        pygame.display.flip()
+        if render:
+            render.submit(record_frame(game.draw))
+        else:
+            game.draw()
+            pygame.display.flip()
+        work_ms = (time.perf_counter() - t_work)*1000
+        JOBS.run(JOB_SHARE*1000/PACE_MODES[pacer.mode][0] - work_ms)
+        if pacer.mode == "play": gov.frame(work_ms, dt)
+        TELEMETRY.frame(work_ms, pacer.mode)
+        FLIGHT.frame(t_work, (time.perf_counter() - t_work)*1000, pacer.mode)
+        on_frame(game, dt)
+        if snap: snap.frame(game)
+
+    if render: render.close()
+    if snap: snap.close(game)
+    FLIGHT.stop()
+    pacer.report()
+    if args.job_stats: JOBS.report()
+    if cap: cap.close()
+    if gcs: gcs.report()
+    if mem: mem.report()
+    TELEMETRY.close()
+    if rec: rec.save(game)
+    pygame.quit(); sys.exit()
 
 if __name__ == "__main__":
     main()
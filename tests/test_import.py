@@ -0,0 +1,9 @@
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pinguKictchen
+
+
+def test_import_is_inert_and_fast():
+    # Runs the probe in a fresh interpreter: no window, no mixer, under budget.
+    assert pinguKictchen.check_import()